@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Benchmarks of REANA developer commands on synthetic workspaces."""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARK_PREFIX = 'reana-bench-'
+
+BENCHMARKS = ['startup', 'select-components', 'git-status', 'git-fetch',
+              'git-clean']
+
+DEFAULT_REPOS = [10, 100, 500]
+
+DEFAULT_RUNS = 5
+
+DEFAULT_PACKAGES = 20
+
+DEFAULT_MODULES = 10
+
+
+def _git(args, cwd):
+    """Run the git command quietly, raising an exception on failure."""
+    subprocess.check_call(['git'] + args, cwd=cwd, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.DEVNULL)
+
+
+def get_component_names(repos):
+    """Return names of the synthetic components.
+
+    :param repos: number of components
+    :type repos: int
+
+    :return: standard component names such as ``reana-bench-0001``
+    :rtype: list
+    """
+    return ['{0}{1:04d}'.format(BENCHMARK_PREFIX, number)
+            for number in range(1, repos + 1)]
+
+
+def seed_clean_targets(srcdir, packages=DEFAULT_PACKAGES,
+                       modules=DEFAULT_MODULES):
+    """Create the leftovers removed by ``reana git-clean`` in the component.
+
+    :param srcdir: component source directory
+    :param packages: number of Python packages in the component
+    :param modules: number of modules per package
+    :type srcdir: str
+    :type packages: int
+    :type modules: int
+    """
+    for package in range(packages):
+        package_dir = os.path.join(srcdir, 'package{0}'.format(package))
+        cache_dir = os.path.join(package_dir, '__pycache__')
+        os.makedirs(cache_dir, exist_ok=True)
+        for module in range(modules):
+            name = 'module{0}'.format(module)
+            for path in (os.path.join(package_dir, name + '.pyc'),
+                         os.path.join(cache_dir, name + '.cpython.pyc')):
+                with open(path, 'wb') as fdesc:
+                    fdesc.write(b'\0' * 512)
+    for directory in ('benchmark.egg-info', '.eggs/dependency',
+                      'docs/_build/html'):
+        os.makedirs(os.path.join(srcdir, directory), exist_ok=True)
+        with open(os.path.join(srcdir, directory, 'file.txt'), 'w') as fdesc:
+            fdesc.write('leftover\n')
+
+
+def create_template(root, packages=DEFAULT_PACKAGES, modules=DEFAULT_MODULES):
+    """Create the component repository and its bare upstream to copy.
+
+    :param root: directory to create the template in
+    :param packages: number of Python packages in the component
+    :param modules: number of modules per package
+    :type root: str
+    :type packages: int
+    :type modules: int
+
+    :return: paths of the working repository and of the bare upstream
+    :rtype: tuple
+    """
+    work = os.path.join(root, 'work')
+    bare = os.path.join(root, 'upstream.git')
+    os.makedirs(os.path.join(work, 'docs'))
+    for package in range(packages):
+        package_dir = os.path.join(work, 'package{0}'.format(package))
+        os.makedirs(package_dir)
+        for module in range(modules):
+            with open(os.path.join(package_dir, 'module{0}.py'.format(
+                    module)), 'w') as fdesc:
+                fdesc.write('VALUE = {0}\n'.format(module))
+    with open(os.path.join(work, 'docs', 'index.rst'), 'w') as fdesc:
+        fdesc.write('Benchmark\n=========\n')
+    _git(['init', '-q'], work)
+    _git(['checkout', '-q', '-b', 'master'], work)
+    _git(['add', '.'], work)
+    _git(['-c', 'user.name=REANA', '-c', 'user.email=reana@example.org',
+          'commit', '-q', '-m', 'Initial commit'], work)
+    _git(['clone', '-q', '--bare', work, bare], root)
+    _git(['update-ref', 'refs/remotes/upstream/master', 'HEAD'], work)
+    return work, bare
+
+
+def create_workspace(root, repos, packages=DEFAULT_PACKAGES,
+                     modules=DEFAULT_MODULES):
+    """Create synthetic ``$REANA_SRCDIR`` with local bare upstreams.
+
+    Every component is a copy of one template repository whose ``upstream``
+    remote is its own bare repository under ``<root>/upstream``. The
+    components are registered in ``<root>/src/.reana.cfg`` and form the
+    ``BENCH`` group.
+
+    :param root: directory to create the workspace in
+    :param repos: number of components
+    :param packages: number of Python packages per component
+    :param modules: number of modules per package
+    :type root: str
+    :type repos: int
+    :type packages: int
+    :type modules: int
+
+    :return: source directory to use as ``$REANA_SRCDIR``
+    :rtype: str
+    """
+    srcdir = os.path.join(root, 'src')
+    upstreamdir = os.path.join(root, 'upstream')
+    os.makedirs(srcdir)
+    os.makedirs(upstreamdir)
+    work, bare = create_template(os.path.join(root, 'template'), packages,
+                                 modules)
+    components = get_component_names(repos)
+    for component in components:
+        component_dir = os.path.join(srcdir, component)
+        component_bare = os.path.join(upstreamdir, component + '.git')
+        shutil.copytree(work, component_dir, symlinks=True)
+        shutil.copytree(bare, component_bare, symlinks=True)
+        with open(os.path.join(component_dir, '.git', 'config'),
+                  'a') as fdesc:
+            fdesc.write('[remote "upstream"]\n'
+                        '\turl = {0}\n'
+                        '\tfetch = +refs/heads/*:refs/remotes/upstream/*\n'
+                        .format(component_bare))
+    with open(os.path.join(srcdir, '.reana.cfg'), 'w') as fdesc:
+        fdesc.write('[components]\nextra = {0}\n\n[groups]\nBENCH = {1}*\n'
+                    .format(' '.join(components), BENCHMARK_PREFIX))
+    return srcdir
+
+
+def get_reana_env(srcdir):
+    """Return environment running ``reana`` in the synthetic workspace.
+
+    The ``reana`` package benchmarked is the one this module belongs to, and
+    commands are never forwarded to a running daemon.
+    """
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(
+        __file__)))
+    pythonpath = os.environ.get('PYTHONPATH')
+    env = dict(os.environ, REANA_NO_DAEMON='1', REANA_SRCDIR=srcdir,
+               PYTHONPATH=os.pathsep.join([package_root, pythonpath])
+               if pythonpath else package_root)
+    for name in ('REANA_CONFIG', 'REANA_MIRRORDIR'):
+        env.pop(name, None)
+    return env
+
+
+def time_reana(args, srcdir, runs, setup=None):
+    """Return wall-clock durations of ``reana`` run in a fresh interpreter.
+
+    :param args: command line arguments
+    :param srcdir: synthetic ``$REANA_SRCDIR``
+    :param runs: number of runs
+    :param setup: function called before every run, not timed
+    :type args: list
+    :type srcdir: str
+    :type runs: int
+    :type setup: callable
+
+    :return: durations in seconds and number of runs exiting with an error
+    :rtype: tuple
+    """
+    cmd = [sys.executable, '-c', 'from reana.client import main; main()'] + \
+        list(args)
+    env = get_reana_env(srcdir)
+    durations = []
+    failures = 0
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        if subprocess.call(cmd, cwd=srcdir, env=env,
+                           stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL):
+            failures += 1
+        durations.append(time.perf_counter() - start)
+    return durations, failures
+
+
+def time_select_components(srcdir, repos, runs):
+    """Return durations of loading the registry and selecting components.
+
+    Every run starts with empty caches and resolves ``ALL``, the ``BENCH``
+    group, a glob pattern and every short component name.
+
+    :param srcdir: synthetic ``$REANA_SRCDIR``
+    :param repos: number of components
+    :param runs: number of runs
+    :type srcdir: str
+    :type repos: int
+    :type runs: int
+
+    :return: durations in seconds and number of failed runs, always zero
+    :rtype: tuple
+    """
+    from reana import cli
+    from reana.registry import shorten_component_name
+    saved = cli.SRCDIR, os.environ.pop('REANA_CONFIG', None)
+    cli.SRCDIR = srcdir
+    names = ['ALL', 'BENCH', 'r-b-00*'] + [
+        shorten_component_name(component)
+        for component in get_component_names(repos)]
+    durations = []
+    try:
+        for _ in range(runs):
+            cli.get_component_registry.cache_clear()
+            start = time.perf_counter()
+            for name in names:
+                cli.select_components([name])
+            durations.append(time.perf_counter() - start)
+    finally:
+        cli.SRCDIR = saved[0]
+        if saved[1] is not None:
+            os.environ['REANA_CONFIG'] = saved[1]
+        cli.get_component_registry.cache_clear()
+    return durations, 0
+
+
+def summarize_durations(benchmark, repos, durations, failures=0):
+    """Return the result entry of the benchmark.
+
+    :param benchmark: benchmark name
+    :param repos: number of components
+    :param durations: durations of the runs in seconds
+    :param failures: number of runs exiting with an error
+    :type benchmark: str
+    :type repos: int
+    :type durations: list
+    :type failures: int
+
+    :return: dictionary with ``benchmark``, ``repos``, ``runs``,
+             ``failures``, ``first``, ``min``, ``median``, ``max`` and
+             ``durations`` keys
+    :rtype: dict
+    """
+    return {
+        'benchmark': benchmark,
+        'repos': repos,
+        'runs': len(durations),
+        'failures': failures,
+        'first': durations[0],
+        'min': min(durations),
+        'median': statistics.median(durations),
+        'max': max(durations),
+        'durations': durations,
+    }
+
+
+def run_benchmarks(root, repos, runs=DEFAULT_RUNS, benchmarks=None,
+                   packages=DEFAULT_PACKAGES, modules=DEFAULT_MODULES,
+                   callback=None):
+    """Run the benchmarks on synthetic workspaces of the given sizes.
+
+    :param root: directory to create the workspaces in
+    :param repos: numbers of components of the workspaces
+    :param runs: number of runs of every benchmark
+    :param benchmarks: names of the benchmarks to run [default=all]
+    :param packages: number of Python packages per component
+    :param modules: number of modules per package
+    :param callback: function called with every result entry
+    :type root: str
+    :type repos: list
+    :type runs: int
+    :type benchmarks: list
+    :type packages: int
+    :type modules: int
+    :type callback: callable
+
+    :return: result entries, see summarize_durations()
+    :rtype: list
+    """
+    benchmarks = benchmarks or BENCHMARKS
+    results = []
+    for count in repos:
+        srcdir = create_workspace(os.path.join(root, str(count)), count,
+                                  packages, modules)
+        components = [os.path.join(srcdir, component)
+                      for component in get_component_names(count)]
+
+        def seed():
+            for component_dir in components:
+                seed_clean_targets(component_dir, packages, modules)
+
+        cases = {
+            'startup': lambda: time_reana(['version'], srcdir, runs),
+            'select-components': lambda: time_select_components(
+                srcdir, count, runs),
+            'git-status': lambda: time_reana(
+                ['git-status', '-c', 'BENCH'], srcdir, runs),
+            'git-fetch': lambda: time_reana(
+                ['git-fetch', '-c', 'BENCH', '--force'], srcdir, runs),
+            'git-clean': lambda: time_reana(
+                ['git-clean', '-c', 'BENCH'], srcdir, runs, setup=seed),
+        }
+        for benchmark in benchmarks:
+            result = summarize_durations(benchmark, count,
+                                         *cases[benchmark]())
+            results.append(result)
+            if callback:
+                callback(result)
+    return results
+
+
+def get_environment():
+    """Return description of the environment the benchmarks run in."""
+    commit = None
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], universal_newlines=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    git_version = subprocess.check_output(['git', '--version'],
+                                          universal_newlines=True).strip()
+    return {
+        'commit': commit,
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'git': git_version,
+    }
+
+
+def write_results(path, results, environment=None):
+    """Write the results with the environment description as JSON."""
+    with open(path, 'w') as fdesc:
+        json.dump({'environment': environment or get_environment(),
+                   'results': results}, fdesc, indent=2, sort_keys=True)
+        fdesc.write('\n')
+
+
+def load_results(path):
+    """Return the results of the JSON results file keyed by benchmark."""
+    with open(path) as fdesc:
+        data = json.load(fdesc)
+    return {(result['benchmark'], result['repos']): result
+            for result in data.get('results', [])}
+
+
+def compare_results(results, baseline):
+    """Return relative change of median durations with respect to baseline.
+
+    :param results: result entries
+    :param baseline: result entries keyed by benchmark name and number of
+                     components, see load_results()
+    :type results: list
+    :type baseline: dict
+
+    :return: mapping of (benchmark, repos) to relative change, e.g. 0.1
+             for ten percent slower; benchmarks missing in the baseline are
+             left out
+    :rtype: dict
+    """
+    changes = {}
+    for result in results:
+        key = (result['benchmark'], result['repos'])
+        previous = baseline.get(key)
+        if previous and previous['median']:
+            changes[key] = (result['median'] - previous['median']) / \
+                previous['median']
+    return changes
@@ -0,0 +1,693 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Docker image build helpers for REANA developers."""
+
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import time
+
+from reana.utils import format_size
+
+BUILD_STATE_FILENAME = '.reana-build-state.json'
+
+IMAGE_HISTORY_FILENAME = '.reana-image-history.jsonl'
+
+DEFAULT_BUILD_CACHE_SIZE = '10g'
+
+LAYER_STATUSES = {
+    'Pull complete': 'transferred',
+    'Pushed': 'transferred',
+    'Already exists': 'present',
+    'Layer already exists': 'present',
+}
+
+TRANSIENT_ERRORS = re.compile(
+    r'timeout|timed out|connection reset|connection refused|EOF|'
+    r'TLS handshake|toomanyrequests|too many requests|'
+    r'\b50[0234]\b|service unavailable|bad gateway|temporary failure',
+    re.IGNORECASE)
+
+MEMORY_UNITS = {
+    '': 1,
+    'b': 1,
+    'k': 1024,
+    'm': 1024 ** 2,
+    'g': 1024 ** 3,
+}
+
+
+def get_dockerfile_base_images(dockerfile):
+    """Return base images referenced by ``FROM`` lines of the Dockerfile.
+
+    References to earlier build stages of multi-stage Dockerfiles are not
+    returned since they are not images.
+
+    :param dockerfile: path to the Dockerfile
+    :type dockerfile: str
+
+    :return: base image names in order of appearance
+    :rtype: list
+    """
+    images = []
+    stages = set()
+    with open(dockerfile) as fdesc:
+        for line in fdesc:
+            words = line.split()
+            if not words or words[0].upper() != 'FROM':
+                continue
+            words = [word for word in words[1:]
+                     if not word.startswith('--')]
+            if not words:
+                continue
+            image = words[0]
+            if len(words) >= 3 and words[1].upper() == 'AS':
+                stages.add(words[2].lower())
+            if image.lower() not in stages:
+                images.append(image)
+    return images
+
+
+def get_image_repository(image):
+    """Return image name without tag and digest.
+
+    Example: reanahub/reana-commons:0.3.0 -> reanahub/reana-commons
+
+    :param image: image name
+    :type image: str
+
+    :return: image repository name
+    :rtype: str
+    """
+    image = image.split('@')[0]
+    name, _, tag = image.rpartition(':')
+    if name and '/' not in tag:
+        return name
+    return image
+
+
+def get_reana_base_images(dockerfile, components, users):
+    """Return the base images of the Dockerfile built from REANA components.
+
+    :param dockerfile: path to the Dockerfile
+    :param components: standard component names whose images may be
+                       referenced
+    :param users: Docker organisation or user names under which the REANA
+                  component images may be referenced in ``FROM`` lines
+    :type dockerfile: str
+    :type components: list
+    :type users: list
+
+    :return: mapping of base image names, as written in the Dockerfile, to
+             component names
+    :rtype: dict
+    """
+    images = {}
+    for component in components:
+        for user in users:
+            images['{0}/{1}'.format(user, component)] = component
+    return {image: images[get_image_repository(image)]
+            for image in get_dockerfile_base_images(dockerfile)
+            if get_image_repository(image) in images}
+
+
+def get_build_dependencies(components, dockerfiles, users, names=None):
+    """Return which of the given components are built on top of which.
+
+    :param components: standard component names
+    :param dockerfiles: mapping of component names to Dockerfile paths
+    :param users: Docker organisation or user names under which the REANA
+                  component images may be referenced in ``FROM`` lines
+    :param names: standard names of all components whose images may be
+                  referenced [default=components]
+    :type components: list
+    :type dockerfiles: dict
+    :type users: list
+    :type names: list
+
+    :return: mapping of component names to the set of components they depend
+             on
+    :rtype: dict
+    """
+    dependencies = {}
+    for component in components:
+        dependencies[component] = set(get_reana_base_images(
+            dockerfiles[component], components if names is None else names,
+            users).values())
+        dependencies[component].discard(component)
+    return dependencies
+
+
+def get_build_waves(dependencies):
+    """Return components grouped in waves that can be built concurrently.
+
+    Every component is placed in the first wave following all the waves of
+    the components it depends on.
+
+    :param dependencies: mapping of component names to the set of components
+                         they depend on
+    :type dependencies: dict
+
+    :return: list of waves, each wave being a sorted list of component names
+    :rtype: list
+
+    :raise: exception in case of circular dependencies
+    """
+    remaining = {component: set(deps) & set(dependencies)
+                 for component, deps in dependencies.items()}
+    waves = []
+    while remaining:
+        wave = sorted(component for component, deps in remaining.items()
+                      if not deps)
+        if not wave:
+            raise Exception('Circular image dependencies between {0}.'.format(
+                ', '.join(sorted(remaining))))
+        for component in wave:
+            del remaining[component]
+        for deps in remaining.values():
+            deps.difference_update(wave)
+        waves.append(wave)
+    return waves
+
+
+def get_critical_path(dependencies, durations):
+    """Return the longest chain of dependent builds.
+
+    :param dependencies: mapping of component names to the set of components
+                         they depend on
+    :param durations: mapping of component names to build times in seconds
+    :type dependencies: dict
+    :type durations: dict
+
+    :return: components on the critical path and its total duration
+    :rtype: tuple
+    """
+    finish = {}
+    previous = {}
+    for wave in get_build_waves(dependencies):
+        for component in wave:
+            start = 0.0
+            for dep in dependencies[component]:
+                if dep in finish and finish[dep] > start:
+                    start = finish[dep]
+                    previous[component] = dep
+            finish[component] = start + durations.get(component, 0.0)
+    if not finish:
+        return [], 0.0
+    component = max(sorted(finish), key=lambda name: finish[name])
+    total = finish[component]
+    path = [component]
+    while component in previous:
+        component = previous[component]
+        path.insert(0, component)
+    return path, total
+
+
+def parse_memory(value):
+    """Return number of bytes for the human memory value such as ``2g``.
+
+    :param value: memory amount with an optional b, k, m or g unit suffix
+    :type value: str
+
+    :return: number of bytes
+    :rtype: int
+
+    :raise: ValueError in case the value cannot be parsed
+    """
+    match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*([bkmg]?)b?\s*$', value.lower())
+    if not match:
+        raise ValueError('Cannot parse memory value {0}.'.format(value))
+    return int(float(match.group(1)) * MEMORY_UNITS[match.group(2)])
+
+
+def get_available_memory():
+    """Return memory available for new processes in bytes.
+
+    :return: available memory, or None when it cannot be determined
+    :rtype: int
+    """
+    try:
+        with open('/proc/meminfo') as fdesc:
+            for line in fdesc:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (IOError, OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def get_build_concurrency(jobs, memory=None, available_memory=None):
+    """Return how many images may be built at the same time.
+
+    :param jobs: maximum number of concurrent builds
+    :param memory: expected memory use of one build in bytes
+    :param available_memory: memory available for all builds in bytes
+    :type jobs: int
+    :type memory: int
+    :type available_memory: int
+
+    :return: number of concurrent builds, at least one
+    :rtype: int
+    """
+    if memory and available_memory:
+        jobs = min(jobs, available_memory // memory)
+    return max(1, jobs)
+
+
+def get_tracked_files(srcdir):
+    """Return files of the source directory that are tracked by Git.
+
+    Fall back to all files except the ``.git`` directory when the source
+    directory is not a Git repository.
+
+    :param srcdir: source code directory
+    :type srcdir: str
+
+    :return: sorted file paths relative to the source directory
+    :rtype: list
+    """
+    try:
+        output = subprocess.check_output(['git', 'ls-files', '-z'],
+                                         cwd=srcdir,
+                                         stderr=subprocess.DEVNULL)
+        return sorted(set(path for path in
+                          output.decode('utf-8').split('\0') if path))
+    except (subprocess.CalledProcessError, OSError):
+        files = []
+        for root, dirs, filenames in os.walk(srcdir):
+            dirs[:] = [name for name in dirs if name != '.git']
+            for filename in filenames:
+                files.append(os.path.relpath(os.path.join(root, filename),
+                                             srcdir))
+        return sorted(files)
+
+
+def get_build_context_hash(srcdir, image, build_args=(), base_hashes=()):
+    """Return content hash identifying an image build.
+
+    The hash covers the content and mode of tracked files including
+    uncommitted changes, the Dockerfile, the build arguments, the image name
+    and the hashes of the REANA base images.
+
+    :param srcdir: component source code directory
+    :param image: full image name including user and tag
+    :param build_args: ``KEY=VALUE`` build arguments
+    :param base_hashes: build hashes of the REANA images this one is based
+                        on, or local image ids of those not built in the
+                        same run
+    :type srcdir: str
+    :type image: str
+    :type build_args: list
+    :type base_hashes: list
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    digest.update('image\0{0}\0'.format(image).encode('utf-8'))
+    for build_arg in sorted(build_args):
+        digest.update('arg\0{0}\0'.format(build_arg).encode('utf-8'))
+    for base_hash in base_hashes:
+        digest.update('base\0{0}\0'.format(base_hash).encode('utf-8'))
+    files = get_tracked_files(srcdir)
+    if 'Dockerfile' not in files:
+        files.append('Dockerfile')
+    for path in files:
+        fullpath = os.path.join(srcdir, path)
+        try:
+            mode = os.lstat(fullpath).st_mode
+        except OSError:
+            continue  # deleted but not yet committed
+        digest.update('file\0{0}\0{1:o}\0'.format(path, mode).encode(
+            'utf-8'))
+        if os.path.islink(fullpath):
+            digest.update(os.readlink(fullpath).encode('utf-8'))
+        elif os.path.isfile(fullpath):
+            with open(fullpath, 'rb') as fdesc:
+                for chunk in iter(lambda: fdesc.read(1024 * 1024), b''):
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_image_id(image):
+    """Return id of the image known to the Docker daemon.
+
+    :param image: image name such as ``reanahub/reana-commons:latest``
+    :type image: str
+
+    :return: ``sha256:...`` image id, or None if the image is not present
+    :rtype: str
+    """
+    try:
+        return subprocess.check_output(
+            ['docker', 'image', 'inspect', '--format', '{{.Id}}', image],
+            stderr=subprocess.DEVNULL, universal_newlines=True).strip() or None
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+
+def get_local_images():
+    """Return images known to the Docker daemon.
+
+    :return: set of ``repository:tag`` names, or None if Docker cannot be
+             queried
+    :rtype: set
+    """
+    try:
+        output = subprocess.check_output(
+            ['docker', 'images', '--format', '{{.Repository}}:{{.Tag}}'],
+            stderr=subprocess.DEVNULL, universal_newlines=True)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return set(output.split())
+
+
+def parse_transfer_output(output):
+    """Return layers transferred and already present according to Docker.
+
+    :param output: output of ``docker pull`` or ``docker push``
+    :type output: str
+
+    :return: short ids of transferred layers and of layers already present
+    :rtype: tuple
+    """
+    transferred = set()
+    present = set()
+    for line in output.splitlines():
+        match = re.match(r'^([0-9a-f]{12}): (.*?)\s*$', line.strip())
+        if not match:
+            continue
+        layer, status = match.groups()
+        if status.startswith('Mounted from'):
+            status = 'Layer already exists'
+        kind = LAYER_STATUSES.get(status)
+        if kind == 'transferred':
+            transferred.add(layer)
+        elif kind == 'present':
+            present.add(layer)
+    return transferred, present - transferred
+
+
+def is_transient_error(output):
+    """Return whether the failed Docker transfer is worth retrying."""
+    return bool(TRANSIENT_ERRORS.search(output))
+
+
+def get_image_diff_ids(image):
+    """Return ids of the uncompressed layers of the local image.
+
+    :param image: image name such as ``reanahub/reana-server:latest``
+    :type image: str
+
+    :return: ``sha256:...`` layer DiffIDs from the base layer up, empty if
+             the image cannot be inspected
+    :rtype: list
+    """
+    try:
+        output = subprocess.check_output(
+            ['docker', 'image', 'inspect', '--format',
+             '{{json .RootFS.Layers}}', image],
+            stderr=subprocess.DEVNULL, universal_newlines=True)
+        return json.loads(output) or []
+    except (subprocess.CalledProcessError, OSError, ValueError):
+        return []
+
+
+def get_manifest_layer_sizes(image, diff_ids=None):
+    """Return compressed sizes of the image layers stored in the registry.
+
+    ``docker pull`` displays the layers by their compressed digests from
+    the manifest, while ``docker push`` displays them by their uncompressed
+    DiffIDs. Given the DiffIDs of the local image, see
+    get_image_diff_ids(), the manifest layers are keyed by them instead,
+    relying on both lists being in the same order.
+
+    :param image: image name such as ``reanahub/reana-server:latest``
+    :param diff_ids: DiffIDs of the local image
+    :type image: str
+    :type diff_ids: list
+
+    :return: mapping of short layer ids, as displayed by ``docker pull``, or
+             by ``docker push`` if DiffIDs are given, to sizes in bytes;
+             empty if the manifest cannot be inspected or does not match the
+             DiffIDs
+    :rtype: dict
+    """
+    try:
+        output = subprocess.check_output(
+            ['docker', 'manifest', 'inspect', '-v', image],
+            stderr=subprocess.DEVNULL, universal_newlines=True)
+        manifests = json.loads(output)
+    except (subprocess.CalledProcessError, OSError, ValueError):
+        return {}
+    if not isinstance(manifests, list):
+        manifests = [manifests]
+    machine = platform.machine()
+    architecture = {'x86_64': 'amd64', 'aarch64': 'arm64'}.get(machine,
+                                                               machine)
+    for manifest in manifests:
+        descriptor = manifest.get('Descriptor') or {}
+        if len(manifests) > 1 and (descriptor.get('platform') or {}).get(
+                'architecture') != architecture:
+            continue
+        content = manifest.get('SchemaV2Manifest') or \
+            manifest.get('OCIManifest') or {}
+        layers = [layer for layer in content.get('layers', [])
+                  if 'digest' in layer]
+        if diff_ids is None:
+            ids = [layer['digest'] for layer in layers]
+        elif len(diff_ids) == len(layers):
+            ids = diff_ids
+        else:
+            return {}
+        return {layer_id.split(':')[-1][:12]: layer.get('size', 0)
+                for layer_id, layer in zip(ids, layers)}
+    return {}
+
+
+def get_directory_size(path):
+    """Return total size of the files in the directory tree in bytes."""
+    size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                size += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                pass
+    return size
+
+
+def get_buildx_driver(builder):
+    """Return driver of the ``docker buildx`` builder.
+
+    :param builder: builder name
+    :type builder: str
+
+    :return: driver name such as ``docker`` or ``docker-container``, or
+             None if the builder does not exist
+    :rtype: str
+    """
+    try:
+        output = subprocess.check_output(
+            ['docker', 'buildx', 'inspect', builder],
+            stderr=subprocess.DEVNULL, universal_newlines=True)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    for line in output.splitlines():
+        key, _, value = line.partition(':')
+        if key.strip() == 'Driver':
+            return value.strip()
+    return None
+
+
+def ensure_buildx_builder(builder):
+    """Return driver of the builder, creating a BuildKit container if needed.
+
+    Cache export to local directories needs a builder that is not backed
+    by the ``docker`` driver, such as the default builder of the Docker
+    daemon of minikube. A missing builder is created with the
+    ``docker-container`` driver; it loads the built images into the Docker
+    daemon of the current environment.
+
+    :param builder: builder name
+    :type builder: str
+
+    :return: driver name, or None if the builder cannot be created
+    :rtype: str
+    """
+    driver = get_buildx_driver(builder)
+    if driver is None:
+        try:
+            subprocess.check_output(
+                ['docker', 'buildx', 'create', '--name', builder,
+                 '--driver', 'docker-container'],
+                stderr=subprocess.STDOUT)
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        driver = get_buildx_driver(builder)
+    return driver
+
+
+def prune_build_cache(cache_dir, max_size):
+    """Remove least recently used component caches above the size limit.
+
+    Each subdirectory of the cache directory holds the BuildKit cache of one
+    component; its modification time tells when it was last used.
+
+    :param cache_dir: build cache directory
+    :param max_size: maximum total size of the cache in bytes
+    :type cache_dir: str
+    :type max_size: int
+
+    :return: total size after pruning and names of removed subdirectories
+    :rtype: tuple
+    """
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0, []
+    entries = []
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            entries.append((os.stat(path).st_mtime, name,
+                            get_directory_size(path)))
+    entries.sort()
+    total = sum(size for _, _, size in entries)
+    removed = []
+    for _, name, size in entries:
+        if total <= max_size:
+            break
+        shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        total -= size
+        removed.append(name)
+    return total, removed
+
+
+def inspect_images(images):
+    """Return size and layer count of the images known to the Docker daemon.
+
+    :param images: image names such as ``reanahub/reana-server:latest``
+    :type images: list
+
+    :return: mapping of found image names to dictionaries with ``id``,
+             ``size`` (bytes) and ``layers`` keys
+    :rtype: dict
+    """
+    if not images:
+        return {}
+    try:
+        process = subprocess.run(
+            ['docker', 'image', 'inspect'] + list(images),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True)
+        details = json.loads(process.stdout or '[]')
+    except (OSError, ValueError):
+        return {}
+    result = {}
+    for detail in details:
+        info = {'id': detail.get('Id'), 'size': detail.get('Size'),
+                'layers': len((detail.get('RootFS') or {}).get('Layers')
+                              or [])}
+        for image in images:
+            if image in (detail.get('RepoTags') or []):
+                result[image] = info
+    return result
+
+
+def measure_cold_start(image):
+    """Return seconds needed to start a container of the image and exit.
+
+    :param image: image name
+    :type image: str
+
+    :return: duration of ``docker run --rm <image> true``, or None if the
+             container could not be run
+    :rtype: float
+    """
+    start = time.time()
+    try:
+        subprocess.check_call(['docker', 'run', '--rm', image, 'true'],
+                              stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return time.time() - start
+
+
+def load_image_history(path):
+    """Return image records of the history file, oldest first."""
+    records = []
+    try:
+        with open(path) as fdesc:
+            for line in fdesc:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    pass
+    except (IOError, OSError):
+        pass
+    return records
+
+
+def append_image_history(path, records):
+    """Append image records to the history file, one JSON object per line."""
+    with open(path, 'a') as fdesc:
+        for record in records:
+            fdesc.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+def check_image_size(size, previous_size=None, budget=None,
+                     max_growth=None):
+    """Return problems of the image size.
+
+    :param size: image size in bytes
+    :param previous_size: size of the previous version of the image
+    :param budget: maximum size in bytes
+    :param max_growth: maximum growth with respect to the previous version
+                       in percent
+    :type size: int
+    :type previous_size: int
+    :type budget: int
+    :type max_growth: float
+
+    :return: descriptions of exceeded limits
+    :rtype: list
+    """
+    problems = []
+    if budget is not None and size > budget:
+        problems.append('size {0} exceeds budget {1}'.format(
+            format_size(size), format_size(budget)))
+    if max_growth is not None and previous_size:
+        growth = (size - previous_size) * 100.0 / previous_size
+        if growth > max_growth:
+            problems.append('grew by {0:.1f}% from {1}'.format(
+                growth, format_size(previous_size)))
+    return problems
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Removal of build leftovers from REANA source code trees."""
+
+import fnmatch
+import os
+
+CLEAN_FILE_PATTERNS = ['*.pyc']
+
+CLEAN_DIR_PATTERNS = ['*.egg-info', '.eggs', '__pycache__']
+
+CLEAN_DOCS_DIR_PATTERNS = ['_build']
+
+SKIP_DIRS = ['.git']
+
+
+def is_clean_target(path, is_dir):
+    """Return whether ``reana git-clean`` removes the path.
+
+    :param path: path relative to the component source directory, with
+                 ``/`` separators
+    :param is_dir: whether the path is a directory
+    :type path: str
+    :type is_dir: bool
+
+    :return: True for compiled Python files, egg metadata, ``__pycache__``
+             and documentation builds under ``docs``
+    :rtype: bool
+    """
+    name = path.rsplit('/', 1)[-1]
+    if not is_dir:
+        return any(fnmatch.fnmatch(name, pattern)
+                   for pattern in CLEAN_FILE_PATTERNS)
+    if any(fnmatch.fnmatch(name, pattern) for pattern in CLEAN_DIR_PATTERNS):
+        return True
+    return path.startswith('docs/') and any(
+        fnmatch.fnmatch(name, pattern) for pattern in CLEAN_DOCS_DIR_PATTERNS)
+
+
+def _remove_tree(path, dry_run=False):
+    """Remove the directory tree, reading every directory only once.
+
+    :return: number of files removed and their total size in bytes
+    :rtype: tuple
+    """
+    files = 0
+    size = 0
+    for entry in list(os.scandir(path)):
+        if entry.is_dir(follow_symlinks=False):
+            tree_files, tree_size = _remove_tree(entry.path, dry_run)
+            files += tree_files
+            size += tree_size
+        else:
+            size += entry.stat(follow_symlinks=False).st_size
+            files += 1
+            if not dry_run:
+                os.unlink(entry.path)
+    if not dry_run:
+        os.rmdir(path)
+    return files, size
+
+
+def clean_tree(srcdir, dry_run=False):
+    """Remove build leftovers from the source tree in a single traversal.
+
+    Directories to remove are not descended into and ``.git`` directories
+    are skipped, so that each relevant directory is read only once.
+
+    :param srcdir: component source directory
+    :param dry_run: whether to only report what would be removed
+    :type srcdir: str
+    :type dry_run: bool
+
+    :return: number of files removed, their total size in bytes, and error
+             messages of the paths that could not be removed
+    :rtype: tuple
+    """
+    files = 0
+    size = 0
+    errors = []
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        try:
+            entries = list(os.scandir(os.path.join(srcdir, relative_dir)))
+        except OSError as err:
+            errors.append(str(err))
+            continue
+        for entry in entries:
+            path = relative_dir + entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir and entry.name in SKIP_DIRS:
+                    continue
+                if not is_clean_target(path, is_dir):
+                    if is_dir:
+                        stack.append(path + '/')
+                    continue
+                if is_dir:
+                    tree_files, tree_size = _remove_tree(entry.path, dry_run)
+                else:
+                    tree_files = 1
+                    tree_size = entry.stat(follow_symlinks=False).st_size
+                    if not dry_run:
+                        os.unlink(entry.path)
+            except OSError as err:
+                errors.append(str(err))
+                continue
+            files += tree_files
+            size += tree_size
+    return files, size, errors
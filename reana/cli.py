@@ -22,16 +22,31 @@
 
 """Helper scripts for REANA developers. Run `reana --help` for help."""
 
+import atexit
+import functools
+import importlib
 import os
-import subprocess
 import sys
 
 import click
 
+from reana.registry import shorten_component_name  # noqa: F401
+
 SRCDIR = os.environ.get('REANA_SRCDIR')
 
 GITHUB_USER = os.environ.get('REANA_GITHUB_USER')
 
+MIRRORDIR = os.environ.get('REANA_MIRRORDIR')
+
+UPSTREAM_URL = 'git@github.com:reanahub/{0}'
+
+UPSTREAM_REFSPECS = ['+refs/heads/*:refs/remotes/upstream/*',
+                     '+refs/pull/*/head:refs/remotes/upstream/pr/*']
+
+DEFAULT_JOBS = os.cpu_count() or 1
+
+DEFAULT_FETCH_MAX_AGE = 0
+
 REPO_LIST_ALL = [
     'reana',
     'reana-client',
@@ -75,8 +90,115 @@ REPO_LIST_CLUSTER = [
     'reana-workflow-monitor',
 ]
 
+LAZY_COMMANDS = {
+    'benchmark': ('reana.commands.benchmark:benchmark',
+                  'Benchmark REANA commands on synthetic source workspaces.'),
+    'daemon': ('reana.commands.daemon:daemon',
+               'Serve reana commands from a warm process over a Unix '
+               'socket.'),
+    'docker-build': ('reana.commands.docker:docker_build',
+                     'Build REANA component images.'),
+    'docker-context': ('reana.commands.docker:docker_context',
+                       'Analyse build contexts of REANA component images.'),
+    'docker-images': ('reana.commands.docker:docker_images',
+                      'List REANA component images.'),
+    'docker-pull': ('reana.commands.docker:docker_pull',
+                    'Pull REANA component images from DockerHub.'),
+    'docker-push': ('reana.commands.docker:docker_push',
+                    'Push REANA component images to DockerHub.'),
+    'docker-rmi': ('reana.commands.docker:docker_rmi',
+                   'Remove REANA component images.'),
+    'git-checkout': ('reana.commands.git:git_checkout',
+                     'Check out local branch corresponding to a component '
+                     'pull request.'),
+    'git-clean': ('reana.commands.git:git_clean',
+                  'Clean REANA source repository code tree.'),
+    'git-clone': ('reana.commands.git:git_clone',
+                  'Clone REANA source repositories from GitHub.'),
+    'git-diff': ('reana.commands.git:git_diff',
+                 'Diff checked-out REANA local source code repositories.'),
+    'git-fetch': ('reana.commands.git:git_fetch',
+                  'Fetch REANA upstream source code repositories without '
+                  'upgrade.'),
+    'git-fork': ('reana.commands.git:git_fork',
+                 'Display commands to fork REANA source code repositories on '
+                 'GitHub.'),
+    'git-mirror': ('reana.commands.git:git_mirror',
+                   'Create or refresh local mirrors of REANA upstream '
+                   'repositories.'),
+    'git-push': ('reana.commands.git:git_push',
+                 'Push REANA local repositories to GitHub origin.'),
+    'git-status': ('reana.commands.git:git_status',
+                   'Report status of REANA source repositories.'),
+    'git-unshallow': ('reana.commands.git:git_unshallow',
+                      'Fetch full history and contents of shallow, partial '
+                      'or sparse clones.'),
+    'git-upgrade': ('reana.commands.git:git_upgrade',
+                    'Upgrade REANA local source code repositories.'),
+    'install': ('reana.commands.install:install',
+                'Install REANA components in editable mode.'),
+    'stats': ('reana.commands.stats:stats',
+              'Show duration statistics of the commands run.'),
+    'sync': ('reana.commands.sync:sync',
+             'Copy changed source files into running REANA components.'),
+    'watch': ('reana.commands.watch:watch',
+              'Rebuild REANA components whenever their source code changes.'),
+}
+# commands imported on first use: name -> (module:attribute, short help)
+
+
+class LazyGroup(click.Group):
+    """Command group importing command implementations only when invoked.
+
+    The short help of lazy commands is taken from the ``lazy_commands``
+    table, so that listing the commands does not import them either.
+    """
 
-@click.group()
+    def __init__(self, *args, **kwargs):
+        """Initialise the group.
+
+        :param lazy_commands: mapping of command names to ``module:attribute``
+                              import paths and short help texts
+        :type lazy_commands: dict
+        """
+        self.lazy_commands = kwargs.pop('lazy_commands', {})
+        super(LazyGroup, self).__init__(*args, **kwargs)
+
+    def list_commands(self, ctx):
+        """Return names of eager and lazy commands."""
+        return sorted(set(super(LazyGroup, self).list_commands(ctx)) |
+                      set(self.lazy_commands))
+
+    def get_command(self, ctx, name):
+        """Return the command, importing it if needed."""
+        if name not in self.commands and name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[name][0].split(':')
+            module = importlib.import_module(module_name)
+            self.add_command(getattr(module, attribute), name)
+        return super(LazyGroup, self).get_command(ctx, name)
+
+    def format_commands(self, ctx, formatter):
+        """Write the command list without importing lazy commands."""
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            command = self.commands.get(name)
+            if command is None:
+                short_help = self.lazy_commands[name][1]
+                if len(short_help) > limit:
+                    short_help = short_help[:limit - 3].rsplit(' ', 1)[0] + \
+                        '...'
+                rows.append((name, short_help))
+            elif not getattr(command, 'hidden', False):
+                rows.append((name, command.get_short_help_str(limit)))
+        with formatter.section('Commands'):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 def cli():  # noqa: D301
     """Run REANA development and integration commands.
 
@@ -111,6 +233,38 @@ def cli():  # noqa: D301
         $ eval "$(reana git-fork -c ALL)"
         $ reana git-clone -c ALL
 
+    How to set up a development virtual environment for the cloned sources:
+
+    .. code-block:: console
+
+        \b
+        $ export REANA_PIP_CACHE_DIR=~/.cache/reana/pip
+        $ reana install -c CLUSTER --venv ~/.virtualenvs/reana-dev
+
+    How to provision a workspace from local mirrors of upstream repositories:
+
+    .. code-block:: console
+
+        \b
+        $ # refresh all mirrors in $REANA_SRCDIR/.reana-mirrors in one batch
+        $ reana git-mirror -c ALL
+        $ # clone and fetch from the mirrors without network transfers
+        $ reana git-clone -c ALL
+        $ reana git-fetch -c ALL
+
+    How to save time and disk space in throwaway workspaces:
+
+    .. code-block:: console
+
+        \b
+        $ # define which files to check out in the configuration file
+        $ cat $REANA_SRCDIR/.reana.cfg
+        [sparse-checkout]
+        DEMOS = /* !/data/
+        $ reana git-clone -c ALL --depth 1 --filter blob:none --sparse
+        $ # fetch full history and all files of some components later
+        $ reana git-unshallow -c reana-demo-cms-h4l
+
     How to compile and deploy latest ``master`` REANA cluster:
 
     .. code-block:: console
@@ -124,6 +278,25 @@ def cli():  # noqa: D301
         $ reana-cluster -f reana-cluster-latest.yaml init
         $ # we now have REANA cluster running "master" versions of components
 
+    How to keep image build contexts small:
+
+    .. code-block:: console
+
+        \b
+        $ reana docker-context -c CLUSTER
+        $ # add the suggested patterns to .dockerignore files
+        $ reana docker-context -c CLUSTER --write
+        $ reana docker-build --context-budget 50m
+
+    How to build the shared Python dependencies of all images only once:
+
+    .. code-block:: console
+
+        \b
+        $ export REANA_WHEELHOUSE=~/.cache/reana/wheelhouse
+        $ # Dockerfiles install with the ``wheelhouse`` build context mounted
+        $ reana docker-build -c CLUSTER --wheel-python python3.6
+
     How to test one component pull request:
 
     .. code-block:: console
@@ -136,6 +309,34 @@ def cli():  # noqa: D301
         $ kubectl get pods
         $ # we can now try to run an example
 
+    How to rebuild images of the components being edited automatically:
+
+    .. code-block:: console
+
+        \b
+        $ reana watch -c CLUSTER
+        $ # or run any other command in the changed components only
+        $ reana watch -c CLUSTER -x 'python setup.py test'
+
+    How to answer shell prompts and editor plugins from a warm process:
+
+    .. code-block:: console
+
+        \b
+        $ reana daemon &
+        $ # served by the daemon, falls back to in-process when it is down
+        $ reana git-status -c .
+        $ reana daemon --stop
+
+    How to try a code change in the running cluster without rebuilding:
+
+    .. code-block:: console
+
+        \b
+        $ reana sync -c reana-server -s HUP
+        $ # copy into a directory mounted into the cluster instead
+        $ reana sync -c reana-server -T local -t /mnt/code/{0}
+
     How to test multiple component branches:
 
     .. code-block:: console
@@ -150,6 +351,18 @@ def cli():  # noqa: D301
         $ kubectl get pods
         $ # we can now try to run an example
 
+    How to select components by groups, patterns and prefixes:
+
+    .. code-block:: console
+
+        \b
+        $ reana git-status -c ENGINES -c 'r-w-engine-*' -c reana-demo-cms
+        $ # define your own groups in the configuration file
+        $ cat $REANA_SRCDIR/.reana.cfg
+        [groups]
+        WEB = reana-server reana-ui
+        $ reana git-status -c WEB
+
     How to release and push cluster component images:
 
     .. code-block:: console
@@ -162,27 +375,18 @@ def cli():  # noqa: D301
         $ reana docker-build -t 0.3.0.dev20180625
         $ reana docker-push -t 0.3.0.dev20180625
         $ # we should now make PR for ``reana-cluster.yaml`` to use given tag
-    """
-    pass
 
+    How to check a change for performance regressions:
 
-def shorten_component_name(component):
-    """Return canonical short version of the component name.
-
-    Example: reana-job-controller -> r-j-controller
-
-    :param component: standard component name
-    :type component: str
+    .. code-block:: console
 
-    :return: short component name
-    :rtype: str
+        \b
+        $ git checkout master
+        $ reana benchmark -n 10 -n 100 -o master.json
+        $ git checkout my-branch
+        $ reana benchmark -n 10 -n 100 -o my-branch.json --compare master.json
     """
-    short_name = ''
-    parts = component.split('-')
-    for part in parts[:-1]:
-        short_name += part[0] + '-'
-    short_name += parts[-1]
-    return short_name
+    pass
 
 
 def find_standard_component_name(short_component_name):
@@ -198,15 +402,93 @@ def find_standard_component_name(short_component_name):
 
     :raise: exception in case more than one is found
     """
-    output = []
-    for component in REPO_LIST_ALL:
-        component_short_name = shorten_component_name(component)
-        if component_short_name == short_component_name:
-            output.append(component)
-    if len(output) == 1:
-        return output[0]
-    raise Exception('Component name {0} cannot be uniquely mapped.'.format(
-        'short_component_name'))
+    return get_component_registry().find_standard_name(short_component_name)
+
+
+@functools.lru_cache(maxsize=None)
+def get_component_registry():
+    """Return the registry of known components and component groups.
+
+    Besides ``ALL`` and ``CLUSTER``, the groups ``DEMOS``, ``ENGINES`` and
+    ``ENVS`` are predefined. Additional components and groups may be defined
+    in the configuration file given by ``$REANA_CONFIG``, by default
+    ``$REANA_SRCDIR/.reana.cfg``.
+
+    :return: component registry
+    :rtype: reana.registry.ComponentRegistry
+    """
+    from reana.registry import DEFAULT_GROUPS, ComponentRegistry, \
+        load_registry_config
+    components = list(REPO_LIST_ALL)
+    groups = dict(DEFAULT_GROUPS, CLUSTER=REPO_LIST_CLUSTER)
+    config = get_config_path()
+    if config:
+        extra_components, extra_groups = load_registry_config(config)
+        components.extend(extra_components)
+        groups.update(extra_groups)
+    return ComponentRegistry(components, groups)
+
+
+def get_config_path():
+    """Return path of the existing configuration file, or None.
+
+    :return: ``$REANA_CONFIG``, by default ``$REANA_SRCDIR/.reana.cfg``
+    :rtype: str
+    """
+    from reana.registry import CONFIG_FILENAME
+    config = os.environ.get('REANA_CONFIG')
+    if not config and SRCDIR:
+        config = os.path.join(SRCDIR, CONFIG_FILENAME)
+    if config and os.path.exists(config):
+        return config
+    return None
+
+
+def get_component_config(component, section):
+    """Return values of the config file section entries matching the component.
+
+    :param component: standard component name
+    :param section: section of the configuration file
+    :type component: str
+    :type section: str
+
+    :return: values of the matching entries in the order of the file
+    :rtype: list
+    """
+    from reana.registry import ComponentNameError, load_config_section
+    config = get_config_path()
+    if not config:
+        return []
+    registry = get_component_registry()
+    values = []
+    for name, value in load_config_section(config, section):
+        try:
+            matches = registry.resolve(name)
+        except ComponentNameError:
+            continue
+        if component in matches:
+            values.append(value)
+    return values
+
+
+def get_sparse_profile(component):
+    """Return sparse-checkout patterns configured for the component.
+
+    Profiles are defined in the ``[sparse-checkout]`` section of the
+    configuration file; the patterns of all profiles matching the component
+    are combined.
+
+    :param component: standard component name
+    :type component: str
+
+    :return: sparse-checkout patterns, empty if the component has no profile
+    :rtype: list
+    """
+    patterns = []
+    for value in get_component_config(component, 'sparse-checkout'):
+        patterns.extend(pattern for pattern in value.split()
+                        if pattern not in patterns)
+    return patterns
 
 
 def get_srcdir(component=''):
@@ -231,18 +513,113 @@ def get_srcdir(component=''):
         return SRCDIR
 
 
-def get_current_branch(srcdir):
-    """Return current Git branch name checked out in the given directory.
+def get_mirror_dir(component=''):
+    """Return directory of the local bare mirror of the given REANA component.
+
+    :param component: standard component name
+    :type component: str
+
+    :return: mirror directory for given component, or the directory holding
+             all mirrors [default=$REANA_SRCDIR/.reana-mirrors]
+    :rtype: str
+    """
+    mirrordir = MIRRORDIR or os.path.join(get_srcdir(), '.reana-mirrors')
+    if component:
+        return os.path.join(mirrordir, component + '.git')
+    return mirrordir
+
+
+def get_upstream_fetch_command(component):
+    """Return command fetching upstream of the component.
+
+    Fetches from the local mirror if there is one, see ``reana git-mirror``.
 
     :param component: standard component name
     :type component: str
 
+    :return: shell command
+    :rtype: str
+    """
+    import shlex
+    mirror = get_mirror_dir(component)
+    if os.path.isdir(mirror):
+        return 'git fetch {0} {1}'.format(
+            shlex.quote(mirror),
+            ' '.join(shlex.quote(refspec) for refspec in UPSTREAM_REFSPECS))
+    return 'git fetch upstream'
+
+
+def get_current_branch(srcdir):
+    """Return current Git branch name checked out in the given directory.
+
+    :param srcdir: component source code directory
+    :type srcdir: str
+
     :return: checkout out branch in the component source code directory
     :rtype: str
     """
-    os.chdir(srcdir)
-    return subprocess.getoutput('git branch 2>/dev/null | '
-                                'grep "^*" | colrm 1 2')
+    from reana.gitstatus import get_repository_status
+    status = get_repository_status(srcdir)
+    if status['branch']:
+        return status['branch']
+    if status['sha']:
+        return '(HEAD detached at {0})'.format(status['sha'][:7])
+    return ''
+
+
+@functools.lru_cache(maxsize=None)
+def get_workspace_index():
+    """Return the component metadata index shared by all commands.
+
+    The index is stored in ``$REANA_SRCDIR/.reana-index`` when the process
+    exits.
+
+    :return: workspace index
+    :rtype: reana.index.WorkspaceIndex
+    """
+    from reana.index import WorkspaceIndex
+    index = WorkspaceIndex(get_srcdir())
+    atexit.register(index.save)
+    return index
+
+
+def get_fetch_age(component):
+    """Return seconds elapsed since upstream of the component was fetched.
+
+    The age is based on the time recorded in the workspace index by the
+    reana commands fetching upstream, see record_upstream_fetch(), so that
+    fetching other remotes does not make upstream look fresh. A fetch is
+    considered outdated when the local mirror of the component was refreshed
+    after it.
+
+    :param component: standard component name
+    :type component: str
+
+    :return: age in seconds, or None if unknown or outdated
+    :rtype: float
+    """
+    last_fetch = get_workspace_index().get_upstream_fetch(component)
+    if last_fetch is None:
+        return None
+    try:
+        mirror_fetch = os.stat(os.path.join(get_mirror_dir(component),
+                                            'FETCH_HEAD')).st_mtime
+    except OSError:
+        mirror_fetch = None
+    if mirror_fetch is not None and mirror_fetch > last_fetch:
+        return None
+    import time
+    age = time.time() - last_fetch
+    return age if age >= 0 else None
+
+
+def record_upstream_fetch(component):
+    """Record that upstream of the component was just fetched.
+
+    :param component: standard component name
+    :type component: str
+    """
+    get_workspace_index().set_upstream_fetch(component)
 
 
 def select_components(components):
@@ -257,35 +634,30 @@ def select_components(components):
                           * (4) special value 'CLUSTER' that will expand to
                                 cover all REANA cluster components;
                           * (5) special value 'ALL' that will expand to include
-                                all REANA repositories.
+                                all REANA repositories;
+                          * (6) other group names such as 'DEMOS', 'ENGINES',
+                                'ENVS' or groups from the configuration file;
+                          * (7) glob patterns such as 'r-w-engine-*';
+                          * (8) unique prefixes of standard or short names.
     :type components: list
 
     :return: Unique standard component names.
     :rtype: list
 
     """
-    short_component_names = [shorten_component_name(name)
-                             for name in REPO_LIST_ALL]
+    from reana.registry import ComponentNameError
+    registry = get_component_registry()
     output = set([])
     for component in components:
-        if component == 'ALL':
-            for repo in REPO_LIST_ALL:
-                output.add(repo)
-        elif component == 'CLUSTER':
-            for repo in REPO_LIST_CLUSTER:
-                output.add(repo)
-        elif component == '.':
+        if component == '.':
             cwd = os.path.basename(os.getcwd())
             output.add(cwd)
-        elif component in REPO_LIST_ALL:
-            output.add(component)
-        elif component in short_component_names:
-            component_standard_name = find_standard_component_name(component)
-            output.add(component_standard_name)
-        else:
-            display_message('Ignoring unknown component {0}.'.format(
-                component))
-    return list(output)
+            continue
+        try:
+            output.update(registry.resolve(component))
+        except ComponentNameError as err:
+            display_message('{0} Ignoring it.'.format(err))
+    return registry.sort(output)
 
 
 def is_component_dockerised(component):
@@ -301,28 +673,123 @@ def is_component_dockerised(component):
     :return: True/False whether the component is dockerisable
     :rtype: bool
     """
-    if os.path.exists(get_srcdir(component) + os.sep + 'Dockerfile'):
-        return True
-    return False
+    return get_workspace_index().get(component)['dockerised']
+
+
+def get_history_file():
+    """Return path of the execution history file, or None if not configured.
+
+    :return: ``$REANA_SRCDIR/.reana-history.jsonl``
+    :rtype: str
+    """
+    from reana.history import HISTORY_FILENAME
+    if not SRCDIR or not os.path.isdir(SRCDIR):
+        return None
+    return os.path.join(SRCDIR, HISTORY_FILENAME)
 
 
 def run_command(cmd, component=''):
     """Run given command in the given component source directory.
 
-    Exit in case of troubles.
+    Exit in case of troubles. The execution is recorded in the history file,
+    see ``reana stats``.
 
     :param cmd: shell command to run
     :param component: standard component name
     :type cmd: str
     :type component: str
     """
+    from reana.history import record_execution, run_recorded
     click.secho('[{0}] {1}'.format(component, cmd), bold=True)
     if component:
         os.chdir(get_srcdir(component))
-    try:
-        subprocess.run(cmd, shell=True, check=True)
-    except subprocess.CalledProcessError as err:
-        sys.exit(err.cmd)
+    returncode, _, record = run_recorded(cmd)
+    history_file = get_history_file()
+    if history_file:
+        record_execution(history_file, cmd, component, record)
+    if returncode:
+        sys.exit(cmd)
+
+
+def run_command_sequence(cmds, component='', srcdir=None):
+    """Run given commands one after another and capture their output.
+
+    Stop at the first failing command. Contrary to run_command(), the output
+    is buffered so that it can be displayed as one block when several
+    components are processed concurrently. The executions are recorded in
+    the history file, see ``reana stats``.
+
+    :param cmds: shell commands to run
+    :param component: standard component name
+    :param srcdir: directory where to run the commands [default=component
+                   source directory]
+    :type cmds: list
+    :type component: str
+    :type srcdir: str
+
+    :return: exit status of the last command run and the output lines
+    :rtype: tuple
+    """
+    from reana.history import record_execution, run_recorded
+    if srcdir is None:
+        srcdir = get_srcdir(component) if component else os.getcwd()
+    history_file = get_history_file()
+    output = []
+    for cmd in cmds:
+        output.append(click.style('[{0}] {1}'.format(component, cmd),
+                                  bold=True))
+        returncode, stdout, record = run_recorded(cmd, srcdir, capture=True)
+        if history_file:
+            record_execution(history_file, cmd, component, record)
+        if stdout:
+            output.append(stdout.rstrip('\n'))
+        if returncode:
+            output.append(click.style(
+                '[{0}] Command failed with exit status {1}.'.format(
+                    component, returncode), fg='red'))
+            return returncode, output
+    return 0, output
+
+
+def run_parallel(func, components, jobs=DEFAULT_JOBS):
+    """Run given function for each component in a bounded worker pool.
+
+    The output of each component is displayed as one block as soon as the
+    component is done.
+
+    :param func: function taking the standard component name and returning
+                 the exit status and the output lines, such as
+                 run_command_sequence()
+    :param components: standard component names
+    :param jobs: maximum number of components processed at the same time
+    :type func: callable
+    :type components: list
+    :type jobs: int
+
+    :return: aggregated exit status, i.e. zero if all components succeeded,
+             otherwise the highest exit code encountered, see
+             ``reana.runner.get_exit_code()``
+    :rtype: int
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from reana.runner import get_exit_code
+    get_srcdir()  # fail early if the source directory is not configured
+    status = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {executor.submit(func, component): component
+                   for component in components}
+        for future in as_completed(futures):
+            component_status, output = future.result()
+            if output:
+                click.echo('\n'.join(output))
+            if component_status:
+                failed.append(futures[future])
+                status = max(status, get_exit_code(component_status))
+    if failed:
+        display_message('Failed components: {0}.'.format(
+            ', '.join(sorted(failed))))
+    return status
 
 
 def display_message(msg, component=''):
@@ -347,468 +814,3 @@ def version():
 def help():
     """Display usage help tips and tricks."""
     click.echo(cli.__doc__)
-
-
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [shortname|name|.|CLUSTER|ALL]')
-@click.option('--browser', '-b', default='firefox',
-              help='Which browser to use? [firefox]')
-@cli.command(name='git-fork')
-def git_fork(component, browser):  # noqa: D301
-    """Display commands to fork REANA source code repositories on GitHub.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :param browser: The web browser to use. [default=firefox]
-    :type component: str
-    :type browser: str
-    """
-    components = select_components(component)
-    if components:
-        click.echo('# Fork REANA repositories on GitHub using your browser.')
-        click.echo('# Run the following eval and then complete the fork'
-                   ' process in your browser.')
-        click.echo('#')
-        click.echo('# eval "$(reana git-fork -b {0} {1})"'.format(
-            browser,
-            "".join([" -c {0}".format(c) for c in component])))
-    for component in components:
-        cmd = '{0} https://github.com/reanahub/{1}/fork;'.format(browser,
-                                                                 component)
-        click.echo(cmd)
-    click.echo('echo "Please continue the fork process in the opened'
-               ' browser windows."')
-
-
-@click.option('--user', '-u', default=GITHUB_USER,
-              help='GitHub user name [{0}]'.format(GITHUB_USER))
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [shortname|name|.|CLUSTER|ALL]')
-@cli.command(name='git-clone')
-def git_clone(user, component):  # noqa: D301
-    """Clone REANA source repositories from GitHub.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :param user: The GitHub user name. [default=$REANA_GITHUB_USER]
-    :type component: str
-    :type user: str
-    """
-    if not GITHUB_USER:
-        click.echo('Please set environment variable REANA_GITHUB_USER to your'
-                   ' GitHub user name.')
-        click.echo('Example: $ export REANA_GITHUB_USER=tiborsimko')
-        sys.exit(1)
-    components = select_components(component)
-    for component in components:
-        os.chdir(get_srcdir())
-        cmd = 'git clone git@github.com:{0}/{1}'.format(user, component)
-        run_command(cmd)
-        for cmd in [
-            'git remote add upstream'
-                ' "git@github.com:reanahub/{0}"'.format(component),
-            'git config --add remote.upstream.fetch'
-                ' "+refs/pull/*/head:refs/remotes/upstream/pr/*"',
-        ]:
-            run_command(cmd, component)
-
-
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [shortname|name|.|CLUSTER|ALL]')
-@cli.command(name='git-status')
-def git_status(component):  # noqa: D301
-    """Report status of REANA source repositories.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :type component: str
-    """
-    components = select_components(component)
-    for component in components:
-        branch = get_current_branch(get_srcdir(component))
-        click.secho('- {0}'.format(component), nl=False, bold=True)
-        if branch == 'master':
-            click.secho(' @ {0}'.format(branch))
-        else:
-            click.secho(' @ {0}'.format(branch), fg='red')
-
-
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [shortname|name|.|CLUSTER|ALL]')
-@cli.command(name='git-clean')
-def git_clean(component):  # noqa: D301
-    """Clean REANA source repository code tree.
-
-    Removes pyc, eggs, _build and other leftover friends.
-    Less aggressive then "git clean -x".
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :type component: str
-    """
-    components = select_components(component)
-    for component in components:
-        for cmd in [
-            'find . -name "*.pyc" -delete',
-            'find . -type d -name "*.egg-info" -exec rm -rf {} \\;',
-            'find . -type d -name ".eggs" -exec rm -rf {} \\;',
-            'find . -type d -name __pycache__ -delete',
-            'find docs -type d -name "_build" -exec rm -rf {} \\;'
-        ]:
-            run_command(cmd, component)
-
-
-@click.option('--branch', '-b', nargs=2, multiple=True,
-              help='Which PR? [number component]')
-@click.option('--fetch', is_flag=True, default=False)
-@cli.command(name='git-checkout')
-def git_checkout(branch, fetch):  # noqa: D301
-    """Check out local branch corresponding to a component pull request.
-
-    The ``-b`` option can be repetitive to check out several pull requests in
-    several repositories at the same time.
-
-    \b
-    :param branch: The option ``branch`` can be repeated. The value consist of
-                   two strings specifying the component name and the pull
-                   request number. For example, ``-b reana-job-controler 72``
-                   will create a local branch called ``pr-72`` in the
-                   reana-job-component source code directory.
-    :param fetch: Should we fetch latest upstream first? [default=False]
-    :type component: str
-    :type fetch: bool
-    """
-    for cpr in branch:
-        component, pull_request = cpr
-        component = select_components([component, ])[0]
-        if component in REPO_LIST_ALL:
-            if fetch:
-                cmd = 'git fetch upstream'
-                run_command(cmd, component)
-            cmd = 'git checkout -b pr-{0} upstream/pr/{0}'.format(pull_request)
-            run_command(cmd, component)
-        else:
-            msg = 'Ignoring unknown component.'
-            display_message(msg, component)
-
-
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [shortname|name|.|CLUSTER|ALL]')
-@cli.command(name='git-fetch')
-def git_fetch(component):  # noqa: D301
-    """Fetch REANA upstream source code repositories without upgrade.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :type component: str
-    """
-    for component in select_components(component):
-        cmd = 'git fetch upstream'
-        run_command(cmd, component)
-
-
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [shortname|name|.|CLUSTER|ALL]')
-@cli.command(name='git-upgrade')
-def git_upgrade(component):  # noqa: D301
-    """Upgrade REANA local source code repositories.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :type component: str
-    """
-    for component in select_components(component):
-        for cmd in ['git fetch upstream',
-                    'git checkout master',
-                    'git merge --ff-only upstream/master',
-                    'git push origin master',
-                    'git checkout -']:
-            run_command(cmd, component)
-
-
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [shortname|name|.|CLUSTER|ALL]')
-@cli.command(name='git-diff')
-def git_diff(component):  # noqa: D301
-    """Diff checked-out REANA local source code repositories.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :type component: str
-    """
-    for component in select_components(component):
-        for cmd in ['git diff master', ]:
-            run_command(cmd, component)
-
-
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [name|CLUSTER]')
-@cli.command(name='git-push')
-def git_push(full, component):  # noqa: D301
-    """Push REANA local repositories to GitHub origin.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :type component: str
-    """
-    components = select_components(component)
-    for component in components:
-        for cmd in ['git push origin master']:
-            run_command(cmd, component)
-
-
-@click.option('--user', '-u', default='reanahub',
-              help='DockerHub user name [reanahub]')
-@click.option('--tag', '-t', default='latest',
-              help='Image tag [latest]')
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [name|CLUSTER]')
-@click.option('--no-cache', is_flag=True)
-@cli.command(name='docker-build')
-def docker_build(user, tag, component, no_cache):  # noqa: D301
-    """Build REANA component images.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :param user: DockerHub organisation or user name. [default=reanahub]
-    :param tag: Docker tag to use. [default=latest]
-    :param no_cache: Flag instructing to avoid using cache. [default=False]
-    :type component: str
-    :type user: str
-    :type tag: str
-    :type no_cache: bool
-    """
-    components = select_components(component)
-    for component in components:
-        if is_component_dockerised(component):
-            if no_cache:
-                cmd = 'docker build --no-cache -t {0}/{1}:{2} .'.format(
-                    user, component, tag)
-            else:
-                cmd = 'docker build -t {0}/{1}:{2} .'.format(
-                    user, component, tag)
-            run_command(cmd, component)
-        else:
-            msg = 'Ignoring this component that does not contain' \
-                  ' a Dockerfile.'
-            display_message(msg, component)
-
-
-@click.option('--user', '-u', default='reanahub',
-              help='DockerHub user name [reanahub]')
-@cli.command(name='docker-images')
-def docker_images(user):  # noqa: D301
-    """List REANA component images.
-
-    :param user: DockerHub user name. [default=reanahub]
-    :type user: str
-    """
-    cmd = 'docker images | grep {0}'.format(user)
-    run_command(cmd)
-
-
-@click.option('--user', '-u', default='reanahub',
-              help='DockerHub user name [reanahub]')
-@click.option('--tag', '-t', default='latest',
-              help='Image tag [latest]')
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [name|CLUSTER]')
-@cli.command(name='docker-rmi')
-def docker_rmi(user, tag, component):  # noqa: D301
-    """Remove REANA component images.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :param user: DockerHub organisation or user name. [default=reanahub]
-    :param tag: Docker tag to use. [default=latest]
-    :type component: str
-    :type user: str
-    :type tag: str
-    """
-    components = select_components(component)
-    for component in components:
-        if is_component_dockerised(component):
-            cmd = 'docker rmi {0}/{1}:{2}'.format(user, component, tag)
-            run_command(cmd, component)
-        else:
-            msg = 'Ignoring this component that does not contain' \
-                  ' a Dockerfile.'
-            display_message(msg, component)
-
-
-@click.option('--user', '-u', default='reanahub',
-              help='DockerHub user name [reanahub]')
-@click.option('--tag', '-t', default='latest',
-              help='Image tag [latest]')
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [name|CLUSTER]')
-@cli.command(name='docker-push')
-def docker_push(user, tag, component):  # noqa: D301
-    """Push REANA component images to DockerHub.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :param user: DockerHub organisation or user name. [default=reanahub]
-    :param tag: Docker tag to use. [default=latest]
-    :type component: str
-    :type user: str
-    :type tag: str
-    """
-    components = select_components(component)
-    for component in components:
-        if is_component_dockerised(component):
-            cmd = 'docker push {0}/{1}:{2}'.format(user, component, tag)
-            run_command(cmd, component)
-        else:
-            msg = 'Ignoring this component that does not contain' \
-                  ' a Dockerfile.'
-            display_message(msg, component)
-
-
-@click.option('--user', '-u', default='reanahub',
-              help='DockerHub user name [reanahub]')
-@click.option('--tag', '-t', default='latest',
-              help='Image tag [latest]')
-@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
-              help='Which components? [name|CLUSTER]')
-@cli.command(name='docker-pull')
-def docker_pull(user, tag, component):  # noqa: D301
-    """Pull REANA component images from DockerHub.
-
-    \b
-    :param components: The option ``component`` can be repeated. The value may
-                       consist of:
-                         * (1) standard component name such as
-                               'reana-job-controller';
-                         * (2) short component name such as 'r-j-controller';
-                         * (3) special value '.' indicating component of the
-                               current working directory;
-                         * (4) special value 'CLUSTER' that will expand to
-                               cover all REANA cluster components [default];
-                         * (5) special value 'ALL' that will expand to include
-                               all REANA repositories.
-    :param user: DockerHub organisation or user name. [default=reanahub]
-    :param tag: Docker tag to use. [default=latest]
-    :type component: str
-    :type user: str
-    :type tag: str
-    """
-    components = select_components(component)
-    for component in components:
-        if is_component_dockerised(component):
-            cmd = 'docker pull {0}/{1}:{2}'.format(user, component, tag)
-            run_command(cmd, component)
-        else:
-            msg = 'Ignoring this component that does not contain' \
-                  ' a Dockerfile.'
-            display_message(msg, component)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Thin ``reana`` client forwarding commands to ``reana daemon``.
+
+The ``reana`` entry point only imports this module, which does not import
+click nor the command implementations. The commands listed in
+``DAEMON_COMMANDS`` are sent to the daemon serving ``$REANA_SRCDIR`` when
+its socket exists; everything else, and every command when no daemon
+answers, runs in-process as before.
+
+Requests and responses are single JSON lines, so that prompt integrations
+and editor plugins may talk to the socket directly. The daemon confirms
+that it took the request before running it, then sends the response::
+
+    {"argv": ["git-status", "-c", "."], "cwd": "/code/reana-server",
+     "srcdir": "/code", "config": null, "color": false}
+    {"accepted": true}
+    {"exit_code": 0, "output": "- reana-server @ master ..."}
+"""
+
+import json
+import os
+import socket
+import sys
+
+DAEMON_SOCKET_FILENAME = '.reana-daemon.sock'
+
+DAEMON_COMMANDS = ('docker-context', 'git-status', 'stats', 'version')
+# commands whose output entirely goes through click and can be served
+
+DAEMON_CONNECT_TIMEOUT = 2.0
+# seconds to wait for the daemon to accept the request before running the
+# command in-process, kept short since the commands are called from prompts
+
+DAEMON_ACCEPTED = {'accepted': True}
+
+
+def get_socket_path(srcdir=None):
+    """Return path of the daemon socket.
+
+    :param srcdir: directory containing the component source directories
+                   [default=$REANA_SRCDIR]
+    :type srcdir: str
+
+    :return: ``$REANA_DAEMON_SOCKET``, by default
+             ``$REANA_SRCDIR/.reana-daemon.sock``; None if neither is set
+    :rtype: str
+    """
+    path = os.environ.get('REANA_DAEMON_SOCKET')
+    if path:
+        return path
+    srcdir = srcdir or os.environ.get('REANA_SRCDIR')
+    if not srcdir:
+        return None
+    return os.path.join(srcdir, DAEMON_SOCKET_FILENAME)
+
+
+def send_message(sock, message):
+    """Send the message as one JSON line."""
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def receive_message(reader):
+    """Return the next message, or None if the socket was closed.
+
+    :param reader: binary file object of the socket, see
+                   ``socket.makefile()``
+
+    :raise: ValueError if the message is not valid JSON
+    """
+    data = reader.readline()
+    if not data:
+        return None
+    return json.loads(data.decode('utf-8'))
+
+
+def forward(argv, path, timeout=DAEMON_CONNECT_TIMEOUT):
+    """Run the command in the daemon.
+
+    Once the daemon confirmed that it accepted the request, the response is
+    waited for without timeout, so that a long command is never run a
+    second time in-process while the daemon is still running it. A daemon
+    that is stopped or busy with another request does not confirm in time,
+    and the command runs in-process instead.
+
+    :param argv: command line arguments without the program name
+    :param path: daemon socket path
+    :param timeout: seconds to wait for the daemon to confirm the request
+    :type argv: list
+    :type path: str
+    :type timeout: float
+
+    :return: response with ``exit_code`` and ``output`` keys, or None if
+             the daemon cannot serve the command
+    :rtype: dict
+    """
+    if not os.path.exists(path):
+        return None
+    request = {
+        'argv': list(argv),
+        'cwd': os.getcwd(),
+        'srcdir': os.environ.get('REANA_SRCDIR'),
+        'config': os.environ.get('REANA_CONFIG'),
+        'color': sys.stdout.isatty(),
+    }
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        send_message(sock, request)
+        with sock.makefile('rb') as reader:
+            if receive_message(reader) != DAEMON_ACCEPTED:
+                return None
+            sock.settimeout(None)
+            response = receive_message(reader)
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+    if not isinstance(response, dict) or 'exit_code' not in response:
+        return None
+    return response
+
+
+def main(argv=None):
+    """Run ``reana``, through the daemon when it serves the command."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in DAEMON_COMMANDS and \
+            not os.environ.get('REANA_NO_DAEMON'):
+        path = get_socket_path()
+        response = forward(argv, path) if path else None
+        if response is not None:
+            sys.stdout.write(response['output'])
+            sys.stdout.flush()
+            sys.exit(response['exit_code'])
+    from reana.cli import cli
+    cli(argv, prog_name='reana')
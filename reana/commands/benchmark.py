@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA benchmark commands."""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import click
+
+from reana.benchmark import BENCHMARKS, DEFAULT_MODULES, DEFAULT_PACKAGES, \
+    DEFAULT_REPOS, DEFAULT_RUNS, compare_results, load_results, \
+    run_benchmarks, write_results
+
+
+@click.option('--repos', '-n', multiple=True, type=click.IntRange(min=1),
+              help='How many repositories? [{0}]'.format(
+                  ', '.join(str(count) for count in DEFAULT_REPOS)))
+@click.option('--benchmark', '-b', multiple=True,
+              type=click.Choice(BENCHMARKS),
+              help='Which benchmarks? [all]')
+@click.option('--runs', '-r', default=DEFAULT_RUNS,
+              type=click.IntRange(min=1),
+              help='How many runs of every benchmark? [{0}]'.format(
+                  DEFAULT_RUNS))
+@click.option('--packages', default=DEFAULT_PACKAGES,
+              type=click.IntRange(min=1),
+              help='How many Python packages per repository? [{0}]'.format(
+                  DEFAULT_PACKAGES))
+@click.option('--modules', default=DEFAULT_MODULES,
+              type=click.IntRange(min=1),
+              help='How many modules per package? [{0}]'.format(
+                  DEFAULT_MODULES))
+@click.option('--output', '-o', default='benchmark-results.json',
+              type=click.Path(dir_okay=False, writable=True),
+              help='Where to write results? [benchmark-results.json]')
+@click.option('--compare', type=click.Path(exists=True, dir_okay=False),
+              help='Results file of a previous run to compare with.')
+@click.option('--workdir', type=click.Path(file_okay=False),
+              help='Where to create the synthetic workspaces? They are kept '
+                   'if given. [temporary directory]')
+@click.command(name='benchmark')
+def benchmark(repos, benchmark, runs, packages, modules, output, compare,
+              workdir):  # noqa: D301
+    """Benchmark REANA commands on synthetic source workspaces.
+
+    For every number of repositories, a synthetic ``$REANA_SRCDIR`` is
+    created with the repositories registered as the ``BENCH`` group in its
+    ``.reana.cfg`` and with a local bare ``upstream`` remote each. The
+    following are then timed:
+
+    \b
+      * startup: ``reana version`` in a fresh interpreter;
+      * select-components: loading the component registry and resolving
+        ``ALL``, a group, a pattern and every short name in-process;
+      * git-status: ``reana git-status -c BENCH``;
+      * git-fetch: ``reana git-fetch -c BENCH --force`` from the local remotes;
+      * git-clean: ``reana git-clean -c BENCH`` on trees full of leftovers.
+
+    The durations, their minimum, median and maximum, together with the
+    commit, Python and git versions, are written to the JSON output file.
+    With ``--compare``, median durations are compared with a previous
+    results file, e.g. one obtained on the parent commit.
+
+    \b
+    :param repos: Number of repositories in the workspace. The option can be
+                  repeated. [default=10, 100 and 500]
+    :param benchmark: Benchmark to run. The option can be repeated.
+                      [default=all]
+    :param runs: Number of runs of every benchmark. [default=5]
+    :param packages: Number of Python packages in every repository.
+                     [default=20]
+    :param modules: Number of modules in every package. [default=10]
+    :param output: JSON file to write the results to.
+                   [default=benchmark-results.json]
+    :param compare: JSON results file of a previous run.
+    :param workdir: Directory to create the workspaces in, kept afterwards.
+                    [default=temporary directory removed afterwards]
+    :type repos: int
+    :type benchmark: str
+    :type runs: int
+    :type packages: int
+    :type modules: int
+    :type output: str
+    :type compare: str
+    :type workdir: str
+    """
+    baseline = load_results(compare) if compare else {}
+    root = workdir or tempfile.mkdtemp(prefix='reana-benchmark-')
+    if workdir and os.path.exists(workdir) and os.listdir(workdir):
+        click.echo('Directory {0} is not empty.'.format(workdir), err=True)
+        sys.exit(1)
+
+    def report(result):
+        line = '{0:<18} {1:>5} repos {2:>9.3f}s median {3:>9.3f}s min'.format(
+            result['benchmark'], result['repos'], result['median'],
+            result['min'])
+        if result['failures']:
+            line += click.style(' ({0} failed)'.format(result['failures']),
+                                fg='yellow')
+        change = compare_results([result], baseline).get(
+            (result['benchmark'], result['repos']))
+        if change is None:
+            click.echo(line)
+        else:
+            click.echo(line + click.style(
+                ' {0:+.0%}'.format(change),
+                fg='red' if change > 0.1 else 'green' if change < -0.1
+                else None))
+
+    try:
+        results = run_benchmarks(root, repos or DEFAULT_REPOS, runs,
+                                 benchmark, packages, modules,
+                                 callback=report)
+    finally:
+        if not workdir:
+            shutil.rmtree(root, ignore_errors=True)
+    write_results(output, results)
+    click.echo('Results written to {0}.'.format(output))
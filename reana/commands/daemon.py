@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA command daemon commands."""
+
+import os
+import sys
+
+import click
+
+from reana.cli import display_message, get_config_path, get_srcdir, \
+    select_components
+from reana.client import get_socket_path
+from reana.daemon import DaemonError, DaemonServer, stop_daemon
+
+
+@click.option('--socket', 'socket_path', envvar='REANA_DAEMON_SOCKET',
+              default=None,
+              help='Socket path [$REANA_SRCDIR/.reana-daemon.sock]')
+@click.option('--component', '-c', multiple=True, default=['ALL'],
+              help='Which components to watch? '
+                   '[shortname|name|.|CLUSTER|ALL]')
+@click.option('--poll', is_flag=True, default=False,
+              help='Check the trees on every request instead of using '
+                   'inotify.')
+@click.option('--stop', is_flag=True, default=False,
+              help='Stop the running daemon.')
+@click.option('--verbose', '-v', is_flag=True, default=False,
+              help='Report every request served.')
+@click.command(name='daemon')
+def daemon(socket_path, component, poll, stop, verbose):  # noqa: D301
+    """Serve reana commands from a warm process over a Unix socket.
+
+    The daemon keeps the component registry and the workspace index in
+    memory and watches the working trees of the components with inotify,
+    so that the uncommitted changes of a component are only checked again
+    after its files or its Git index changed. A change is seen as soon as
+    the daemon reads its inotify event, usually within milliseconds; a
+    request sent right after saving a file may still get the previous
+    state. Without inotify, or with ``--poll``, the trees are not watched
+    and the uncommitted changes are checked on every request, so that the
+    answers are never stale. While the daemon runs, the ``reana``
+    command forwards the read-only commands to it instead of starting up
+    and scanning ``$REANA_SRCDIR`` itself, falling back to in-process
+    execution when the daemon does not answer. Set ``REANA_NO_DAEMON=1``
+    to always run in-process. The served commands are ``docker-context``,
+    ``git-status``, ``stats`` and ``version``.
+
+    \b
+    :param socket_path: Socket path. [default=$REANA_DAEMON_SOCKET or
+                        $REANA_SRCDIR/.reana-daemon.sock]
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components;
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories [default].
+    :param poll: Whether to check the trees on every request instead of
+                 using inotify. [default=False]
+    :param stop: Whether to stop the running daemon. [default=False]
+    :param verbose: Whether to report every request. [default=False]
+    :type socket_path: str
+    :type component: str
+    :type poll: bool
+    :type stop: bool
+    :type verbose: bool
+    """
+    srcdir = get_srcdir()
+    socket_path = socket_path or get_socket_path(srcdir)
+    if stop:
+        if stop_daemon(socket_path):
+            display_message('Stopped daemon listening on {0}.'.format(
+                socket_path))
+        else:
+            display_message('No daemon listening on {0}.'.format(
+                socket_path))
+            sys.exit(1)
+        return
+    srcdirs = {}
+    for component in select_components(component):
+        path = get_srcdir(component)
+        if os.path.isdir(path):
+            srcdirs[component] = path
+    try:
+        server = DaemonServer(socket_path, srcdir, get_config_path(),
+                              srcdirs, poll)
+    except DaemonError as err:
+        display_message(str(err))
+        sys.exit(1)
+    if server.reason:
+        display_message('Cannot use inotify, checking the trees on every '
+                        'request instead: {0}'.format(server.reason))
+    display_message('Serving {0} on {1}, watching {2} components, press '
+                    'Ctrl+C to stop.'.format(srcdir, socket_path,
+                                             len(srcdirs)))
+
+    def report(request, duration):
+        if verbose:
+            display_message('{0} in {1:.1f}ms'.format(
+                ' '.join(request.get('argv') or [request.get('request')]),
+                duration * 1000))
+
+    try:
+        server.serve_forever(report)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    display_message('Stopped after serving {0} requests.'.format(
+        server.requests))
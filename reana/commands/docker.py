@@ -0,0 +1,964 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA Docker image commands."""
+
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+
+from reana.build import BUILD_STATE_FILENAME, DEFAULT_BUILD_CACHE_SIZE, \
+    IMAGE_HISTORY_FILENAME, append_image_history, check_image_size, \
+    ensure_buildx_builder, get_available_memory, get_build_concurrency, \
+    get_build_context_hash, get_build_dependencies, get_build_waves, \
+    get_critical_path, get_image_diff_ids, get_image_id, get_local_images, \
+    get_manifest_layer_sizes, get_reana_base_images, inspect_images, \
+    is_transient_error, load_image_history, measure_cold_start, \
+    parse_memory, parse_transfer_output, prune_build_cache
+from reana.cli import DEFAULT_JOBS, display_message, get_component_config, \
+    get_component_registry, get_srcdir, is_component_dockerised, \
+    run_command, run_command_sequence, run_parallel, select_components
+from reana.context import DOCKERIGNORE_FILENAME, \
+    add_dockerignore_patterns, get_largest_contributors, load_dockerignore, \
+    scan_build_context, suggest_dockerignore
+from reana.state import load_state, save_state
+from reana.utils import format_size
+from reana.wheelhouse import REQUIREMENTS_FILENAME, WHEELHOUSE_MOUNT, \
+    find_local_dependencies, get_python_tag, get_requirement_files, \
+    get_wheel_command, get_wheelhouse_key, prune_wheelhouses, \
+    read_requirements
+
+DEFAULT_BUILDX_BUILDER = 'reana'
+
+DEFAULT_TRANSFER_JOBS = 4
+
+DEFAULT_TRANSFER_RETRIES = 3
+
+DEFAULT_TRANSFER_BACKOFF = 1.0
+
+
+def get_context_budget(component, default=None):
+    """Return maximum build context size of the component in bytes.
+
+    :param component: standard component name
+    :param default: budget in bytes when none is configured
+    :type component: str
+    :type default: int
+
+    :return: budget from the ``[context-budgets]`` section of the
+             configuration file, else the default
+    :rtype: int
+    """
+    budget = default
+    for value in get_component_config(component, 'context-budgets'):
+        try:
+            budget = parse_memory(value)
+        except ValueError as err:
+            display_message(str(err), component)
+    return budget
+
+
+def prepare_wheelhouse(root, components, python):
+    """Build the shared wheelhouse of the components unless cached.
+
+    The requirements of all components and the local libraries they depend
+    on are built in one ``pip wheel`` run. If the requirements cannot be
+    resolved together, e.g. because components pin different versions, the
+    wheels are built per component, reusing the wheels built so far.
+
+    :param root: directory holding one wheelhouse per key
+    :param components: standard names of the components to build images of
+    :param python: Python interpreter running pip, matching the images
+    :type root: str
+    :type components: list
+    :type python: str
+
+    :return: wheelhouse directory and its key, or None on failure
+    :rtype: tuple
+    """
+    srcdirs = {component: get_srcdir(component) for component in components}
+    libraries = {}
+    for component in select_components(['ALL']):
+        srcdir = get_srcdir(component)
+        if os.path.exists(os.path.join(srcdir, 'setup.py')):
+            libraries[component] = srcdir
+    local_names = find_local_dependencies(srcdirs, libraries)
+    library_srcdirs = {name: libraries[name] for name in local_names}
+    requirement_files = {component: get_requirement_files(srcdir)
+                         for component, srcdir in srcdirs.items()}
+    requirements = read_requirements(
+        [path for component in components
+         for path in requirement_files[component]], local_names)
+    try:
+        python_tag = get_python_tag(python)
+    except (OSError, subprocess.CalledProcessError) as err:
+        display_message('Cannot run {0}: {1}'.format(python, err))
+        return None
+    key = get_wheelhouse_key(requirements, library_srcdirs, python_tag)
+    wheelhouse = os.path.join(root, key[:16])
+    if os.path.isdir(wheelhouse):
+        os.utime(wheelhouse)
+        display_message('Using wheelhouse {0}.'.format(wheelhouse))
+        return wheelhouse, key
+    os.makedirs(root, exist_ok=True)
+    tmpdir = tempfile.mkdtemp(prefix='.{0}.'.format(key[:16]), dir=root)
+    merged = os.path.join(tmpdir, REQUIREMENTS_FILENAME)
+    with open(merged, 'w') as fdesc:
+        fdesc.write(''.join(line + '\n' for line in requirements))
+    sources = [library_srcdirs[name] for name in local_names]
+    display_message('Building wheelhouse of {0} requirements and {1} local'
+                    ' libraries{2}.'.format(
+                        len(requirements), len(local_names),
+                        ' ({0})'.format(', '.join(local_names))
+                        if local_names else ''))
+    start = time.time()
+    status, output = run_command_sequence(
+        [get_wheel_command(python, tmpdir, [merged], sources)])
+    if status:
+        display_message('Cannot resolve the requirements together, building'
+                        ' them per component.')
+        cmds = [get_wheel_command(python, tmpdir, sources=sources)] + [
+            get_wheel_command(python, tmpdir, requirement_files[component])
+            for component in components if requirement_files[component]]
+        status, output = run_command_sequence(cmds)
+    if status:
+        click.echo('\n'.join(output))
+        display_message('Cannot build the wheelhouse.')
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        return None
+    os.remove(merged)
+    try:
+        os.rename(tmpdir, wheelhouse)
+    except OSError:
+        shutil.rmtree(tmpdir, ignore_errors=True)  # built concurrently
+    wheels = [name for name in os.listdir(wheelhouse)
+              if name.endswith('.whl')]
+    removed = prune_wheelhouses(root)
+    display_message('Built wheelhouse {0} of {1} wheels in {2:.1f}s{3}.'
+                    .format(wheelhouse, len(wheels), time.time() - start,
+                            ', removed {0}'.format(', '.join(removed))
+                            if removed else ''))
+    return wheelhouse, key
+
+
+@click.option('--user', '-u', default='reanahub',
+              help='DockerHub user name [reanahub]')
+@click.option('--tag', '-t', default='latest',
+              help='Image tag [latest]')
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [name|CLUSTER]')
+@click.option('--no-cache', is_flag=True)
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many images in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.option('--memory', '-m', default=None,
+              help='Expected memory use per image build, limiting how many'
+                   ' run at once, e.g. 2g [none]')
+@click.option('--build-arg', multiple=True,
+              help='Docker build argument [KEY=VALUE]')
+@click.option('--force', '-f', is_flag=True, default=False,
+              help='Rebuild even if the sources did not change.')
+@click.option('--cache-dir', envvar='REANA_BUILD_CACHE_DIR',
+              help='Persistent BuildKit cache directory [none]')
+@click.option('--builder', envvar='REANA_BUILDX_BUILDER',
+              default=DEFAULT_BUILDX_BUILDER,
+              help='BuildKit builder used with --cache-dir [{0}]'.format(
+                  DEFAULT_BUILDX_BUILDER))
+@click.option('--cache-size', envvar='REANA_BUILD_CACHE_SIZE',
+              default=DEFAULT_BUILD_CACHE_SIZE,
+              help='Maximum size of the cache directory [{0}]'.format(
+                  DEFAULT_BUILD_CACHE_SIZE))
+@click.option('--cache-from', multiple=True,
+              help='Cache source image, e.g. reanahub/{0}:latest')
+@click.option('--context-budget', default=None,
+              help='Maximum build context size, e.g. 50m [none]')
+@click.option('--wheelhouse', envvar='REANA_WHEELHOUSE',
+              help='Shared wheelhouse cache directory [none]')
+@click.option('--wheel-python', default=sys.executable,
+              help='Python building the wheels [{0}]'.format(
+                  os.path.basename(sys.executable)))
+@click.command(name='docker-build')
+def docker_build(user, tag, component, no_cache, jobs, memory, build_arg,
+                 force, cache_dir, builder, cache_size, cache_from,
+                 context_budget, wheelhouse, wheel_python):  # noqa: D301
+    """Build REANA component images.
+
+    Images are built in waves following the ``FROM`` dependencies between
+    REANA component Dockerfiles, so that an image is only built after the
+    REANA images it is based on. The images of each wave are built
+    concurrently.
+
+    The build is skipped when the content hash of the tracked component
+    files, the build arguments, the image name and the REANA base images is
+    the same as for the last successful build of the image, and the image is
+    still known to the Docker daemon. REANA base images that are not built
+    in the same run are hashed by their local image id, so that rebuilding
+    them separately rebuilds the images based on them. The hashes are
+    recorded in ``$REANA_SRCDIR/.reana-build-state.json``.
+
+    With ``--cache-dir``, images are built by ``docker buildx`` which
+    imports and exports the BuildKit cache of each component from and to a
+    subdirectory of the cache directory, so that the cache survives the
+    Docker daemon, e.g. after ``minikube delete``. Exporting the cache needs
+    a builder using the ``docker-container`` driver rather than the
+    ``docker`` driver of the default builder, e.g. of the minikube Docker
+    daemon; the ``--builder`` is therefore created with that driver if it
+    does not exist, and if it uses the ``docker`` driver, or cannot be
+    created, images are built by ``docker build`` without the persistent
+    cache. The least recently used
+    component caches are removed when the directory grows above
+    ``--cache-size``. Images given by ``--cache-from`` are used as cache
+    sources too and the built images embed their cache metadata, so that
+    they can serve as cache sources once pushed.
+
+    Before building, the size of the build context, i.e. the files not
+    excluded by ``.dockerignore``, is checked against ``--context-budget``
+    or the budget of the component in the ``[context-budgets]`` section of
+    the ``.reana.cfg`` configuration file, see ``reana docker-context``.
+
+    With ``--wheelhouse``, the wheels of the ``requirements*.txt`` files of
+    all components being built and of the local sources of the REANA
+    libraries they require, such as ``reana-commons``, are built once into a
+    subdirectory of the wheelhouse directory named after the hash of the
+    requirements, the library sources and the Python version. The wheelhouse
+    is kept for the next runs and passed to every image build as the
+    ``wheelhouse`` build context, with ``PIP_FIND_LINKS=/wheelhouse`` as
+    build argument. A Dockerfile uses it by mounting the context where pip
+    installs the requirements:
+
+    \b
+        ARG PIP_FIND_LINKS
+        RUN --mount=type=bind,from=wheelhouse,target=/wheelhouse \\
+            pip install -r requirements.txt
+
+    The wheels are only picked by pip when their tags match the Python of
+    the image, see ``--wheel-python``.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param user: DockerHub organisation or user name. [default=reanahub]
+    :param tag: Docker tag to use. [default=latest]
+    :param no_cache: Flag instructing to avoid using cache. [default=False]
+    :param jobs: Maximum number of images to build concurrently.
+                 [default=number of CPUs]
+    :param memory: Expected memory use of each image build. The number of
+                   concurrent builds is reduced so that they fit in the
+                   available memory; the builds themselves are not limited,
+                   since BuildKit does not support memory limits.
+                   [default=none]
+    :param build_arg: Docker build arguments. The option can be repeated.
+    :param force: Flag instructing to build even unchanged images.
+                  [default=False]
+    :param cache_dir: Directory of the persistent BuildKit cache.
+                      [default=$REANA_BUILD_CACHE_DIR]
+    :param builder: ``docker buildx`` builder used with ``--cache-dir``.
+                    [default=$REANA_BUILDX_BUILDER or reana]
+    :param cache_size: Maximum size of the cache directory, e.g. 10g.
+                       [default=$REANA_BUILD_CACHE_SIZE or 10g]
+    :param cache_from: Cache source images where ``{0}`` stands for the
+                       component name. The option can be repeated.
+    :param context_budget: Maximum size of the build context of each image.
+                           [default=none]
+    :param wheelhouse: Directory of the shared wheelhouses.
+                       [default=$REANA_WHEELHOUSE or none]
+    :param wheel_python: Python interpreter building the wheels.
+                         [default=current interpreter]
+    :type component: str
+    :type user: str
+    :type tag: str
+    :type no_cache: bool
+    :type jobs: int
+    :type memory: str
+    :type build_arg: str
+    :type force: bool
+    :type cache_dir: str
+    :type builder: str
+    :type cache_size: str
+    :type cache_from: str
+    :type context_budget: str
+    :type wheelhouse: str
+    :type wheel_python: str
+    """
+    memory_bytes = None
+    if memory:
+        try:
+            memory_bytes = parse_memory(memory)
+        except ValueError as err:
+            raise click.BadParameter(str(err), param_hint='--memory')
+    if cache_dir:
+        try:
+            cache_size_bytes = parse_memory(cache_size)
+        except ValueError as err:
+            raise click.BadParameter(str(err), param_hint='--cache-size')
+        cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        driver = ensure_buildx_builder(builder)
+        if driver in (None, 'docker'):
+            display_message(
+                'Builder {0} {1}, cannot export the BuildKit cache; building'
+                ' with docker build instead.'.format(
+                    builder, 'uses the docker driver' if driver else
+                    'cannot be created'))
+            cache_dir = None
+    components = []
+    for component in select_components(component):
+        if is_component_dockerised(component):
+            components.append(component)
+        else:
+            msg = 'Ignoring this component that does not contain' \
+                  ' a Dockerfile.'
+            display_message(msg, component)
+    default_context_budget = None
+    if context_budget:
+        try:
+            default_context_budget = parse_memory(context_budget)
+        except ValueError as err:
+            raise click.BadParameter(str(err), param_hint='--context-budget')
+    oversized = []
+    for component in components:
+        budget = get_context_budget(component, default_context_budget)
+        if budget is None:
+            continue
+        size = sum(scan_build_context(get_srcdir(component)).values())
+        if size > budget:
+            display_message('Build context of {0} exceeds the budget of {1},'
+                            ' see reana docker-context.'.format(
+                                format_size(size), format_size(budget)),
+                            component)
+            oversized.append(component)
+    if oversized:
+        sys.exit(1)
+    wheelhouse_dir = None
+    hashed_args = build_arg
+    if wheelhouse and components:
+        prepared = prepare_wheelhouse(
+            os.path.abspath(os.path.expanduser(wheelhouse)), components,
+            wheel_python)
+        if not prepared:
+            sys.exit(1)
+        wheelhouse_dir, wheelhouse_key = prepared
+        build_arg = tuple(build_arg) + (
+            'PIP_FIND_LINKS={0}'.format(WHEELHOUSE_MOUNT), )
+        hashed_args = build_arg + ('wheelhouse={0}'.format(wheelhouse_key), )
+    dockerfiles = {component: os.path.join(get_srcdir(component),
+                                           'Dockerfile')
+                   for component in components}
+    users = [user, 'reanahub']
+    names = sorted(set(get_component_registry().components) |
+                   set(components))
+    dependencies = get_build_dependencies(components, dockerfiles, users,
+                                          names)
+    waves = get_build_waves(dependencies)
+    concurrency = get_build_concurrency(jobs, memory_bytes,
+                                        get_available_memory())
+    options = ''
+    if no_cache:
+        options += ' --no-cache'
+    for arg in build_arg:
+        options += ' --build-arg {0}'.format(shlex.quote(arg))
+    if wheelhouse_dir:
+        options += ' --build-context {0}'.format(shlex.quote(
+            'wheelhouse={0}'.format(wheelhouse_dir)))
+    use_cache = not (force or no_cache)
+    state_file = os.path.join(get_srcdir(), BUILD_STATE_FILENAME)
+    state = load_state(state_file)
+    local_images = get_local_images() if use_cache and components else None
+    hashes = {}
+    durations = {}
+    built = set()
+    skipped = []
+
+    def get_image(component):
+        return '{0}/{1}:{2}'.format(user, component, tag)
+
+    def get_base_hashes(component):
+        # base images not built in this run are identified by their local
+        # image id, so that rebuilding them in another run is noticed
+        base_hashes = []
+        for image, base in sorted(get_reana_base_images(
+                dockerfiles[component], names, users).items()):
+            if base == component:
+                continue
+            if base in hashes:
+                base_hashes.append(hashes[base])
+            else:
+                base_hashes.append('{0}@{1}'.format(image,
+                                                    get_image_id(image)))
+        return base_hashes
+
+    def get_build_command(component):
+        sources = [] if no_cache else [template.format(component)
+                                       for template in cache_from]
+        if cache_dir:
+            cache = os.path.join(cache_dir, component)
+            cmd = 'docker buildx build --builder {0} --load'.format(
+                shlex.quote(builder))
+            if os.path.isdir(cache) and not no_cache:
+                cmd += ' --cache-from {0}'.format(shlex.quote(
+                    'type=local,src={0}'.format(cache)))
+            cmd += ' --cache-to {0}'.format(shlex.quote(
+                'type=local,dest={0}.new,mode=max'.format(cache)))
+            for source in sources:
+                cmd += ' --cache-from {0}'.format(shlex.quote(
+                    'type=registry,ref={0}'.format(source)))
+        else:
+            cmd = 'docker build'
+            for source in sources:
+                cmd += ' --cache-from {0}'.format(shlex.quote(source))
+        if cache_from:
+            cmd += ' --build-arg BUILDKIT_INLINE_CACHE=1'
+        return '{0}{1} -t {2} .'.format(cmd, options, get_image(component))
+
+    def build(component):
+        cmd = get_build_command(component)
+        start = time.time()
+        status, output = run_command_sequence([cmd], component)
+        durations[component] = time.time() - start
+        if not status:
+            built.add(component)
+        if cache_dir:
+            cache = os.path.join(cache_dir, component)
+            if not status and os.path.isdir(cache + '.new'):
+                shutil.rmtree(cache, ignore_errors=True)
+                os.replace(cache + '.new', cache)
+            else:
+                shutil.rmtree(cache + '.new', ignore_errors=True)
+        return status, output
+
+    start = time.time()
+    for number, wave in enumerate(waves, 1):
+        to_build = []
+        for component in wave:
+            image = get_image(component)
+            hashes[component] = get_build_context_hash(
+                get_srcdir(component), image, hashed_args,
+                get_base_hashes(component))
+            if use_cache and local_images and image in local_images \
+                    and state.get(image) == hashes[component]:
+                display_message('Sources did not change, skipping build.',
+                                component)
+                durations[component] = 0.0
+                skipped.append(component)
+            else:
+                to_build.append(component)
+        if to_build:
+            display_message('Building wave {0}/{1}: {2}'.format(
+                number, len(waves), ', '.join(to_build)))
+        status = run_parallel(build, to_build, concurrency)
+        for component in built.intersection(to_build):
+            state[get_image(component)] = hashes[component]
+        if to_build:
+            save_state(state_file, state)
+        if status:
+            sys.exit(status)
+    if built:
+        path, path_duration = get_critical_path(dependencies, durations)
+        display_message(
+            'Built {0} images in {1:.1f}s; critical path {2} took'
+            ' {3:.1f}s.'.format(len(built), time.time() - start,
+                                ' -> '.join(path), path_duration))
+    if components:
+        display_message('Build cache: {0} hits, {1} misses.'.format(
+            len(skipped), len(built)))
+    if cache_dir and built:
+        size, removed = prune_build_cache(cache_dir, cache_size_bytes)
+        display_message('BuildKit cache: {0} of {1} used{2}.'.format(
+            format_size(size), format_size(cache_size_bytes),
+            ', removed {0}'.format(', '.join(removed)) if removed else ''))
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [name|CLUSTER]')
+@click.option('--top', '-n', default=10, type=click.IntRange(min=0),
+              help='How many largest contributors to list? [10]')
+@click.option('--depth', default=2, type=click.IntRange(min=1),
+              help='How many path levels to group contributors by? [2]')
+@click.option('--budget', default=None,
+              help='Maximum build context size, e.g. 50m [none]')
+@click.option('--write', '-w', is_flag=True, default=False,
+              help='Add the suggested patterns to .dockerignore?')
+@click.command(name='docker-context')
+def docker_context(component, top, depth, budget, write):  # noqa: D301
+    """Analyse build contexts of REANA component images.
+
+    Reports the number and size of the files sent to the Docker daemon by
+    ``reana docker-build``, taking ``.dockerignore`` into account, and the
+    directories contributing most to it. Patterns of usual leftovers such as
+    ``.git``, ``.eggs`` or ``docs/_build`` that would make the context
+    smaller are suggested; ``--write`` adds them to ``.dockerignore``,
+    creating the file if needed. Context size budgets of components may be
+    configured in the ``[context-budgets]`` section of the ``.reana.cfg``
+    configuration file, taking precedence over ``--budget``; the command
+    exits with an error if a context exceeds its budget.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param top: Number of largest contributors to list. [default=10]
+    :param depth: Number of leading path components to group the
+                  contributors by. [default=2]
+    :param budget: Maximum size of each build context. [default=none]
+    :param write: Whether to add the suggested patterns to ``.dockerignore``.
+                  [default=False]
+    :type component: str
+    :type top: int
+    :type depth: int
+    :type budget: str
+    :type write: bool
+    """
+    default_budget = None
+    if budget:
+        try:
+            default_budget = parse_memory(budget)
+        except ValueError as err:
+            raise click.BadParameter(str(err), param_hint='--budget')
+    oversized = []
+    for component in select_components(component):
+        if not is_component_dockerised(component):
+            continue
+        srcdir = get_srcdir(component)
+        rules = load_dockerignore(srcdir)
+        files = scan_build_context(srcdir, rules)
+        size = sum(files.values())
+        display_message('Build context: {0} files, {1}{2}.'.format(
+            len(files), format_size(size),
+            '' if rules else ', no {0}'.format(DOCKERIGNORE_FILENAME)),
+            component)
+        for path, count, total in get_largest_contributors(files, depth,
+                                                           top):
+            click.echo('  {0:>10} {1:>7} files  {2}'.format(
+                format_size(total), count, path))
+        suggestions = suggest_dockerignore(files, rules)
+        if suggestions and write:
+            add_dockerignore_patterns(
+                srcdir, [pattern for pattern, _, _ in suggestions])
+            rules = load_dockerignore(srcdir)
+            files = scan_build_context(srcdir, rules)
+            new_size = sum(files.values())
+            display_message('Added {0} patterns to {1}, build context now'
+                            ' {2} files, {3}.'.format(
+                                len(suggestions), DOCKERIGNORE_FILENAME,
+                                len(files), format_size(new_size)),
+                            component)
+            size = new_size
+        elif suggestions:
+            display_message('Suggested {0} patterns, use --write to add'
+                            ' them:'.format(DOCKERIGNORE_FILENAME), component)
+            for pattern, count, total in suggestions:
+                click.echo('  {0:>10} {1:>7} files  {2}'.format(
+                    format_size(total), count, pattern))
+        component_budget = get_context_budget(component, default_budget)
+        if component_budget is not None and size > component_budget:
+            click.secho('[{0}] Build context of {1} exceeds the budget of'
+                        ' {2}.'.format(component, format_size(size),
+                                       format_size(component_budget)),
+                        fg='red', bold=True)
+            oversized.append(component)
+    if oversized:
+        sys.exit(1)
+
+
+@click.option('--user', '-u', default='reanahub',
+              help='DockerHub user name [reanahub]')
+@click.option('--tag', '-t', default='latest',
+              help='Image tag [latest]')
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [name|CLUSTER]')
+@click.option('--cold-start', is_flag=True, default=False,
+              help='Measure container start-up time?')
+@click.option('--budget', default=None,
+              help='Maximum image size, e.g. 1g [none]')
+@click.option('--max-growth', default=None, type=click.FloatRange(min=0),
+              help='Maximum size growth since the previous image in'
+              ' percent [none]')
+@click.option('--strict', is_flag=True, default=False,
+              help='Fail instead of warning when limits are exceeded?')
+@click.command(name='docker-images')
+def docker_images(user, tag, component, cold_start, budget, max_growth,
+                  strict):  # noqa: D301
+    """List REANA component images.
+
+    Reports size and number of layers of the component images. Every new
+    image version is recorded in ``$REANA_SRCDIR/.reana-image-history.jsonl``
+    so that the size can be compared with the previous version. Size budgets
+    of components may be configured in the ``[image-budgets]`` section of
+    the ``.reana.cfg`` configuration file, taking precedence over
+    ``--budget``.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param user: DockerHub user name. [default=reanahub]
+    :param tag: Docker tag to use. [default=latest]
+    :param cold_start: Whether to measure the time to run ``true`` in a new
+                       container of each image. [default=False]
+    :param budget: Maximum size of each image. [default=none]
+    :param max_growth: Maximum size growth in percent with respect to the
+                       previous version of the image. [default=none]
+    :param strict: Whether to exit with an error when an image exceeds the
+                   limits. [default=False]
+    :type component: str
+    :type user: str
+    :type tag: str
+    :type cold_start: bool
+    :type budget: str
+    :type max_growth: float
+    :type strict: bool
+    """
+    default_budget = None
+    if budget:
+        try:
+            default_budget = parse_memory(budget)
+        except ValueError as err:
+            raise click.BadParameter(str(err), param_hint='--budget')
+    components = [name for name in select_components(component)
+                  if is_component_dockerised(name)]
+    images = ['{0}/{1}:{2}'.format(user, name, tag) for name in components]
+    details = inspect_images(images)
+    history_file = os.path.join(get_srcdir(), IMAGE_HISTORY_FILENAME)
+    history = load_image_history(history_file)
+    now = time.time()
+    records = []
+    problems = []
+    click.secho('{0:<50} {1:>10} {2:>7} {3:>11} {4:>8}'.format(
+        'IMAGE', 'SIZE', 'LAYERS', 'COLD START', 'CHANGE'), bold=True)
+    for name, image in zip(components, images):
+        if image not in details:
+            click.secho('{0:<50} {1:>10}'.format(image, 'missing'),
+                        fg='red')
+            continue
+        detail = details[image]
+        versions = [record for record in history
+                    if record.get('image') == image]
+        previous = [record for record in versions
+                    if record.get('id') != detail['id']]
+        previous_size = previous[-1].get('size') if previous else None
+        startup = measure_cold_start(image) if cold_start else None
+        change = '-'
+        if previous_size:
+            change = '{0:+.1f}%'.format(
+                (detail['size'] - previous_size) * 100.0 / previous_size)
+        click.echo('{0:<50} {1:>10} {2:>7} {3:>11} {4:>8}'.format(
+            image, format_size(detail['size']), detail['layers'],
+            '-' if startup is None else '{0:.2f}s'.format(startup),
+            change))
+        if not versions or versions[-1].get('id') != detail['id'] or \
+                startup is not None:
+            records.append(dict(detail, image=image, time=now,
+                                cold_start=startup))
+        image_budget = default_budget
+        for value in get_component_config(name, 'image-budgets'):
+            try:
+                image_budget = parse_memory(value)
+            except ValueError as err:
+                display_message(str(err), name)
+        for problem in check_image_size(detail['size'], previous_size,
+                                        image_budget, max_growth):
+            problems.append((name, image, problem))
+    if records:
+        append_image_history(history_file, records)
+    for name, image, problem in problems:
+        click.secho('[{0}] {1}: {2}.'.format(name, image, problem),
+                    fg='red' if strict else 'yellow', bold=True)
+    if strict and problems:
+        sys.exit(1)
+
+
+@click.option('--user', '-u', default='reanahub',
+              help='DockerHub user name [reanahub]')
+@click.option('--tag', '-t', default='latest',
+              help='Image tag [latest]')
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [name|CLUSTER]')
+@click.command(name='docker-rmi')
+def docker_rmi(user, tag, component):  # noqa: D301
+    """Remove REANA component images.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param user: DockerHub organisation or user name. [default=reanahub]
+    :param tag: Docker tag to use. [default=latest]
+    :type component: str
+    :type user: str
+    :type tag: str
+    """
+    components = select_components(component)
+    for component in components:
+        if is_component_dockerised(component):
+            cmd = 'docker rmi {0}/{1}:{2}'.format(user, component, tag)
+            run_command(cmd, component)
+        else:
+            msg = 'Ignoring this component that does not contain' \
+                  ' a Dockerfile.'
+            display_message(msg, component)
+
+
+def transfer_images(action, user, tag, component, jobs=DEFAULT_TRANSFER_JOBS,
+                    retries=DEFAULT_TRANSFER_RETRIES,
+                    backoff=DEFAULT_TRANSFER_BACKOFF):
+    """Push or pull component images concurrently and summarise transfers.
+
+    :param action: ``push`` or ``pull``
+    :param user: DockerHub organisation or user name
+    :param tag: Docker tag to use
+    :param component: component names, see select_components()
+    :param jobs: maximum number of images to transfer concurrently
+    :param retries: number of retries after transient failures
+    :param backoff: delay in seconds before the first retry, doubled for
+                    each next one
+    :type action: str
+    :type user: str
+    :type tag: str
+    :type component: list
+    :type jobs: int
+    :type retries: int
+    :type backoff: float
+
+    :return: aggregated exit status, see run_parallel()
+    :rtype: int
+    """
+    components = []
+    for name in select_components(component):
+        if is_component_dockerised(name):
+            components.append(name)
+        else:
+            msg = 'Ignoring this component that does not contain' \
+                  ' a Dockerfile.'
+            display_message(msg, name)
+    stats = {}
+
+    def transfer(component):
+        image = '{0}/{1}:{2}'.format(user, component, tag)
+        cmd = 'docker {0} {1}'.format(action, image)
+        output = []
+        start = time.time()
+        for attempt in range(retries + 1):
+            status, attempt_output = run_command_sequence([cmd], component)
+            output.extend(attempt_output)
+            if not status or attempt == retries or \
+                    not is_transient_error('\n'.join(attempt_output[1:])):
+                break
+            delay = backoff * 2 ** attempt
+            output.append(click.style(
+                '[{0}] Transient failure, retrying in {1:.1f}s.'.format(
+                    component, delay), fg='yellow'))
+            time.sleep(delay)
+        transferred, present = parse_transfer_output('\n'.join(output))
+        sizes = {}
+        if transferred and not status:
+            sizes = get_manifest_layer_sizes(
+                image, get_image_diff_ids(image) if action == 'push'
+                else None)
+        stats[component] = {
+            'image': image,
+            'status': status,
+            'attempts': attempt + 1,
+            'duration': time.time() - start,
+            'transferred': len(transferred),
+            'present': len(present),
+            'bytes': sum(sizes[layer] for layer in transferred)
+            if transferred.issubset(sizes) else None,
+        }
+        return status, output
+
+    start = time.time()
+    status = run_parallel(transfer, components, jobs)
+    total = 0
+    for component in components:
+        image_stats = stats[component]
+        if image_stats['bytes'] is not None:
+            total += image_stats['bytes']
+        display_message(
+            '{image}: {size}, {transferred} layers transferred, {present}'
+            ' already present, {duration:.1f}s{retried}{failed}.'.format(
+                size='?' if image_stats['bytes'] is None else
+                format_size(image_stats['bytes']),
+                retried=', {0} attempts'.format(image_stats['attempts'])
+                if image_stats['attempts'] > 1 else '',
+                failed=', failed' if image_stats['status'] else '',
+                **image_stats), component)
+    if components:
+        display_message('Transferred {0} in {1:.1f}s.'.format(
+            format_size(total), time.time() - start))
+    return status
+
+
+@click.option('--user', '-u', default='reanahub',
+              help='DockerHub user name [reanahub]')
+@click.option('--tag', '-t', default='latest',
+              help='Image tag [latest]')
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [name|CLUSTER]')
+@click.option('--jobs', '-j', default=DEFAULT_TRANSFER_JOBS,
+              type=click.IntRange(min=1),
+              help='How many images in parallel? [{0}]'.format(
+                  DEFAULT_TRANSFER_JOBS))
+@click.option('--retries', default=DEFAULT_TRANSFER_RETRIES,
+              type=click.IntRange(min=0),
+              help='How many retries after transient failures? [{0}]'
+              .format(DEFAULT_TRANSFER_RETRIES))
+@click.option('--backoff', default=DEFAULT_TRANSFER_BACKOFF,
+              type=click.FloatRange(min=0),
+              help='Seconds before the first retry, doubled for each next'
+              ' one [{0}]'.format(DEFAULT_TRANSFER_BACKOFF))
+@click.command(name='docker-push')
+def docker_push(user, tag, component, jobs, retries, backoff):  # noqa: D301
+    """Push REANA component images to DockerHub.
+
+    Images are pushed concurrently. Transfers failing because of network or
+    registry errors are retried with exponential backoff. The number of
+    layers transferred and already present, the bytes transferred and the
+    time taken are summarised for each image.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param user: DockerHub organisation or user name. [default=reanahub]
+    :param tag: Docker tag to use. [default=latest]
+    :param jobs: Maximum number of images to transfer concurrently.
+                 [default=4]
+    :param retries: Number of retries after transient failures. [default=3]
+    :param backoff: Delay in seconds before the first retry. [default=1]
+    :type component: str
+    :type user: str
+    :type tag: str
+    :type jobs: int
+    :type retries: int
+    :type backoff: float
+    """
+    status = transfer_images('push', user, tag, component, jobs, retries,
+                             backoff)
+    if status:
+        sys.exit(status)
+
+
+@click.option('--user', '-u', default='reanahub',
+              help='DockerHub user name [reanahub]')
+@click.option('--tag', '-t', default='latest',
+              help='Image tag [latest]')
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [name|CLUSTER]')
+@click.option('--jobs', '-j', default=DEFAULT_TRANSFER_JOBS,
+              type=click.IntRange(min=1),
+              help='How many images in parallel? [{0}]'.format(
+                  DEFAULT_TRANSFER_JOBS))
+@click.option('--retries', default=DEFAULT_TRANSFER_RETRIES,
+              type=click.IntRange(min=0),
+              help='How many retries after transient failures? [{0}]'
+              .format(DEFAULT_TRANSFER_RETRIES))
+@click.option('--backoff', default=DEFAULT_TRANSFER_BACKOFF,
+              type=click.FloatRange(min=0),
+              help='Seconds before the first retry, doubled for each next'
+              ' one [{0}]'.format(DEFAULT_TRANSFER_BACKOFF))
+@click.command(name='docker-pull')
+def docker_pull(user, tag, component, jobs, retries, backoff):  # noqa: D301
+    """Pull REANA component images from DockerHub.
+
+    Images are pulled concurrently. Transfers failing because of network or
+    registry errors are retried with exponential backoff. The number of
+    layers transferred and already present, the bytes transferred and the
+    time taken are summarised for each image.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param user: DockerHub organisation or user name. [default=reanahub]
+    :param tag: Docker tag to use. [default=latest]
+    :param jobs: Maximum number of images to transfer concurrently.
+                 [default=4]
+    :param retries: Number of retries after transient failures. [default=3]
+    :param backoff: Delay in seconds before the first retry. [default=1]
+    :type component: str
+    :type user: str
+    :type tag: str
+    :type jobs: int
+    :type retries: int
+    :type backoff: float
+    """
+    status = transfer_images('pull', user, tag, component, jobs, retries,
+                             backoff)
+    if status:
+        sys.exit(status)
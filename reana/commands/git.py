@@ -0,0 +1,891 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA source code repository commands."""
+
+import functools
+import os
+import re
+import shlex
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from reana.cli import DEFAULT_FETCH_MAX_AGE, DEFAULT_JOBS, GITHUB_USER, \
+    UPSTREAM_REFSPECS, UPSTREAM_URL, display_message, \
+    get_component_registry, get_fetch_age, get_mirror_dir, \
+    get_sparse_profile, get_srcdir, get_upstream_fetch_command, \
+    get_workspace_index, record_upstream_fetch, run_command, \
+    run_command_sequence, run_parallel, select_components
+from reana.gitstatus import UPSTREAM_REF, GitRepository, \
+    UnsupportedRepository
+from reana.runner import get_exit_code
+
+GIT_REFETCH_VERSION = (2, 36)
+# first Git release supporting ``git fetch --refetch``
+
+
+@functools.lru_cache(maxsize=None)
+def get_git_version():
+    """Return version of the installed Git.
+
+    :return: major and minor version numbers, (0, 0) if unknown
+    :rtype: tuple
+    """
+    try:
+        output = subprocess.check_output(['git', '--version'],
+                                         universal_newlines=True)
+    except (OSError, subprocess.CalledProcessError):
+        return (0, 0)
+    match = re.search(r'(\d+)\.(\d+)', output)
+    return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+
+
+def write_sparse_checkout(srcdir, patterns):
+    """Write sparse-checkout patterns of the component repository.
+
+    :param srcdir: component source code directory
+    :param patterns: ``.git/info/sparse-checkout`` patterns
+    :type srcdir: str
+    :type patterns: list
+    """
+    info_dir = os.path.join(GitRepository(srcdir).common_dir, 'info')
+    if not os.path.isdir(info_dir):
+        os.makedirs(info_dir)
+    with open(os.path.join(info_dir, 'sparse-checkout'), 'w') as fdesc:
+        fdesc.write(''.join(pattern + '\n' for pattern in patterns))
+
+
+def has_changes(component, base):
+    """Return whether the component working tree may differ from the base.
+
+    :param component: standard component name
+    :param base: revision name such as ``master`` or ``upstream/master``
+    :type component: str
+    :type base: str
+
+    :return: False if the tracked files are unchanged and the checked-out
+             commit is the base revision, True otherwise or if unknown
+    :rtype: bool
+    """
+    status = get_workspace_index().get_status(component)
+    if status['dirty'] is not False or not status['sha']:
+        return True
+    try:
+        repository = GitRepository(get_srcdir(component))
+    except UnsupportedRepository:
+        return True
+    try:
+        return repository.resolve_name(base) != status['sha']
+    except (IOError, OSError, ValueError, UnsupportedRepository):
+        return True
+    finally:
+        repository.close()
+
+
+def read_master_refs(component):
+    """Return checked-out branch and commits of master and upstream/master.
+
+    :param component: standard component name
+    :type component: str
+
+    :return: branch name, ``master`` commit and ``upstream/master`` commit;
+             None for what is unknown
+    :rtype: tuple
+    """
+    try:
+        repository = GitRepository(get_srcdir(component))
+    except UnsupportedRepository:
+        return None, None, None
+    try:
+        branch, _ = repository.read_head()
+        return (branch, repository.resolve_ref('refs/heads/master'),
+                repository.resolve_ref(UPSTREAM_REF))
+    finally:
+        repository.close()
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--browser', '-b', default='firefox',
+              help='Which browser to use? [firefox]')
+@click.command(name='git-fork')
+def git_fork(component, browser):  # noqa: D301
+    """Display commands to fork REANA source code repositories on GitHub.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param browser: The web browser to use. [default=firefox]
+    :type component: str
+    :type browser: str
+    """
+    components = select_components(component)
+    if components:
+        click.echo('# Fork REANA repositories on GitHub using your browser.')
+        click.echo('# Run the following eval and then complete the fork'
+                   ' process in your browser.')
+        click.echo('#')
+        click.echo('# eval "$(reana git-fork -b {0} {1})"'.format(
+            browser,
+            "".join([" -c {0}".format(c) for c in component])))
+    for component in components:
+        cmd = '{0} https://github.com/reanahub/{1}/fork;'.format(browser,
+                                                                 component)
+        click.echo(cmd)
+    click.echo('echo "Please continue the fork process in the opened'
+               ' browser windows."')
+
+
+@click.option('--user', '-u', default=GITHUB_USER,
+              help='GitHub user name [{0}]'.format(GITHUB_USER))
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--depth', type=click.IntRange(min=1),
+              help='Truncate history to that many commits?')
+@click.option('--filter', 'filter_spec',
+              help='Partial clone filter, e.g. blob:none?')
+@click.option('--sparse', is_flag=True, default=False,
+              help='Check out only files of sparse-checkout profiles?')
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.command(name='git-clone')
+def git_clone(user, component, depth, filter_spec, sparse,
+              jobs):  # noqa: D301
+    """Clone REANA source repositories from GitHub.
+
+    Components having a local mirror, see ``reana git-mirror``, are cloned
+    from the mirror without network transfers. The mirror becomes the
+    ``upstream`` remote and its objects are shared with the clone through
+    Git alternates, so that they are stored only once on disk.
+
+    Shallow (``--depth``) and partial (``--filter``) clones skip the history
+    and file contents that are not needed, which matters for the demo
+    repositories carrying large data files; the sparse-checkout profiles of
+    the ``.reana.cfg`` configuration file (``--sparse``) leave unneeded
+    files out of the working tree. Use ``reana git-unshallow`` to fetch the
+    rest later. The depth and filter do not apply to clones from a mirror
+    whose objects are shared anyway.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param user: The GitHub user name. [default=$REANA_GITHUB_USER]
+    :param depth: Number of most recent commits to clone. [default=all]
+    :param filter_spec: Partial clone filter such as ``blob:none`` fetching
+                        file contents only when needed. [default=none]
+    :param sparse: Whether to check out only the files matched by the
+                   component sparse-checkout profile. [default=False]
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :type component: str
+    :type user: str
+    :type depth: int
+    :type filter_spec: str
+    :type sparse: bool
+    :type jobs: int
+    """
+    if not GITHUB_USER:
+        click.echo('Please set environment variable REANA_GITHUB_USER to your'
+                   ' GitHub user name.')
+        click.echo('Example: $ export REANA_GITHUB_USER=tiborsimko')
+        sys.exit(1)
+
+    def clone(component):
+        mirror = get_mirror_dir(component)
+        patterns = get_sparse_profile(component) if sparse else []
+        options = ['--no-checkout'] if patterns else []
+        if os.path.isdir(mirror):
+            options.extend(['--shared', '--origin', 'upstream'])
+            cmd = 'git clone {0} {1} {2}'.format(
+                ' '.join(options), shlex.quote(mirror), component)
+            cmds = [
+                'git config --add remote.upstream.fetch'
+                ' "{0}"'.format(UPSTREAM_REFSPECS[1]),
+                'git remote add origin'
+                ' "git@github.com:{0}/{1}"'.format(user, component),
+            ]
+        else:
+            if depth:
+                options.extend(['--depth', str(depth), '--no-single-branch'])
+            if filter_spec:
+                options.append('--filter={0}'.format(
+                    shlex.quote(filter_spec)))
+            cmd = 'git clone {0}git@github.com:{1}/{2}'.format(
+                ''.join(option + ' ' for option in options), user, component)
+            cmds = [
+                'git remote add upstream'
+                ' "git@github.com:reanahub/{0}"'.format(component),
+                'git config --add remote.upstream.fetch'
+                ' "{0}"'.format(UPSTREAM_REFSPECS[1]),
+            ]
+            if filter_spec:
+                cmds.extend([
+                    'git config remote.upstream.promisor true',
+                    'git config remote.upstream.partialclonefilter'
+                    ' {0}'.format(shlex.quote(filter_spec)),
+                ])
+        status, output = run_command_sequence([cmd], component, get_srcdir())
+        if status:
+            return status, output
+        if patterns:
+            write_sparse_checkout(get_srcdir(component), patterns)
+            cmds.extend(['git config core.sparseCheckout true',
+                         'git read-tree -mu HEAD'])
+        status, remote_output = run_command_sequence(cmds, component)
+        return status, output + remote_output
+
+    status = run_parallel(clone, select_components(component), jobs)
+    if status:
+        sys.exit(status)
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.command(name='git-unshallow')
+def git_unshallow(component, jobs):  # noqa: D301
+    """Fetch full history and contents of shallow, partial or sparse clones.
+
+    Reverts what the ``--depth``, ``--filter`` and ``--sparse`` options of
+    ``reana git-clone`` left out. Components that are complete already are
+    skipped. Fetching the objects left out by ``--filter`` uses ``git fetch
+    --refetch`` and needs Git 2.36 or newer; the clones then stop being
+    partial clones.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :type component: str
+    :type jobs: int
+    """
+    def unshallow(component):
+        srcdir = get_srcdir(component)
+        try:
+            repository = GitRepository(srcdir)
+        except UnsupportedRepository as err:
+            return 1, [click.style('[{0}] {1}'.format(component, err),
+                                   fg='red')]
+        config = repository.read_config()
+        cmds = []
+        if config.get('core.sparsecheckout', '').lower() == 'true':
+            write_sparse_checkout(srcdir, ['/*'])
+            cmds.extend(['git read-tree -mu HEAD',
+                         'git config core.sparseCheckout false'])
+        remotes = sorted(set(
+            name[len('remote.'):].rsplit('.', 1)[0] for name in config
+            if name.startswith('remote.') and
+            name.endswith(('.partialclonefilter', '.promisor'))))
+        if remotes and get_git_version() < GIT_REFETCH_VERSION:
+            return 1, [click.style(
+                '[{0}] Fetching the objects left out by a partial clone '
+                'needs Git {1} or newer, found {2}.'.format(
+                    component,
+                    '.'.join(str(part) for part in GIT_REFETCH_VERSION),
+                    '.'.join(str(part) for part in get_git_version())),
+                fg='red')]
+        for remote in remotes:
+            if 'remote.{0}.partialclonefilter'.format(remote) in config:
+                cmds.append('git config --unset remote.{0}.partialclonefilter'
+                            .format(shlex.quote(remote)))
+        if repository.is_shallow():
+            cmds.append('git fetch --unshallow{0} origin'.format(
+                ' --refetch' if 'origin' in remotes else ''))
+        for remote in remotes:
+            if remote != 'origin' or not repository.is_shallow():
+                cmds.append('git fetch --refetch {0}'.format(
+                    shlex.quote(remote)))
+        for remote in remotes:
+            if 'remote.{0}.promisor'.format(remote) in config:
+                cmds.append('git config --unset remote.{0}.promisor'.format(
+                    shlex.quote(remote)))
+        if 'extensions.partialclone' in config:
+            cmds.append('git config --unset extensions.partialClone')
+        if not cmds:
+            return 0, [click.style('[{0}] Nothing to unshallow.'.format(
+                component), bold=True)]
+        return run_command_sequence(cmds, component)
+
+    status = run_parallel(unshallow, select_components(component), jobs)
+    if status:
+        sys.exit(status)
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--url', '-u', default=UPSTREAM_URL,
+              help='Upstream repository URL template [{0}]'.format(
+                  UPSTREAM_URL))
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.command(name='git-mirror')
+def git_mirror(component, url, jobs):  # noqa: D301
+    """Create or refresh local mirrors of REANA upstream repositories.
+
+    The bare mirrors are kept in ``$REANA_MIRRORDIR``, by default in
+    ``$REANA_SRCDIR/.reana-mirrors``. Once a component has a mirror, the
+    ``git-clone``, ``git-fetch``, ``git-upgrade`` and ``git-checkout --fetch``
+    commands use it instead of GitHub, so that refreshing all mirrors in one
+    batch is the only network transfer needed. Objects are never pruned from
+    the mirrors, since clones borrow them through Git alternates.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param url: Upstream repository URL template where ``{0}`` stands for the
+                component name. [default=git@github.com:reanahub/{0}]
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :type component: str
+    :type url: str
+    :type jobs: int
+    """
+    mirrordir = get_mirror_dir()
+    if not os.path.isdir(mirrordir):
+        os.makedirs(mirrordir)
+
+    def mirror(component):
+        path = get_mirror_dir(component)
+        if os.path.isdir(path):
+            return run_command_sequence(['git fetch --prune origin'],
+                                        component, path)
+        cmds = [
+            'git clone --mirror {0} {1}'.format(
+                shlex.quote(url.format(component)), shlex.quote(path)),
+            'git --git-dir {0} config gc.pruneExpire never'.format(
+                shlex.quote(path)),
+        ]
+        return run_command_sequence(cmds, component, mirrordir)
+
+    status = run_parallel(mirror, select_components(component), jobs)
+    if status:
+        sys.exit(status)
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.command(name='git-status')
+def git_status(component, jobs):  # noqa: D301
+    """Report status of REANA source repositories.
+
+    Displays the checked-out branch, the number of commits ahead and behind
+    ``upstream/master``, and whether there are uncommitted changes to the
+    tracked files. The Git repositories are read directly without running
+    ``git``.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :type component: str
+    :type jobs: int
+    """
+    components = select_components(component)
+    index = get_workspace_index()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        statuses = list(executor.map(index.get_status, components))
+    for component, status in zip(components, statuses):
+        click.secho('- {0}'.format(component), nl=False, bold=True)
+        branch = status['branch']
+        if not branch and status['sha']:
+            branch = '(HEAD detached at {0})'.format(status['sha'][:7])
+        if branch == 'master':
+            click.secho(' @ {0}'.format(branch), nl=False)
+        else:
+            click.secho(' @ {0}'.format(branch or '?'), nl=False, fg='red')
+        if status['ahead'] or status['behind']:
+            click.secho(' [ahead {0}, behind {1}]'.format(
+                status['ahead'], status['behind']), nl=False, fg='yellow')
+        if status['dirty']:
+            click.secho(' (dirty)', nl=False, fg='red')
+        click.echo()
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.option('--dry-run', '-n', is_flag=True, default=False,
+              help='Only report what would be removed.')
+@click.command(name='git-clean')
+def git_clean(component, jobs, dry_run):  # noqa: D301
+    """Clean REANA source repository code tree.
+
+    Removes pyc, eggs, _build and other leftover friends.
+    Less aggressive then "git clean -x".
+
+    Each source tree is traversed once, without descending into ``.git`` or
+    into the directories being removed, and the number of files and bytes
+    reclaimed is reported.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :param dry_run: Whether to only report the files that would be removed.
+                    [default=False]
+    :type component: str
+    :type jobs: int
+    :type dry_run: bool
+    """
+    from reana.utils import format_size
+    from reana.clean import clean_tree
+    totals = []
+
+    def clean(component):
+        srcdir = get_srcdir(component)
+        if not os.path.isdir(srcdir):
+            return 1, [click.style('[{0}] Directory {1} not found.'.format(
+                component, srcdir), fg='red')]
+        files, size, errors = clean_tree(srcdir, dry_run)
+        totals.append((files, size))
+        output = [click.style('[{0}] {1} {2} files, {3}.'.format(
+            component, 'Would remove' if dry_run else 'Removed', files,
+            format_size(size)), bold=True)]
+        output.extend(click.style('[{0}] {1}'.format(component, error),
+                                  fg='red') for error in errors)
+        return 1 if errors else 0, output
+
+    status = run_parallel(clean, select_components(component), jobs)
+    display_message('{0} {1} files, {2} in total.'.format(
+        'Would remove' if dry_run else 'Removed',
+        sum(files for files, _ in totals),
+        format_size(sum(size for _, size in totals))))
+    if status:
+        sys.exit(status)
+
+
+@click.option('--branch', '-b', nargs=2, multiple=True,
+              help='Which PR? [number component]')
+@click.option('--fetch', is_flag=True, default=False)
+@click.command(name='git-checkout')
+def git_checkout(branch, fetch):  # noqa: D301
+    """Check out local branch corresponding to a component pull request.
+
+    The ``-b`` option can be repetitive to check out several pull requests in
+    several repositories at the same time. With ``--fetch``, upstream is
+    always fetched first, however recently it was fetched.
+
+    \b
+    :param branch: The option ``branch`` can be repeated. The value consist of
+                   two strings specifying the component name and the pull
+                   request number. For example, ``-b reana-job-controler 72``
+                   will create a local branch called ``pr-72`` in the
+                   reana-job-component source code directory.
+    :param fetch: Should we fetch latest upstream first? [default=False]
+    :type component: str
+    :type fetch: bool
+    """
+    for cpr in branch:
+        component, pull_request = cpr
+        components = select_components([component, ])
+        component = components[0] if components else component
+        if component in get_component_registry():
+            if fetch:
+                cmd = get_upstream_fetch_command(component)
+                run_command(cmd, component)
+                record_upstream_fetch(component)
+            cmd = 'git checkout -b pr-{0} upstream/pr/{0}'.format(pull_request)
+            run_command(cmd, component)
+        else:
+            msg = 'Ignoring unknown component.'
+            display_message(msg, component)
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--max-age', envvar='REANA_FETCH_MAX_AGE',
+              default=DEFAULT_FETCH_MAX_AGE, type=click.FloatRange(min=0),
+              help='Skip components fetched less than that many seconds ago?'
+                   ' [{0}=never skip]'.format(DEFAULT_FETCH_MAX_AGE))
+@click.option('--force', '-f', is_flag=True, default=False,
+              help='Fetch even recently fetched components?')
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.command(name='git-fetch')
+def git_fetch(component, max_age, force, jobs):  # noqa: D301
+    """Fetch REANA upstream source code repositories without upgrade.
+
+    Components having a local mirror, see ``reana git-mirror``, are fetched
+    from the mirror instead of from GitHub. With ``--max-age``, or
+    ``$REANA_FETCH_MAX_AGE``, components whose upstream was fetched by reana
+    within that many seconds are skipped unless ``--force`` is used; every
+    skipped component is reported with the age of its last fetch.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param max_age: Freshness window in seconds; components fetched within
+                    it are skipped. [default=0, never skip]
+    :param force: Whether to fetch all components regardless of when they
+                  were fetched. [default=False]
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :type component: str
+    :type max_age: float
+    :type force: bool
+    :type jobs: int
+    """
+    skipped = set()
+    fetched = set()
+
+    def fetch(component):
+        age = get_fetch_age(component)
+        if not force and age is not None and age < max_age:
+            skipped.add(component)
+            return 0, [click.style(
+                '[{0}] Fetched {1:.0f} seconds ago, skipping.'.format(
+                    component, age), bold=True)]
+        cmds = [get_upstream_fetch_command(component), ]
+        status, output = run_command_sequence(cmds, component)
+        if not status:
+            record_upstream_fetch(component)
+            fetched.add(component)
+        return status, output
+
+    components = select_components(component)
+    status = run_parallel(fetch, components, jobs)
+    failed = len(components) - len(fetched) - len(skipped)
+    if skipped:
+        display_message('Fetched {0} components, skipped {1} components'
+                        ' fetched recently{2}.'.format(
+                            len(fetched), len(skipped),
+                            ', {0} components failed'.format(failed)
+                            if failed else ''))
+    if status:
+        sys.exit(status)
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.command(name='git-upgrade')
+def git_upgrade(component, jobs):  # noqa: D301
+    """Upgrade REANA local source code repositories.
+
+    Fast-forwards local ``master`` to ``upstream/master`` and pushes it to
+    ``origin``. The commits of the local references are compared with the
+    ``origin`` branches freshly advertised by GitHub first, so that
+    components already up to date are skipped. The ``master`` branch is
+    updated without checking it out when another branch is checked out,
+    leaving the working tree untouched.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :type component: str
+    :type jobs: int
+    """
+    index = get_workspace_index()
+    skipped = set()
+    updated = set()
+
+    def upgrade(component):
+        status, output = run_command_sequence(
+            [get_upstream_fetch_command(component)], component)
+        if status:
+            return status, output
+        record_upstream_fetch(component)
+        branch, master, upstream = read_master_refs(component)
+        origin = (index.get_remote_refs(component, 'origin', max_age=0) or
+                  {}).get('refs/heads/master')
+        cmds = []
+        if master != upstream:
+            if branch == 'master':
+                cmds.append('git merge --ff-only upstream/master')
+            else:
+                cmds.append('git fetch . upstream/master:master')
+            master = upstream
+        if not master or origin != master:
+            cmds.append('git push origin master')
+        if not cmds:
+            skipped.add(component)
+            output.append(click.style(
+                '[{0}] Already up to date.'.format(component), bold=True))
+            return 0, output
+        status, upgrade_output = run_command_sequence(cmds, component)
+        if not status:
+            updated.add(component)
+            if master:
+                index.set_remote_ref(component, 'origin',
+                                     'refs/heads/master', master)
+        return status, output + upgrade_output
+
+    components = select_components(component)
+    status = run_parallel(upgrade, components, jobs)
+    failed = len(components) - len(updated) - len(skipped)
+    display_message('Updated {0} components, skipped {1} components'
+                    ' already up to date{2}.'.format(
+                        len(updated), len(skipped),
+                        ', {0} components failed'.format(failed)
+                        if failed else ''))
+    if status:
+        sys.exit(status)
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.option('--base', '-b', default='master',
+              help='Which revision to compare with? [master]')
+@click.option('--stat', 'diff_format', flag_value='stat',
+              help='Show only the diffstat.')
+@click.option('--name-only', 'diff_format', flag_value='name-only',
+              help='Show only the names of changed files.')
+@click.option('--pager/--no-pager', default=True,
+              help='Whether to page the output. [--pager]')
+@click.command(name='git-diff')
+def git_diff(component, jobs, base, diff_format, pager):  # noqa: D301
+    """Diff checked-out REANA local source code repositories.
+
+    The diffs of all components are collected concurrently and displayed
+    one after another under component headers, in a single pager. Components
+    without uncommitted changes whose checked-out commit is the base
+    revision are skipped without running ``git diff``.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :param base: Revision to compare the working trees with, for example
+                 ``upstream/master``. [default=master]
+    :param diff_format: Whether to show only the diffstat (``--stat``) or
+                        the changed file names (``--name-only``).
+    :param pager: Whether to display the output in a pager. [default=True]
+    :type component: str
+    :type jobs: int
+    :type base: str
+    :type diff_format: str
+    :type pager: bool
+    """
+    components = select_components(component)
+    get_workspace_index()  # fail early if the source directory is not set
+    cmd = 'git diff{0}{1} {2}'.format(
+        ' --color=always' if pager and sys.stdout.isatty() else '',
+        ' --' + diff_format if diff_format else '', shlex.quote(base))
+
+    def diff(component):
+        if not has_changes(component, base):
+            return None
+        return run_command_sequence([cmd, ], component)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(diff, components))
+    lines = []
+    failed = []
+    skipped = 0
+    status = 0
+    for component, result in zip(components, results):
+        if result is None:
+            skipped += 1
+            continue
+        lines.extend(result[1])
+        if result[0]:
+            failed.append(component)
+            status = max(status, get_exit_code(result[0]))
+    if failed:
+        lines.append(click.style('[] Failed components: {0}.'.format(
+            ', '.join(failed)), bold=True))
+    if skipped:
+        lines.append(click.style(
+            '[] Skipped {0} components without changes against {1}.'.format(
+                skipped, base), bold=True))
+    if pager:
+        click.echo_via_pager('\n'.join(lines) + '\n')
+    else:
+        click.echo('\n'.join(lines))
+    if status:
+        sys.exit(status)
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [name|CLUSTER]')
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.command(name='git-push')
+def git_push(component, jobs):  # noqa: D301
+    """Push REANA local repositories to GitHub origin.
+
+    Components whose ``master`` is already on ``origin``, according to the
+    branches GitHub advertises when the command runs, are skipped.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :type component: str
+    :type jobs: int
+    """
+    index = get_workspace_index()
+    skipped = set()
+    pushed = set()
+
+    def push(component):
+        _, master, _ = read_master_refs(component)
+        origin = (index.get_remote_refs(component, 'origin', max_age=0) or
+                  {}).get('refs/heads/master')
+        if master and origin == master:
+            skipped.add(component)
+            return 0, [click.style('[{0}] Already up to date.'.format(
+                component), bold=True)]
+        status, output = run_command_sequence(['git push origin master', ],
+                                              component)
+        if not status:
+            pushed.add(component)
+            if master:
+                index.set_remote_ref(component, 'origin',
+                                     'refs/heads/master', master)
+        return status, output
+
+    components = select_components(component)
+    status = run_parallel(push, components, jobs)
+    failed = len(components) - len(pushed) - len(skipped)
+    display_message('Pushed {0} components, skipped {1} components'
+                    ' already up to date{2}.'.format(
+                        len(pushed), len(skipped),
+                        ', {0} components failed'.format(failed)
+                        if failed else ''))
+    if status:
+        sys.exit(status)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA Python environment commands."""
+
+import os
+import shlex
+import subprocess
+import sys
+
+import click
+
+from reana.cli import display_message, get_srcdir, select_components
+from reana.install import create_virtualenv, get_install_args, \
+    get_installed_components, run_install
+
+DEFAULT_VENV_DIRNAME = '.venv'
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--venv', envvar='REANA_VENV', default=None,
+              help='Virtual environment to install into, created if '
+                   'needed [$REANA_SRCDIR/.venv]')
+@click.option('--system', is_flag=True, default=False,
+              help='Install into the --python interpreter itself instead '
+                   'of a virtual environment?')
+@click.option('--python', default=sys.executable,
+              help='Python to create the virtual environment with, or to '
+                   'install with when --system is given [{0}]'.format(
+                       os.path.basename(sys.executable)))
+@click.option('--extras', '-e', default=None,
+              help='Extras to install with every component, e.g. all '
+                   '[none]')
+@click.option('--cache-dir', envvar='REANA_PIP_CACHE_DIR', default=None,
+              help='Shared pip cache directory [pip default]')
+@click.option('--find-links', multiple=True,
+              help='Additional wheel location, e.g. a wheelhouse')
+@click.option('--upgrade', '-U', is_flag=True, default=False,
+              help='Upgrade the installed dependencies?')
+@click.option('--verbose', '-v', is_flag=True, default=False,
+              help='Show the pip output?')
+@click.command(name='install')
+def install(component, venv, system, python, extras, cache_dir, find_links,
+            upgrade, verbose):  # noqa: D301
+    """Install REANA components in editable mode.
+
+    All selected components having ``setup.py`` are installed in editable
+    mode by a single ``pip install`` run, so that their dependencies are
+    resolved once and together, and the local sources of REANA libraries
+    such as ``reana-commons`` satisfy the requirements of the other
+    components. Downloads and built wheels are shared through the pip
+    cache. The time spent resolving, downloading and building the
+    distributions and the time spent installing them are reported.
+
+    The components are installed into a virtual environment, by default
+    ``$REANA_SRCDIR/.venv``, which is created if needed. Installing into
+    the interpreter given by ``--python`` itself, such as the one running
+    ``reana``, requires ``--system``.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param venv: Virtual environment directory, created by ``--python`` if
+                 it does not exist. Ignored with ``--system``.
+                 [default=$REANA_VENV or $REANA_SRCDIR/.venv]
+    :param system: Whether to install into the ``--python`` interpreter
+                   instead of a virtual environment. [default=False]
+    :param python: Python interpreter creating the virtual environment, or
+                   installing the components with ``--system``.
+                   [default=current interpreter]
+    :param extras: Extras to install with every component. [default=none]
+    :param cache_dir: pip cache directory.
+                      [default=$REANA_PIP_CACHE_DIR or pip user cache]
+    :param find_links: Additional wheel locations, such as the wheelhouse of
+                       ``reana docker-build``. The option can be repeated.
+    :param upgrade: Whether to upgrade the installed dependencies.
+                    [default=False]
+    :param verbose: Whether to show the pip output. [default=False]
+    :type component: str
+    :type venv: str
+    :type system: bool
+    :type python: str
+    :type extras: str
+    :type cache_dir: str
+    :type find_links: str
+    :type upgrade: bool
+    :type verbose: bool
+    """
+    components = []
+    for component in select_components(component):
+        if os.path.exists(os.path.join(get_srcdir(component), 'setup.py')):
+            components.append(component)
+        else:
+            display_message('Ignoring this component that does not contain'
+                            ' setup.py.', component)
+    if not components:
+        display_message('Nothing to install.')
+        return
+    if not system:
+        venv = os.path.abspath(os.path.expanduser(
+            venv or os.path.join(get_srcdir(), DEFAULT_VENV_DIRNAME)))
+        try:
+            python, created = create_virtualenv(venv, python)
+        except (OSError, subprocess.CalledProcessError) as err:
+            display_message('Cannot create virtual environment {0}: {1}'
+                            .format(venv, getattr(err, 'output', None) or
+                                    err))
+            sys.exit(1)
+        if created:
+            display_message('Created virtual environment {0}.'.format(venv))
+    if cache_dir:
+        cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    srcdirs = [get_srcdir(component) for component in components]
+    args = get_install_args(python, srcdirs, extras, cache_dir, find_links,
+                            upgrade)
+    display_message(' '.join(shlex.quote(arg) for arg in args))
+    try:
+        result = run_install(args, get_srcdir(),
+                             click.echo if verbose else None)
+    except OSError as err:
+        display_message('Cannot run {0}: {1}'.format(python, err))
+        sys.exit(1)
+    if result['exit_code']:
+        if not verbose:
+            click.echo('\n'.join(result['output']))
+        display_message('Installation failed with exit status {0} after'
+                        ' {1:.1f}s.'.format(result['exit_code'],
+                                            result['resolve_time'] +
+                                            result['install_time']))
+        sys.exit(result['exit_code'])
+    installed = get_installed_components(result['installed'], components)
+    display_message(
+        'Resolved {0} components in {1:.1f}s, installed {2} components and'
+        ' {3} dependencies in {4:.1f}s.'.format(
+            len(components), result['resolve_time'], len(installed),
+            len(result['installed']) - len(installed),
+            result['install_time']))
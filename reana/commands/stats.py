@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA execution statistics commands."""
+
+import time
+
+import click
+
+from reana.cli import get_history_file, select_components
+from reana.history import load_history, summarize_history
+from reana.utils import format_size
+
+
+@click.option('--component', '-c', multiple=True,
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--command', '-m', 'command_filter', default=None,
+              help='Only commands containing this text, e.g. "git fetch"')
+@click.option('--days', '-d', default=30, type=click.FloatRange(min=0),
+              help='How many days back? [30]')
+@click.option('--limit', '-n', default=20, type=click.IntRange(min=1),
+              help='How many rows to show? [20]')
+@click.command(name='stats')
+def stats(component, command_filter, days, limit):  # noqa: D301
+    """Show duration statistics of the commands run.
+
+    Every command run by ``reana`` in a component is recorded with its start
+    time, duration, exit code and peak memory use in
+    ``$REANA_SRCDIR/.reana-history.jsonl``. Once that file exceeds 8 MiB, it
+    is truncated to the newest 20000 records of the last 90 days. The median
+    (p50) and 95th percentile (p95) durations are shown per component and
+    command, slowest first. The trend compares the median duration of the
+    newer half of the runs with the older half.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components;
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories. [default=all]
+    :param command_filter: Text the displayed commands must contain.
+    :param days: Number of days of history to consider. [default=30]
+    :param limit: Maximum number of rows to display. [default=20]
+    :type component: str
+    :type command_filter: str
+    :type days: float
+    :type limit: int
+    """
+    history_file = get_history_file()
+    if not history_file:
+        click.echo('Please set environment variable REANA_SRCDIR'
+                   ' to an existing directory.')
+        return
+    records = load_history(history_file, since=time.time() - days * 86400)
+    if component:
+        components = set(select_components(component))
+        records = [record for record in records
+                   if record.get('component') in components]
+    if command_filter:
+        records = [record for record in records
+                   if command_filter in record.get('command', '')]
+    summary = summarize_history(records)
+    if not summary:
+        click.echo('No commands recorded.')
+        return
+    click.secho('{0:<28} {1:<36} {2:>5} {3:>5} {4:>8} {5:>8} {6:>10} '
+                '{7:>7}'.format('COMPONENT', 'COMMAND', 'RUNS', 'FAIL',
+                                'P50', 'P95', 'MAX RSS', 'TREND'),
+                bold=True)
+    for entry in summary[:limit]:
+        command = entry['command']
+        if len(command) > 36:
+            command = command[:33] + '...'
+        click.echo('{0:<28} {1:<36} {2:>5} {3:>5} {4:>7.1f}s {5:>7.1f}s '
+                   '{6:>10} {7:>7}'.format(
+                       entry['component'] or '-', command, entry['runs'],
+                       entry['failures'], entry['p50'], entry['p95'],
+                       '-' if entry['max_rss'] is None
+                       else format_size(entry['max_rss']),
+                       '-' if entry['trend'] is None
+                       else '{0:+.0%}'.format(entry['trend'])))
+    if len(summary) > limit:
+        click.echo('... {0} more rows, use --limit to see them.'.format(
+            len(summary) - limit))
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA source code synchronisation commands."""
+
+import os
+import sys
+import time
+
+import click
+
+from reana.cli import DEFAULT_JOBS, display_message, get_srcdir, \
+    run_parallel, select_components
+from reana.state import load_state, save_state
+from reana.sync import SYNC_STATE_FILENAME, TRANSPORTS, SyncError, \
+    compute_changes, get_transport
+
+
+@click.option('--component', '-c', multiple=True, required=True,
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--transport', '-T', default='docker',
+              type=click.Choice(sorted(TRANSPORTS)),
+              help='How to transfer the files? [docker]')
+@click.option('--target', '-t', default='{1}:/code',
+              help='Where to? Template, {0} is the component name, {1} the '
+                   'name without "reana-". [{1}:/code]')
+@click.option('--reload-signal', '-s', default=None,
+              help='Which signal to send after syncing, e.g. HUP?')
+@click.option('--full', is_flag=True, default=False,
+              help='Copy all tracked files regardless of the last sync.')
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.command(name='sync')
+def sync(component, transport, target, reload_signal, full,
+         jobs):  # noqa: D301
+    """Copy changed source files into running REANA components.
+
+    The tracked files whose content changed since the last sync to the same
+    target, as told by their SHA-256 hashes, are copied to the target and
+    the tracked files deleted since are removed from it. With the ``docker``
+    transport, the target is ``CONTAINER[:DIRECTORY]`` where the container
+    may be given by a unique part of its name; the files are sent by a
+    single ``docker cp`` and the signal is sent to the main process of the
+    container. With the ``local`` transport, the target is a directory, for
+    example one mounted into the cluster. The first sync copies all files.
+    The components must be given explicitly, since libraries such as
+    ``reana-commons`` have no container of their own.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components;
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+                       The option is required.
+    :param transport: Transport of the files, ``docker`` or ``local``.
+                      [default=docker]
+    :param target: Target template; ``{0}`` is replaced by the component name
+                   and ``{1}`` by the component name without the ``reana-``
+                   prefix, e.g. ``server:/code`` for reana-server.
+                   [default={1}:/code]
+    :param reload_signal: Signal to send to the service after files changed,
+                          such as ``HUP``. [default=none]
+    :param full: Whether to copy all tracked files. [default=False]
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :type component: str
+    :type transport: str
+    :type target: str
+    :type reload_signal: str
+    :type full: bool
+    :type jobs: int
+    """
+    state_file = os.path.join(get_srcdir(), SYNC_STATE_FILENAME)
+    state = load_state(state_file)
+    synced = {}
+
+    def sync_component(component):
+        srcdir = get_srcdir(component)
+        component_target = target.format(
+            component, component[len('reana-'):]
+            if component.startswith('reana-') else component)
+        key = '{0} {1}:{2}'.format(component, transport, component_target)
+        start = time.time()
+        new_state, changed, removed = compute_changes(
+            srcdir, {} if full else state.get(key, {}))
+        if not changed and not removed:
+            return 0, [click.style('[{0}] Nothing to sync.'.format(
+                component), bold=True)]
+        try:
+            destination = get_transport(transport, component_target)
+            destination.copy(srcdir, changed)
+            destination.remove(removed)
+            if reload_signal:
+                destination.reload(reload_signal)
+        except (SyncError, IOError, OSError) as err:
+            return 1, [click.style('[{0}] {1}'.format(component, err),
+                                   fg='red')]
+        synced[key] = new_state
+        return 0, [click.style(
+            '[{0}] Synced {1} files, removed {2} files{3} in {4:.1f}s.'
+            .format(component, len(changed), len(removed),
+                    ', sent {0}'.format(reload_signal) if reload_signal
+                    else '', time.time() - start), bold=True)]
+
+    components = [component for component in select_components(component)
+                  if os.path.isdir(get_srcdir(component))]
+    if not components:
+        display_message('Nothing to sync.')
+        return
+    status = run_parallel(sync_component, components, jobs)
+    if synced:
+        state = load_state(state_file)
+        state.update(synced)
+        save_state(state_file, state)
+    if status:
+        sys.exit(status)
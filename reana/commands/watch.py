@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA source code watching commands."""
+
+import functools
+import os
+import sys
+
+import click
+
+from reana.cli import DEFAULT_JOBS, display_message, get_srcdir, \
+    run_command_sequence, run_parallel, select_components
+from reana.watch import DEFAULT_DEBOUNCE, create_watcher, wait_for_changes
+
+
+def rebuild(ctx, components, cmd, jobs):
+    """Run the command, or docker-build, for the changed components.
+
+    :return: exit status, zero if all components succeeded
+    :rtype: int
+    """
+    if cmd:
+        return run_parallel(functools.partial(run_command_sequence, [cmd, ]),
+                            components, jobs)
+    from reana.commands.docker import docker_build
+    args = ['--jobs', str(jobs)]
+    for component in components:
+        args.extend(['--component', component])
+    try:
+        # parsed as on the command line, so that the environment variables
+        # of the docker-build options apply
+        with docker_build.make_context('docker-build', args,
+                                       parent=ctx) as build_ctx:
+            docker_build.invoke(build_ctx)
+    except SystemExit as err:
+        return err.code or 0
+    return 0
+
+
+@click.option('--component', '-c', multiple=True, default=['CLUSTER'],
+              help='Which components? [shortname|name|.|CLUSTER|ALL]')
+@click.option('--command', '-x', 'cmd', default=None,
+              help='Which command to run in the changed components? '
+                   '[reana docker-build]')
+@click.option('--debounce', '-d', default=DEFAULT_DEBOUNCE,
+              type=click.FloatRange(min=0),
+              help='How many seconds without changes before rebuilding? '
+                   '[{0}]'.format(DEFAULT_DEBOUNCE))
+@click.option('--jobs', '-j', default=DEFAULT_JOBS,
+              type=click.IntRange(min=1),
+              help='How many components in parallel? [{0}]'.format(
+                  DEFAULT_JOBS))
+@click.option('--poll', is_flag=True, default=False,
+              help='Poll for changes instead of using inotify.')
+@click.option('--once', is_flag=True, default=False,
+              help='Exit after the first rebuild.')
+@click.command(name='watch')
+@click.pass_context
+def watch(ctx, component, cmd, debounce, jobs, poll, once):  # noqa: D301
+    """Rebuild REANA components whenever their source code changes.
+
+    The working trees of the components are watched for changes, using
+    inotify where available. Git metadata, paths ignored by Git, test and
+    coverage outputs such as ``.coverage``, and the files ``reana git-clean``
+    removes, such as compiled Python files, are ignored. Once no new change
+    arrives for the debounce period, ``reana docker-build`` is run for the
+    changed components only, or the given command is run in their source
+    directories. Changes made during the rebuild trigger the next one.
+
+    \b
+    :param components: The option ``component`` can be repeated. The value may
+                       consist of:
+                         * (1) standard component name such as
+                               'reana-job-controller';
+                         * (2) short component name such as 'r-j-controller';
+                         * (3) special value '.' indicating component of the
+                               current working directory;
+                         * (4) special value 'CLUSTER' that will expand to
+                               cover all REANA cluster components [default];
+                         * (5) special value 'ALL' that will expand to include
+                               all REANA repositories.
+    :param cmd: Shell command to run in the source directory of every changed
+                component. [default=reana docker-build]
+    :param debounce: Seconds without new changes ending a burst of changes.
+                     [default=1.0]
+    :param jobs: Number of components to process concurrently.
+                 [default=number of CPUs]
+    :param poll: Whether to poll the trees instead of using inotify.
+                 [default=False]
+    :param once: Whether to exit after the first rebuild. [default=False]
+    :type component: str
+    :type cmd: str
+    :type debounce: float
+    :type jobs: int
+    :type poll: bool
+    :type once: bool
+    """
+    srcdirs = {}
+    for component in select_components(component):
+        srcdir = get_srcdir(component)
+        if os.path.isdir(srcdir):
+            srcdirs[component] = srcdir
+        else:
+            display_message('Directory {0} not found, not watching it.'
+                            .format(srcdir), component)
+    if not srcdirs:
+        display_message('Nothing to watch.')
+        sys.exit(1)
+    watcher, reason = create_watcher(srcdirs, poll)
+    if reason:
+        display_message('Cannot use inotify, polling instead: {0}'.format(
+            reason))
+    display_message('Watching {0} components, press Ctrl+C to stop.'.format(
+        len(srcdirs)))
+    status = 0
+    try:
+        while True:
+            changes = wait_for_changes(watcher, debounce)
+            components = [component for component in srcdirs
+                          if component in changes]
+            for component in components:
+                paths = changes[component]
+                display_message('Changed {0}{1}.'.format(
+                    ', '.join(paths[:3]) or 'files',
+                    ' and {0} more'.format(len(paths) - 3)
+                    if len(paths) > 3 else ''), component)
+            status = rebuild(ctx, components, cmd, jobs)
+            if once:
+                break
+            display_message('Watching {0} components.'.format(len(srcdirs)))
+    except KeyboardInterrupt:
+        display_message('Stopped watching.')
+    finally:
+        watcher.close()
+    if status:
+        sys.exit(status)
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Docker build context analysis of REANA components."""
+
+import os
+import posixpath
+import re
+
+DOCKERIGNORE_FILENAME = '.dockerignore'
+
+DOCKERIGNORE_SUGGESTIONS = [
+    '.git',
+    '.eggs',
+    '*.egg-info',
+    '**/__pycache__',
+    '**/*.pyc',
+    'docs/_build',
+    '.tox',
+    '.cache',
+    '.pytest_cache',
+    '.coverage',
+    'htmlcov',
+    'node_modules',
+]
+# patterns proposed for .dockerignore when they match files of the context
+
+ALWAYS_SENT = ['Dockerfile', DOCKERIGNORE_FILENAME]
+
+
+def compile_dockerignore_pattern(pattern):
+    """Return regular expression matching paths as the Docker pattern does.
+
+    Besides the ``filepath.Match`` wildcards ``*``, ``?`` and ``[...]``,
+    where ``[^...]`` and ``[!...]`` are negated classes, ``**`` matches any
+    number of directories. Like the other wildcards, classes never match
+    ``/``.
+
+    :param pattern: cleaned ``.dockerignore`` pattern without ``!``
+    :type pattern: str
+
+    :return: compiled regular expression
+    :rtype: re.Pattern
+    """
+    regex = ''
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == '*':
+            if pattern[position + 1:position + 2] == '*':
+                position += 1
+                if pattern[position + 1:position + 2] == '/':
+                    position += 1
+                    regex += '(.*/)?'
+                else:
+                    regex += '.*'
+            else:
+                regex += '[^/]*'
+        elif char == '?':
+            regex += '[^/]'
+        elif char == '[':
+            end = pattern.find(']', position + 1)
+            if end < 0:
+                regex += re.escape(char)
+            else:
+                body = pattern[position + 1:end]
+                if body[:1] in ('!', '^'):
+                    regex += '[^/{0}]'.format(body[1:])
+                else:
+                    regex += '[{0}]'.format(body)
+                position = end
+        elif char == '\\' and position + 1 < len(pattern):
+            position += 1
+            regex += re.escape(pattern[position])
+        else:
+            regex += re.escape(char)
+        position += 1
+    return re.compile('^{0}$'.format(regex))
+
+
+def parse_dockerignore(content):
+    """Return rules of the ``.dockerignore`` file content.
+
+    :param content: file content
+    :type content: str
+
+    :return: list of (pattern, compiled regular expression, exclusion) tuples
+             in the order of the file, where exclusion is False for ``!``
+             exceptions
+    :rtype: list
+    """
+    rules = []
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        exclusion = not line.startswith('!')
+        if not exclusion:
+            line = line[1:].strip()
+        pattern = posixpath.normpath(line).lstrip('/')
+        if pattern in ('', '.'):
+            continue
+        rules.append((pattern, compile_dockerignore_pattern(pattern),
+                      exclusion))
+    return rules
+
+
+def load_dockerignore(srcdir):
+    """Return rules of the ``.dockerignore`` file of the component.
+
+    :param srcdir: component source code directory
+    :type srcdir: str
+
+    :return: rules, see parse_dockerignore(); empty if there is no file
+    :rtype: list
+    """
+    try:
+        with open(os.path.join(srcdir, DOCKERIGNORE_FILENAME)) as fdesc:
+            return parse_dockerignore(fdesc.read())
+    except (IOError, OSError):
+        return []
+
+
+def is_excluded(path, rules):
+    """Return whether Docker leaves the path out of the build context.
+
+    As in Docker, a pattern also matches every path below a matching
+    directory, and the last matching rule wins.
+
+    :param path: path relative to the context directory, with ``/``
+                 separators
+    :param rules: rules, see parse_dockerignore()
+    :type path: str
+    :type rules: list
+
+    :return: True if the path is not sent to the Docker daemon
+    :rtype: bool
+    """
+    if path in ALWAYS_SENT:
+        return False
+    parents = []
+    position = path.find('/')
+    while position >= 0:
+        parents.append(path[:position])
+        position = path.find('/', position + 1)
+    excluded = False
+    for _, regex, exclusion in rules:
+        if excluded == exclusion:
+            continue
+        if regex.match(path) or any(regex.match(parent)
+                                    for parent in parents):
+            excluded = exclusion
+    return excluded
+
+
+def scan_build_context(srcdir, rules=None):
+    """Return files of the build context and their sizes.
+
+    Excluded directories are not descended into unless an exception rule
+    may include something below them.
+
+    :param srcdir: component source code directory
+    :param rules: ``.dockerignore`` rules [default=rules of the component]
+    :type srcdir: str
+    :type rules: list
+
+    :return: sizes in bytes of the files sent to the Docker daemon keyed by
+             their relative paths
+    :rtype: dict
+    """
+    if rules is None:
+        rules = load_dockerignore(srcdir)
+    has_exceptions = any(not exclusion for _, _, exclusion in rules)
+    files = {}
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        try:
+            entries = list(os.scandir(os.path.join(srcdir, relative_dir)))
+        except OSError:
+            continue
+        for entry in entries:
+            path = relative_dir + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if has_exceptions or not is_excluded(path, rules):
+                        stack.append(path + '/')
+                    continue
+                if not is_excluded(path, rules):
+                    files[path] = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                pass
+    return files
+
+
+def get_largest_contributors(files, depth=2, limit=10):
+    """Return the directories and files contributing most to the context.
+
+    :param files: file sizes keyed by relative paths, see
+                  scan_build_context()
+    :param depth: number of leading path components to group by
+    :param limit: maximum number of contributors
+    :type files: dict
+    :type depth: int
+    :type limit: int
+
+    :return: list of (path, number of files, size in bytes) tuples, largest
+             first; directory paths end with ``/``
+    :rtype: list
+    """
+    groups = {}
+    for path, size in files.items():
+        parts = path.split('/')
+        key = '/'.join(parts[:depth]) + ('/' if len(parts) > depth else '')
+        count, total = groups.get(key, (0, 0))
+        groups[key] = (count + 1, total + size)
+    contributors = sorted(((key, count, total)
+                           for key, (count, total) in groups.items()),
+                          key=lambda item: (-item[2], item[0]))
+    return contributors[:limit]
+
+
+def suggest_dockerignore(files, rules, candidates=DOCKERIGNORE_SUGGESTIONS):
+    """Return candidate patterns that would remove files from the context.
+
+    :param files: file sizes keyed by relative paths, see
+                  scan_build_context()
+    :param rules: current ``.dockerignore`` rules
+    :param candidates: patterns to consider
+    :type files: dict
+    :type rules: list
+    :type candidates: list
+
+    :return: list of (pattern, number of files, size in bytes) tuples of the
+             candidates matching files of the context
+    :rtype: list
+    """
+    suggestions = []
+    for pattern in candidates:
+        candidate = [(pattern, compile_dockerignore_pattern(pattern), True)]
+        matched = [size for path, size in files.items()
+                   if is_excluded(path, candidate)]
+        if matched:
+            suggestions.append((pattern, len(matched), sum(matched)))
+    return suggestions
+
+
+def add_dockerignore_patterns(srcdir, patterns):
+    """Append the patterns to the ``.dockerignore`` file, creating it.
+
+    :param srcdir: component source code directory
+    :param patterns: patterns to add
+    :type srcdir: str
+    :type patterns: list
+    """
+    path = os.path.join(srcdir, DOCKERIGNORE_FILENAME)
+    content = ''
+    if os.path.exists(path):
+        with open(path) as fdesc:
+            content = fdesc.read()
+    if content and not content.endswith('\n'):
+        content += '\n'
+    content += ''.join(pattern + '\n' for pattern in patterns)
+    with open(path, 'w') as fdesc:
+        fdesc.write(content)
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Daemon serving ``reana`` commands with warm in-memory state.
+
+The daemon keeps the component registry, the workspace index and the Git
+metadata it caches loaded. When inotify is available, it also watches the
+component source trees, so that the uncommitted changes state of a
+component is only computed again after its working tree or Git index
+changed. Without inotify, that state is computed on every request, since a
+polled tree could be served stale for a whole polling period. See
+``reana.client`` for the protocol.
+"""
+
+import os
+import socket
+import threading
+import time
+
+from reana.client import DAEMON_ACCEPTED, receive_message, send_message
+from reana.watch import InotifyWatcher
+
+DAEMON_STOP = 'stop'
+
+DAEMON_CONNECTION_TIMEOUT = 1.0
+# seconds a client may take to send its request or read the response
+
+
+class DaemonError(Exception):
+    """The daemon cannot be started."""
+
+
+def is_daemon_running(path):
+    """Return whether a daemon accepts connections on the socket.
+
+    :param path: daemon socket path
+    :type path: str
+
+    :rtype: bool
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def stop_daemon(path):
+    """Ask the daemon listening on the socket to exit.
+
+    :param path: daemon socket path
+    :type path: str
+
+    :return: True if a daemon was running
+    :rtype: bool
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        send_message(sock, {'request': DAEMON_STOP})
+        with sock.makefile('rb') as reader:
+            while receive_message(reader) == DAEMON_ACCEPTED:
+                pass
+        return True
+    except (OSError, ValueError):
+        return False
+    finally:
+        sock.close()
+
+
+class DaemonServer(object):
+    """Serve commands received on a Unix socket one at a time."""
+
+    def __init__(self, path, srcdir, config=None, srcdirs=None, poll=False):
+        """Listen on the socket and start watching the source trees.
+
+        :param path: socket path
+        :param srcdir: directory containing the component source directories
+        :param config: path of the configuration file, see
+                       ``reana.cli.get_config_path()``
+        :param srcdirs: source directories to watch keyed by standard
+                        component names [default=watch nothing]
+        :param poll: whether to check the trees on every request instead of
+                     watching them with inotify
+        :type path: str
+        :type srcdir: str
+        :type config: str
+        :type srcdirs: dict
+        :type poll: bool
+
+        :raise: DaemonError if another daemon listens on the socket or the
+                socket cannot be created
+        """
+        from reana import cli
+        self.path = path
+        self.srcdir = srcdir
+        self.config = config
+        self.config_mtime = self._get_config_mtime()
+        self.cli = cli
+        self.requests = 0
+        self.stopped = False
+        if os.path.exists(path):
+            if is_daemon_running(path):
+                raise DaemonError('A daemon is already listening on {0}.'
+                                  .format(path))
+            os.remove(path)
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            self.socket.bind(path)
+        except OSError as err:
+            self.socket.close()
+            raise DaemonError('Cannot listen on {0}: {1}'.format(path, err))
+        finally:
+            os.umask(umask)
+        self.socket.listen(16)
+        self.index = cli.get_workspace_index()
+        self.watcher = None
+        self.reason = None
+        if srcdirs and not poll:
+            try:
+                self.watcher = InotifyWatcher(srcdirs)
+            except (OSError, AttributeError) as err:
+                self.reason = str(err)
+        if self.watcher:
+            self.index.watched = True
+            thread = threading.Thread(target=self._watch)
+            thread.daemon = True
+            thread.start()
+
+    def _get_config_mtime(self):
+        """Return modification time of the configuration file, or None."""
+        try:
+            return os.stat(self.config).st_mtime_ns if self.config else None
+        except OSError:
+            return None
+
+    def _watch(self):
+        """Invalidate the state of the components whose trees change."""
+        while not self.stopped:
+            try:
+                changes = self.watcher.read(1.0)
+            except (OSError, ValueError):
+                break
+            for component in set(component for component, _ in changes):
+                self.index.mark_changed(component)
+
+    def handle(self, request):
+        """Run the requested command and return the response.
+
+        :param request: request, see ``reana.client.forward()``
+        :type request: dict
+
+        :return: response with ``exit_code`` and ``output`` keys, or with an
+                 ``error`` key if the client should run the command itself
+        :rtype: dict
+        """
+        from click.testing import CliRunner
+        from reana.client import DAEMON_COMMANDS
+        if request.get('request') == DAEMON_STOP:
+            self.stopped = True
+            return {'exit_code': 0, 'output': ''}
+        argv = request.get('argv') or []
+        if not argv or argv[0] not in DAEMON_COMMANDS:
+            return {'error': 'Command not served by the daemon.'}
+        if request.get('srcdir') and \
+                os.path.realpath(request['srcdir']) != \
+                os.path.realpath(self.srcdir):
+            return {'error': 'Daemon serves {0}.'.format(self.srcdir)}
+        if (request.get('config') or None) != \
+                (os.environ.get('REANA_CONFIG') or None):
+            return {'error': 'Daemon uses another configuration file.'}
+        config_mtime = self._get_config_mtime()
+        if config_mtime != self.config_mtime:
+            self.config_mtime = config_mtime
+            self.cli.get_component_registry.cache_clear()
+        try:
+            os.chdir(request.get('cwd') or self.srcdir)
+        except OSError as err:
+            return {'error': str(err)}
+        result = CliRunner().invoke(self.cli.cli, argv, prog_name='reana',
+                                    color=bool(request.get('color')))
+        self.index.save()
+        output = result.output
+        if result.exception and \
+                not isinstance(result.exception, SystemExit):
+            output += 'Error: {0}\n'.format(result.exception)
+        return {'exit_code': result.exit_code, 'output': output}
+
+    def serve_forever(self, callback=None):
+        """Serve requests until asked to stop.
+
+        :param callback: function called with the request and the duration
+                         of its handling in seconds
+        :type callback: callable
+        """
+        while not self.stopped:
+            connection, _ = self.socket.accept()
+            connection.settimeout(DAEMON_CONNECTION_TIMEOUT)
+            start = time.time()
+            try:
+                with connection.makefile('rb') as reader:
+                    request = receive_message(reader)
+                if not isinstance(request, dict):
+                    continue
+                # fails if the client already gave up waiting, so that its
+                # command is not run twice
+                send_message(connection, DAEMON_ACCEPTED)
+                response = self.handle(request)
+                send_message(connection, response)
+            except (OSError, ValueError):
+                continue
+            finally:
+                connection.close()
+            self.requests += 1
+            if callback:
+                callback(request, time.time() - start)
+
+    def close(self):
+        """Stop listening and watching."""
+        self.stopped = True
+        self.socket.close()
+        if self.watcher:
+            self.watcher.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
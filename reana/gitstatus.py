@@ -0,0 +1,890 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Fast Git repository status reader for REANA developers.
+
+Reads HEAD, references, objects and the index of Git repositories directly
+instead of running ``git`` processes, so that the status of many component
+repositories can be obtained quickly.
+"""
+
+import binascii
+import collections
+import glob
+import hashlib
+import heapq
+import itertools
+import os
+import re
+import stat
+import struct
+import subprocess
+import zlib
+
+UPSTREAM_REF = 'refs/remotes/upstream/master'
+
+OBJECT_TYPES = {
+    1: 'commit',
+    2: 'tree',
+    3: 'blob',
+    4: 'tag',
+}
+
+OFS_DELTA = 6
+
+REF_DELTA = 7
+
+INDEX_ENTRY_EXTENDED = 0x4000
+
+INDEX_ENTRY_SKIP_WORKTREE = 0x4000
+
+INDEX_ENTRY_INTENT_TO_ADD = 0x2000
+
+GITATTRIBUTES_FILENAME = b'.gitattributes'
+
+CONVERSION_ATTRIBUTES = ['crlf', 'eol', 'filter', 'ident', 'text',
+                         'working-tree-encoding']
+# attributes changing file content between the index and the working tree
+
+FALSE_VALUES = ['false', 'no', 'off', '0', '']
+
+PACK_CACHE_SIZE = 16 * 1024 * 1024
+# bytes of inflated objects kept per pack file, mostly delta bases
+
+
+class UnsupportedRepository(Exception):
+    """Repository uses a feature the status reader does not understand."""
+
+
+def find_git_dir(srcdir):
+    """Return the Git directory of the given working tree.
+
+    Both ``.git`` directories and ``.git`` files pointing elsewhere, as
+    used by worktrees and submodules, are supported.
+
+    :param srcdir: working tree directory
+    :type srcdir: str
+
+    :return: Git directory, or None if the directory is not a repository
+    :rtype: str
+    """
+    dotgit = os.path.join(srcdir, '.git')
+    if os.path.isdir(dotgit):
+        return dotgit
+    try:
+        with open(dotgit) as fdesc:
+            content = fdesc.read().strip()
+    except (IOError, OSError):
+        return None
+    if content.startswith('gitdir:'):
+        return os.path.normpath(os.path.join(srcdir, content[7:].strip()))
+    return None
+
+
+def _get_user_git_path(name):
+    """Return path of the user Git file, such as ``~/.config/git/config``."""
+    xdg_config_home = os.environ.get('XDG_CONFIG_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.config')
+    return os.path.join(xdg_config_home, 'git', name)
+
+
+def _read_config_file(path, config):
+    """Add variables of the Git configuration file to the mapping."""
+    section = None
+    try:
+        with open(path) as fdesc:
+            for line in fdesc:
+                line = line.strip()
+                if line.startswith('['):
+                    match = re.match(r'^\[([\w.-]+)(?:\s+"(.*)")?\]$', line)
+                    section = None
+                    if match:
+                        section = match.group(1).lower()
+                        if match.group(2) is not None:
+                            section += '.' + match.group(2)
+                elif section is not None and line and \
+                        not line.startswith(('#', ';')):
+                    key, _, value = line.partition('=')
+                    config[section + '.' + key.strip().lower()] = \
+                        value.strip() if _ else 'true'
+    except (IOError, OSError):
+        pass
+
+
+def has_conversion_attributes(content):
+    """Return whether the attributes change file content on checkout.
+
+    :param content: content of a ``.gitattributes`` file
+    :type content: bytes
+
+    :return: True if an attribute such as ``text``, ``eol`` or ``filter`` is
+             set, False if they are only unset as by ``-text`` or ``binary``
+    :rtype: bool
+    """
+    for line in content.decode('utf-8', 'replace').splitlines():
+        if line.strip().startswith('#'):
+            continue
+        for attribute in line.split()[1:]:
+            if attribute.startswith(('-', '!')):
+                continue
+            if attribute.split('=', 1)[0] in CONVERSION_ATTRIBUTES:
+                return True
+    return False
+
+
+def _read_offset_varint(data, pos):
+    """Return Git offset-encoded integer starting at the given position."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7f
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, pos
+
+
+def _read_size_varint(data, pos):
+    """Return little-endian base-128 integer starting at the given position."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def _hash_blob(content):
+    """Return hexadecimal Git object id of the blob content."""
+    return hashlib.sha1(b'blob ' + str(len(content)).encode('ascii') + b'\0' +
+                        content).hexdigest()
+
+
+def apply_delta(base, delta):
+    """Return object reconstructed from the base object and a pack delta.
+
+    :param base: base object content
+    :param delta: delta instructions
+    :type base: bytes
+    :type delta: bytes
+
+    :return: target object content
+    :rtype: bytes
+    """
+    source_size, pos = _read_size_varint(delta, 0)
+    target_size, pos = _read_size_varint(delta, pos)
+    if source_size != len(base):
+        raise UnsupportedRepository('Delta base size mismatch.')
+    output = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            offset = 0
+            size = 0
+            for shift in range(4):
+                if opcode & (1 << shift):
+                    offset |= delta[pos] << (8 * shift)
+                    pos += 1
+            for shift in range(3):
+                if opcode & (0x10 << shift):
+                    size |= delta[pos] << (8 * shift)
+                    pos += 1
+            output += base[offset:offset + (size or 0x10000)]
+        elif opcode:
+            output += delta[pos:pos + opcode]
+            pos += opcode
+        else:
+            raise UnsupportedRepository('Invalid delta instruction.')
+    if len(output) != target_size:
+        raise UnsupportedRepository('Delta result size mismatch.')
+    return bytes(output)
+
+
+class PackFile(object):
+    """Read objects from a Git pack file and its version 2 index."""
+
+    def __init__(self, idx_path, cache_size=PACK_CACHE_SIZE):
+        """Load the pack index.
+
+        :param idx_path: path to the ``.idx`` file
+        :param cache_size: bytes of inflated objects to keep, the least
+                           recently used objects are dropped first
+        :type idx_path: str
+        :type cache_size: int
+        """
+        with open(idx_path, 'rb') as fdesc:
+            self.idx = fdesc.read()
+        if self.idx[:4] != b'\xfftOc' or \
+                struct.unpack('>I', self.idx[4:8])[0] != 2:
+            raise UnsupportedRepository('Unsupported pack index version.')
+        self.fanout = struct.unpack('>256I', self.idx[8:1032])
+        self.count = self.fanout[255]
+        self.sha_start = 1032
+        self.offset_start = self.sha_start + 24 * self.count
+        self.large_offset_start = self.offset_start + 4 * self.count
+        self.pack_path = idx_path[:-4] + '.pack'
+        self._pack = None
+        self._cache = collections.OrderedDict()
+        self._cache_size = cache_size
+        self._cached_bytes = 0
+
+    def find(self, sha):
+        """Return the pack offset of the binary object id, or None."""
+        low = self.fanout[sha[0] - 1] if sha[0] else 0
+        high = self.fanout[sha[0]]
+        idx = self.idx
+        while low < high:
+            middle = (low + high) // 2
+            start = self.sha_start + 20 * middle
+            current = idx[start:start + 20]
+            if current < sha:
+                low = middle + 1
+            elif current > sha:
+                high = middle
+            else:
+                start = self.offset_start + 4 * middle
+                offset = struct.unpack('>I', idx[start:start + 4])[0]
+                if offset & 0x80000000:
+                    start = self.large_offset_start + \
+                        8 * (offset & 0x7fffffff)
+                    offset = struct.unpack('>Q', idx[start:start + 8])[0]
+                return offset
+        return None
+
+    def read(self, offset, repository):
+        """Return type and content of the object at the given pack offset.
+
+        :param offset: pack offset
+        :param repository: repository used to resolve ``REF_DELTA`` bases
+        :type offset: int
+        :type repository: GitRepository
+
+        :return: object type name and content
+        :rtype: tuple
+        """
+        if offset in self._cache:
+            self._cache.move_to_end(offset)
+            return self._cache[offset]
+        if self._pack is None:
+            self._pack = open(self.pack_path, 'rb')
+        self._pack.seek(offset)
+        header = self._pack.read(64)
+        byte = header[0]
+        type_number = (byte >> 4) & 7
+        pos = 1
+        while byte & 0x80:
+            byte = header[pos]
+            pos += 1
+        if type_number == OFS_DELTA:
+            distance, pos = _read_offset_varint(header, pos)
+            base_type, base = self.read(offset - distance, repository)
+        elif type_number == REF_DELTA:
+            base_type, base = repository.read_object(
+                binascii.hexlify(header[pos:pos + 20]).decode('ascii'))
+            pos += 20
+        elif type_number in OBJECT_TYPES:
+            base_type, base = OBJECT_TYPES[type_number], None
+        else:
+            raise UnsupportedRepository('Unknown pack object type.')
+        data = self._inflate(offset + pos)
+        if base is not None:
+            data = apply_delta(base, data)
+        self._remember(offset, (base_type, data))
+        return base_type, data
+
+    def _remember(self, offset, value):
+        """Cache the object, dropping least recently used ones if needed."""
+        size = len(value[1])
+        if size > self._cache_size:
+            return
+        self._cache[offset] = value
+        self._cached_bytes += size
+        while self._cached_bytes > self._cache_size:
+            _, (_, data) = self._cache.popitem(last=False)
+            self._cached_bytes -= len(data)
+
+    def _inflate(self, offset):
+        """Return zlib-decompressed data starting at the given offset."""
+        self._pack.seek(offset)
+        decompressor = zlib.decompressobj()
+        chunks = []
+        while not decompressor.eof:
+            chunk = self._pack.read(8192)
+            if not chunk:
+                break
+            chunks.append(decompressor.decompress(chunk))
+        return b''.join(chunks)
+
+    def close(self):
+        """Close the pack file."""
+        if self._pack is not None:
+            self._pack.close()
+            self._pack = None
+
+
+class GitRepository(object):
+    """Read-only access to a Git repository without running ``git``."""
+
+    def __init__(self, srcdir):
+        """Locate the Git directory of the working tree.
+
+        :param srcdir: working tree directory
+        :type srcdir: str
+
+        :raise: UnsupportedRepository if the directory is not a repository
+        """
+        self.srcdir = srcdir
+        self.git_dir = find_git_dir(srcdir)
+        if not self.git_dir:
+            raise UnsupportedRepository(
+                'Not a Git repository: {0}'.format(srcdir))
+        self.common_dir = self.git_dir
+        commondir_file = os.path.join(self.git_dir, 'commondir')
+        if os.path.exists(commondir_file):
+            with open(commondir_file) as fdesc:
+                self.common_dir = os.path.normpath(os.path.join(
+                    self.git_dir, fdesc.read().strip()))
+        self._packed_refs = None
+        self._object_dirs = None
+        self._packs = None
+        self._commits = {}
+
+    def close(self):
+        """Release open pack files."""
+        for pack in self._packs or []:
+            pack.close()
+
+    def get_object_dirs(self):
+        """Return object directories including alternates."""
+        if self._object_dirs is None:
+            self._object_dirs = []
+            pending = [os.path.join(self.common_dir, 'objects')]
+            while pending:
+                objects_dir = pending.pop(0)
+                if objects_dir in self._object_dirs:
+                    continue
+                self._object_dirs.append(objects_dir)
+                alternates = os.path.join(objects_dir, 'info', 'alternates')
+                if os.path.exists(alternates):
+                    with open(alternates) as fdesc:
+                        for line in fdesc:
+                            line = line.strip()
+                            if line and not line.startswith('#'):
+                                pending.append(os.path.normpath(
+                                    os.path.join(objects_dir, line)))
+        return self._object_dirs
+
+    def get_packed_refs(self):
+        """Return mapping of reference names to ids from ``packed-refs``."""
+        if self._packed_refs is None:
+            self._packed_refs = {}
+            try:
+                with open(os.path.join(self.common_dir, 'packed-refs')) as fd:
+                    for line in fd:
+                        if line.startswith(('#', '^')):
+                            continue
+                        parts = line.split()
+                        if len(parts) == 2:
+                            self._packed_refs[parts[1]] = parts[0]
+            except (IOError, OSError):
+                pass
+        return self._packed_refs
+
+    def read_loose_ref(self, ref):
+        """Return content of the loose reference file, or None."""
+        if ref == 'HEAD' or not ref.startswith('refs/'):
+            candidates = [self.git_dir]
+        else:
+            candidates = [self.common_dir]
+        for directory in candidates:
+            try:
+                with open(os.path.join(directory, ref)) as fdesc:
+                    return fdesc.read().strip()
+            except (IOError, OSError):
+                pass
+        return None
+
+    def resolve_ref(self, ref):
+        """Return object id the reference points to.
+
+        :param ref: full reference name such as ``refs/heads/master``
+        :type ref: str
+
+        :return: hexadecimal object id, or None if the reference is unknown
+        :rtype: str
+        """
+        for _ in range(10):
+            content = self.read_loose_ref(ref)
+            if content is None:
+                return self.get_packed_refs().get(ref)
+            if not content.startswith('ref:'):
+                return content
+            ref = content[4:].strip()
+        raise UnsupportedRepository('Too deeply nested symbolic references.')
+
+    def resolve_name(self, name):
+        """Return object id of the revision name as ``git rev-parse`` would.
+
+        :param name: full object id, or reference name such as ``master``,
+                     ``upstream/master``, ``v0.3.0`` or ``refs/heads/master``
+        :type name: str
+
+        :return: hexadecimal object id, or None if the name is unknown;
+                 revision expressions such as ``master~2`` are not supported
+        :rtype: str
+        """
+        if re.match(r'^[0-9a-f]{40}$', name):
+            return name
+        patterns = ['refs/{0}', 'refs/tags/{0}', 'refs/heads/{0}',
+                    'refs/remotes/{0}', 'refs/remotes/{0}/HEAD']
+        if name.startswith('refs/') or re.match(r'^[A-Z_]*HEAD$', name):
+            patterns.insert(0, '{0}')
+        for pattern in patterns:
+            sha = self.resolve_ref(pattern.format(name))
+            if sha and re.match(r'^[0-9a-f]{40}$', sha):
+                return sha
+        return None
+
+    def read_head(self):
+        """Return the checked-out branch and commit.
+
+        :return: branch name (None for detached HEAD) and hexadecimal commit
+                 id (None for an unborn branch)
+        :rtype: tuple
+        """
+        content = self.read_loose_ref('HEAD') or ''
+        if content.startswith('ref:'):
+            ref = content[4:].strip()
+            branch = ref[len('refs/heads/'):] \
+                if ref.startswith('refs/heads/') else ref
+            return branch, self.resolve_ref(ref)
+        return None, content or None
+
+    def read_config(self, system=False):
+        """Return variables of the repository configuration file.
+
+        :param system: whether to also read the system and user configuration
+                       files, which the repository configuration overrides
+        :type system: bool
+
+        :return: mapping of variable names such as ``remote.origin.url`` or
+                 ``core.sparsecheckout`` to their last value; section and
+                 variable names are lower-cased
+        :rtype: dict
+        """
+        paths = []
+        if system:
+            paths = ['/etc/gitconfig', _get_user_git_path('config'),
+                     os.path.join(os.path.expanduser('~'), '.gitconfig')]
+        paths.append(os.path.join(self.common_dir, 'config'))
+        config = {}
+        for path in paths:
+            _read_config_file(path, config)
+        return config
+
+    def read_remotes(self):
+        """Return remotes configured in the repository.
+
+        :return: mapping of remote names to their URLs
+        :rtype: dict
+        """
+        return {name[len('remote.'):-len('.url')]: value
+                for name, value in self.read_config().items()
+                if name.startswith('remote.') and name.endswith('.url')}
+
+    def is_shallow(self):
+        """Return whether the repository has a shallow history."""
+        return os.path.exists(os.path.join(self.common_dir, 'shallow'))
+
+    def get_packs(self):
+        """Return pack files of all object directories."""
+        if self._packs is None:
+            self._packs = []
+            for objects_dir in self.get_object_dirs():
+                pattern = os.path.join(objects_dir, 'pack', 'pack-*.idx')
+                for idx_path in sorted(glob.glob(pattern)):
+                    self._packs.append(PackFile(idx_path))
+        return self._packs
+
+    def read_object(self, sha):
+        """Return type and content of the object.
+
+        :param sha: hexadecimal object id
+        :type sha: str
+
+        :return: object type name and content
+        :rtype: tuple
+
+        :raise: KeyError if the object cannot be found
+        """
+        for objects_dir in self.get_object_dirs():
+            path = os.path.join(objects_dir, sha[:2], sha[2:])
+            try:
+                with open(path, 'rb') as fdesc:
+                    data = zlib.decompress(fdesc.read())
+            except (IOError, OSError):
+                continue
+            header, _, content = data.partition(b'\0')
+            return header.split()[0].decode('ascii'), content
+        binary_sha = binascii.unhexlify(sha)
+        for pack in self.get_packs():
+            offset = pack.find(binary_sha)
+            if offset is not None:
+                return pack.read(offset, self)
+        raise KeyError(sha)
+
+    def read_commit(self, sha):
+        """Return tree, parents and committer time of the commit.
+
+        :param sha: hexadecimal commit id
+        :type sha: str
+
+        :return: tree id, list of parent ids, committer Unix time
+        :rtype: tuple
+        """
+        if sha not in self._commits:
+            object_type, content = self.read_object(sha)
+            if object_type != 'commit':
+                raise UnsupportedRepository('{0} is not a commit.'.format(sha))
+            tree = None
+            parents = []
+            timestamp = 0
+            for line in content.split(b'\n\n', 1)[0].split(b'\n'):
+                if line.startswith(b'tree '):
+                    tree = line[5:].decode('ascii')
+                elif line.startswith(b'parent '):
+                    parents.append(line[7:].decode('ascii'))
+                elif line.startswith(b'committer '):
+                    timestamp = int(line.rsplit(b' ', 2)[1])
+            self._commits[sha] = (tree, parents, timestamp)
+        return self._commits[sha]
+
+    def count_ahead_behind(self, local, base):
+        """Return how many commits are only in ``local`` and only in ``base``.
+
+        Walks both histories at the same time from newest to oldest commits
+        and stops as soon as only common ancestors remain to be visited.
+        Like in ``git rev-list``, commits with equal dates are visited in
+        the order they were reached, and a commit found to be common marks
+        its already visited ancestors as common too.
+
+        :param local: hexadecimal commit id
+        :param base: hexadecimal commit id
+        :type local: str
+        :type base: str
+
+        :return: number of commits ahead and behind
+        :rtype: tuple
+        """
+        if local == base:
+            return 0, 0
+        flags = {}
+        visited = set()
+        queue = []
+        counter = itertools.count()
+        # number of queued commits not visited yet and not known to be
+        # common, the walk ends when it drops to zero
+        uncommon = 0
+
+        def paint(sha, bits):
+            nonlocal uncommon
+            pending = [sha]
+            while pending:
+                sha = pending.pop()
+                old = flags.get(sha, 0)
+                if old | bits == old:
+                    continue
+                flags[sha] = old | bits
+                if sha in visited:
+                    pending.extend(self.read_commit(sha)[1])
+                    continue
+                if not old:
+                    uncommon += 1
+                if old | bits == 3:
+                    uncommon -= 1
+                heapq.heappush(queue, (-self.read_commit(sha)[2],
+                                       next(counter), sha))
+
+        paint(local, 1)
+        paint(base, 2)
+        while uncommon:
+            _, _, sha = heapq.heappop(queue)
+            if sha in visited:
+                continue
+            visited.add(sha)
+            if flags[sha] != 3:
+                uncommon -= 1
+            for parent in self.read_commit(sha)[1]:
+                paint(parent, flags[sha])
+        ahead = sum(1 for value in flags.values() if value == 1)
+        behind = sum(1 for value in flags.values() if value == 2)
+        return ahead, behind
+
+    def read_tree(self, sha, prefix=b''):
+        """Return files of the tree recursively.
+
+        :param sha: hexadecimal tree id
+        :param prefix: path prefix of the tree
+        :type sha: str
+        :type prefix: bytes
+
+        :return: mapping of file paths to mode and hexadecimal object id
+        :rtype: dict
+        """
+        files = {}
+        content = self.read_object(sha)[1]
+        pos = 0
+        while pos < len(content):
+            space = content.index(b' ', pos)
+            nul = content.index(b'\0', space)
+            mode = int(content[pos:space], 8)
+            path = prefix + content[space + 1:nul]
+            entry_sha = binascii.hexlify(content[nul + 1:nul + 21]).decode(
+                'ascii')
+            pos = nul + 21
+            if stat.S_ISDIR(mode):
+                files.update(self.read_tree(entry_sha, path + b'/'))
+            else:
+                files[path] = (mode, entry_sha)
+        return files
+
+    def read_index(self):
+        """Return entries of the index and the cached root tree id.
+
+        :return: list of (path, mode, sha, size, mtime seconds, mtime
+                 nanoseconds, flags, extended flags) tuples and the root
+                 tree id recorded by the cache-tree extension, or None
+        :rtype: tuple
+        """
+        try:
+            with open(os.path.join(self.git_dir, 'index'), 'rb') as fdesc:
+                data = fdesc.read()
+        except (IOError, OSError):
+            return [], None
+        signature, version, count = struct.unpack('>4sII', data[:12])
+        if signature != b'DIRC' or version not in (2, 3, 4):
+            raise UnsupportedRepository('Unsupported index version.')
+        entries = []
+        pos = 12
+        previous_path = b''
+        for _ in range(count):
+            start = pos
+            fields = struct.unpack('>10I20sH', data[pos:pos + 62])
+            pos += 62
+            flags = fields[11]
+            extended_flags = 0
+            if version >= 3 and flags & INDEX_ENTRY_EXTENDED:
+                extended_flags = struct.unpack('>H', data[pos:pos + 2])[0]
+                pos += 2
+            if version == 4:
+                strip, pos = _read_offset_varint(data, pos)
+                end = data.index(b'\0', pos)
+                path = previous_path[:len(previous_path) - strip] + \
+                    data[pos:end]
+                pos = end + 1
+            else:
+                end = data.index(b'\0', pos)
+                path = data[pos:end]
+                pos = start + ((end - start + 8) & ~7)
+            previous_path = path
+            entries.append((path, fields[6],
+                            binascii.hexlify(fields[10]).decode('ascii'),
+                            fields[9], fields[2], fields[3], flags,
+                            extended_flags))
+        root_tree = None
+        while pos + 8 <= len(data) - 20:
+            signature = data[pos:pos + 4]
+            size = struct.unpack('>I', data[pos + 4:pos + 8])[0]
+            payload = data[pos + 8:pos + 8 + size]
+            pos += 8 + size
+            if signature == b'link':
+                raise UnsupportedRepository('Split index is not supported.')
+            if signature == b'TREE' and payload.startswith(b'\0'):
+                newline = payload.index(b'\n')
+                entry_count = int(payload[1:newline].split()[0])
+                if entry_count >= 0:
+                    root_tree = binascii.hexlify(
+                        payload[newline + 1:newline + 21]).decode('ascii')
+        return entries, root_tree
+
+    def is_dirty(self, head_sha=None):
+        """Return whether tracked files differ from the HEAD commit.
+
+        Both staged changes and changes of the working tree files are
+        considered. Untracked files are not. The ``core.filemode`` and
+        ``core.autocrlf`` settings are honoured; when attributes such as
+        ``text`` or ``filter`` convert file content, ``git status`` is run
+        instead.
+
+        :param head_sha: hexadecimal id of the HEAD commit
+        :type head_sha: str
+
+        :return: True if there are uncommitted changes
+        :rtype: bool
+        """
+        entries, root_tree = self.read_index()
+        config = self.read_config(system=True)
+        if self._has_conversion_attributes(entries, config):
+            return self._run_git_status()
+        filemode = config.get('core.filemode', 'true').lower() \
+            not in FALSE_VALUES
+        autocrlf = config.get('core.autocrlf', 'false').lower() \
+            not in FALSE_VALUES
+        try:
+            index_mtime = os.stat(os.path.join(self.git_dir, 'index')).st_mtime
+        except OSError:
+            index_mtime = 0
+        for (path, mode, sha, size, mtime, mtime_ns, flags,
+                extended_flags) in entries:
+            if flags & 0x3000 or extended_flags & INDEX_ENTRY_INTENT_TO_ADD:
+                return True  # unmerged or intent-to-add entry
+            if extended_flags & INDEX_ENTRY_SKIP_WORKTREE or \
+                    stat.S_IFMT(mode) == 0o160000:
+                continue
+            if self._is_file_modified(path, mode, sha, size, mtime, mtime_ns,
+                                      index_mtime, filemode, autocrlf):
+                return True
+        head_tree = self.read_commit(head_sha)[0] if head_sha else None
+        if root_tree is not None and root_tree == head_tree:
+            return False
+        head_files = self.read_tree(head_tree) if head_tree else {}
+        if len(head_files) != len(entries):
+            return True
+        for path, mode, sha, _, _, _, _, _ in entries:
+            if head_files.get(path) != (mode, sha):
+                return True
+        return False
+
+    def _has_conversion_attributes(self, entries, config):
+        """Return whether attributes convert content of tracked files.
+
+        The ``.gitattributes`` files of the working tree are read, as well
+        as ``info/attributes`` of the Git directory and the user attributes
+        file.
+        """
+        paths = [os.path.join(self.common_dir, 'info', 'attributes'),
+                 os.path.expanduser(config['core.attributesfile'])
+                 if config.get('core.attributesfile')
+                 else _get_user_git_path('attributes')]
+        for path, _, _, _, _, _, _, _ in entries:
+            if path.rsplit(b'/', 1)[-1] == GITATTRIBUTES_FILENAME:
+                paths.append(os.path.join(self.srcdir, os.fsdecode(path)))
+        for path in paths:
+            try:
+                with open(path, 'rb') as fdesc:
+                    content = fdesc.read()
+            except (IOError, OSError):
+                continue
+            if has_conversion_attributes(content):
+                return True
+        return False
+
+    def _run_git_status(self):
+        """Return whether ``git status`` reports changes of tracked files.
+
+        :raise: UnsupportedRepository if Git cannot be run
+        """
+        try:
+            output = subprocess.check_output(
+                ['git', 'status', '--porcelain', '--untracked-files=no'],
+                cwd=self.srcdir, stderr=subprocess.DEVNULL)
+        except (OSError, subprocess.CalledProcessError) as err:
+            raise UnsupportedRepository(str(err))
+        return bool(output.strip())
+
+    def _is_file_modified(self, path, mode, sha, size, mtime, mtime_ns,
+                          index_mtime, filemode=True, autocrlf=False):
+        """Return whether the working tree file differs from the index.
+
+        With ``autocrlf``, a file whose CRLF line endings converted to LF
+        match the index is unchanged, as Git converts them when adding it.
+        """
+        fullpath = os.path.join(self.srcdir, os.fsdecode(path))
+        try:
+            file_stat = os.lstat(fullpath)
+        except OSError:
+            return True
+        if stat.S_IFMT(file_stat.st_mode) != stat.S_IFMT(mode):
+            return True
+        if filemode and stat.S_ISREG(mode) and \
+                bool(file_stat.st_mode & 0o100) != bool(mode & 0o100):
+            return True
+        if file_stat.st_size & 0xffffffff != size:
+            return True
+        if int(file_stat.st_mtime) == mtime and \
+                (not mtime_ns or file_stat.st_mtime_ns % 10 ** 9 == mtime_ns) \
+                and file_stat.st_mtime < index_mtime:
+            return False
+        if stat.S_ISLNK(mode):
+            content = os.fsencode(os.readlink(fullpath))
+        else:
+            with open(fullpath, 'rb') as fdesc:
+                content = fdesc.read()
+        if _hash_blob(content) == sha:
+            return False
+        if autocrlf and stat.S_ISREG(mode) and b'\r\n' in content and \
+                b'\0' not in content:
+            return _hash_blob(content.replace(b'\r\n', b'\n')) != sha
+        return True
+
+
+def get_repository_status(srcdir, base_ref=UPSTREAM_REF):
+    """Return status of the Git repository in the given directory.
+
+    :param srcdir: working tree directory
+    :param base_ref: reference to compare the checked-out commit with
+    :type srcdir: str
+    :type base_ref: str
+
+    :return: dictionary with ``branch``, ``sha``, ``ahead``, ``behind`` and
+             ``dirty`` keys; values that cannot be determined are None
+    :rtype: dict
+    """
+    status = {'branch': None, 'sha': None, 'ahead': None, 'behind': None,
+              'dirty': None}
+    try:
+        repository = GitRepository(srcdir)
+    except UnsupportedRepository:
+        return status
+    try:
+        status['branch'], status['sha'] = repository.read_head()
+        base = repository.resolve_ref(base_ref)
+        if status['sha'] and base:
+            try:
+                status['ahead'], status['behind'] = \
+                    repository.count_ahead_behind(status['sha'], base)
+            except (KeyError, UnsupportedRepository):
+                pass  # e.g. shallow clone with missing history
+        try:
+            status['dirty'] = repository.is_dirty(status['sha'])
+        except (KeyError, UnsupportedRepository):
+            pass
+    except (IOError, OSError, ValueError, IndexError, struct.error,
+            zlib.error):
+        pass
+    finally:
+        repository.close()
+    return status
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Execution history of the commands run by REANA developer scripts."""
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+
+HISTORY_FILENAME = '.reana-history.jsonl'
+
+HISTORY_LOCK_SUFFIX = '.lock'
+
+HISTORY_MAX_SIZE = 8 * 1024 * 1024
+# bytes above which the history file is truncated when appending to it
+
+HISTORY_MAX_RECORDS = 20000
+# most recent records kept when truncating the history file
+
+HISTORY_MAX_DAYS = 90
+# age in days of the oldest records kept when truncating the history file
+
+_lock = threading.Lock()
+
+
+def run_recorded(cmd, cwd=None, capture=False):
+    """Run the shell command and measure it.
+
+    The command is run by ``reana.runner``, so that exit statuses and
+    signals are reported the same way everywhere.
+
+    :param cmd: shell command to run
+    :param cwd: working directory [default=current working directory]
+    :param capture: whether to capture standard output and error together
+    :type cmd: str
+    :type cwd: str
+    :type capture: bool
+
+    :return: exit code, negative signal number if the command was killed by
+             a signal, captured output (None unless captured) and the
+             execution record with ``start``, ``duration``, ``exit_code``
+             and ``max_rss`` (bytes, None if unknown) keys
+    :rtype: tuple
+    """
+    from reana.runner import run_command, run_sync
+    result = run_sync(run_command(cmd, cwd=cwd, capture=capture))
+    output = None
+    if capture:
+        output = ''.join(line for _, line in result.output)
+    record = {
+        'start': result.start,
+        'duration': result.duration,
+        'exit_code': result.returncode,
+        'max_rss': result.max_rss,
+    }
+    return result.returncode, output, record
+
+
+def record_execution(path, cmd, component, record):
+    """Append the execution record to the history file.
+
+    Once the file grows above ``HISTORY_MAX_SIZE``, it is truncated to the
+    last ``HISTORY_MAX_RECORDS`` records of the last ``HISTORY_MAX_DAYS``
+    days, see truncate_history().
+
+    :param path: history file path
+    :param cmd: command run
+    :param component: standard component name
+    :param record: execution record, see run_recorded()
+    :type path: str
+    :type cmd: str
+    :type component: str
+    :type record: dict
+    """
+    line = json.dumps(dict(record, command=cmd, component=component),
+                      sort_keys=True) + '\n'
+    with _lock:
+        try:
+            with open(path + HISTORY_LOCK_SUFFIX, 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                with open(path, 'a') as fdesc:
+                    fdesc.write(line)
+                    size = fdesc.tell()
+                if size > HISTORY_MAX_SIZE:
+                    truncate_history(path, HISTORY_MAX_RECORDS,
+                                     HISTORY_MAX_DAYS)
+        except (IOError, OSError):
+            pass
+
+
+def truncate_history(path, max_records=HISTORY_MAX_RECORDS,
+                     max_days=HISTORY_MAX_DAYS):
+    """Keep only the most recent records of the history file.
+
+    The caller holds the lock of the history file, see record_execution().
+
+    :param path: history file path
+    :param max_records: number of most recent records to keep
+    :param max_days: age in days above which records are removed
+    :type path: str
+    :type max_records: int
+    :type max_days: float
+    """
+    records = load_history(path, since=time.time() - max_days * 86400)
+    fdesc, tmppath = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                      prefix=os.path.basename(path))
+    with os.fdopen(fdesc, 'w') as tmpfile:
+        for record in records[-max_records:] if max_records else []:
+            tmpfile.write(json.dumps(record, sort_keys=True) + '\n')
+    os.replace(tmppath, path)
+
+
+def load_history(path, since=None):
+    """Return execution records of the history file, oldest first.
+
+    :param path: history file path
+    :param since: ignore records started before this timestamp
+    :type path: str
+    :type since: float
+
+    :return: execution records
+    :rtype: list
+    """
+    records = []
+    try:
+        with open(path) as fdesc:
+            for line in fdesc:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if since is None or record.get('start', 0) >= since:
+                    records.append(record)
+    except (IOError, OSError):
+        pass
+    return records
+
+
+def get_percentile(values, percentile):
+    """Return the percentile of the values using the nearest-rank method."""
+    if not values:
+        return None
+    values = sorted(values)
+    rank = max(1, int(-(-percentile * len(values) // 100)))
+    return values[rank - 1]
+
+
+def summarize_history(records):
+    """Return duration statistics per component and command.
+
+    :param records: execution records, oldest first
+    :type records: list
+
+    :return: list of dictionaries with ``component``, ``command``, ``runs``,
+             ``failures``, ``p50``, ``p95``, ``max_rss`` and ``trend`` keys,
+             slowest median first; ``trend`` is the relative change of the
+             median duration of the newer half of the runs with respect to
+             the older half, None for less than four runs
+    :rtype: list
+    """
+    groups = {}
+    for record in records:
+        key = (record.get('component', ''), record.get('command', ''))
+        groups.setdefault(key, []).append(record)
+    summary = []
+    for (component, command), group in groups.items():
+        durations = [record['duration'] for record in group]
+        rss = [record['max_rss'] for record in group
+               if record.get('max_rss') is not None]
+        trend = None
+        if len(durations) >= 4:
+            half = len(durations) // 2
+            older = get_percentile(durations[:half], 50)
+            newer = get_percentile(durations[-half:], 50)
+            if older:
+                trend = (newer - older) / older
+        summary.append({
+            'component': component,
+            'command': command,
+            'runs': len(group),
+            'failures': sum(1 for record in group if record['exit_code']),
+            'p50': get_percentile(durations, 50),
+            'p95': get_percentile(durations, 95),
+            'max_rss': max(rss) if rss else None,
+            'trend': trend,
+        })
+    summary.sort(key=lambda entry: (-entry['p50'], entry['component'],
+                                    entry['command']))
+    return summary
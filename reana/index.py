@@ -0,0 +1,492 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Persistent index of REANA component source directory metadata."""
+
+import fcntl
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+from reana.gitstatus import UPSTREAM_REF, GitRepository, \
+    UnsupportedRepository, find_git_dir
+
+INDEX_FILENAME = '.reana-index'
+
+INDEX_VERSION = 1
+
+INDEX_LOCK_SUFFIX = '.lock'
+
+# files modified less than two seconds before indexing are not trusted
+RACY_WINDOW = 2 * 10 ** 9
+
+# seconds during which a remote advertisement is reused
+REMOTE_REFS_MAX_AGE = 60
+
+
+def get_mtime(path):
+    """Return modification time of the path in nanoseconds, or None."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_fingerprint(srcdir, branch=None):
+    """Return modification times of files the component metadata depend on.
+
+    :param srcdir: component source code directory
+    :param branch: checked-out branch whose reference file to watch
+    :type srcdir: str
+    :type branch: str
+
+    :return: mapping of watched file names to modification times
+    :rtype: dict
+    """
+    try:
+        repository = GitRepository(srcdir)
+    except UnsupportedRepository:
+        return {'Dockerfile': get_mtime(os.path.join(srcdir, 'Dockerfile')),
+                'srcdir': get_mtime(srcdir)}
+    paths = {
+        'Dockerfile': os.path.join(srcdir, 'Dockerfile'),
+        'HEAD': os.path.join(repository.git_dir, 'HEAD'),
+        'FETCH_HEAD': os.path.join(repository.git_dir, 'FETCH_HEAD'),
+        'config': os.path.join(repository.common_dir, 'config'),
+        'packed-refs': os.path.join(repository.common_dir, 'packed-refs'),
+        UPSTREAM_REF: os.path.join(repository.common_dir, UPSTREAM_REF),
+    }
+    if branch:
+        ref = 'refs/heads/{0}'.format(branch)
+        paths[ref] = os.path.join(repository.common_dir, ref)
+    return {name: get_mtime(path) for name, path in paths.items()}
+
+
+def read_component_metadata(srcdir):
+    """Return metadata of the component source directory.
+
+    :param srcdir: component source code directory
+    :type srcdir: str
+
+    :return: dictionary with ``dockerised``, ``branch``, ``sha``,
+             ``upstream_sha``, ``remotes``, ``fingerprint`` and
+             ``indexed_at`` keys
+    :rtype: dict
+    """
+    metadata = {
+        'indexed_at': int(time.time() * 10 ** 9),
+        'dockerised': os.path.exists(os.path.join(srcdir, 'Dockerfile')),
+        'branch': None,
+        'sha': None,
+        'upstream_sha': None,
+        'remotes': {},
+    }
+    try:
+        repository = GitRepository(srcdir)
+    except UnsupportedRepository:
+        metadata['fingerprint'] = get_fingerprint(srcdir)
+        return metadata
+    try:
+        metadata['branch'], metadata['sha'] = repository.read_head()
+        metadata['upstream_sha'] = repository.resolve_ref(UPSTREAM_REF)
+        metadata['remotes'] = repository.read_remotes()
+    finally:
+        repository.close()
+    metadata['fingerprint'] = get_fingerprint(srcdir, metadata['branch'])
+    return metadata
+
+
+def _merge_newest(current, other, get_time, invalidated_at=None):
+    """Return mapping with the newer of the values of both mappings.
+
+    :param current: values of this process, preferred on equal times
+    :param other: values stored by another process
+    :param get_time: function returning the time of a value
+    :param invalidated_at: function returning the time before which values
+                           of the key are forgotten, or None
+    :type current: dict
+    :type other: dict
+    :type get_time: callable
+    :type invalidated_at: callable
+
+    :rtype: dict
+    """
+    merged = dict(current)
+    for key, value in other.items():
+        try:
+            other_time = get_time(value)
+        except (AttributeError, KeyError, TypeError):
+            continue
+        if invalidated_at and other_time <= invalidated_at(key):
+            continue
+        if key not in merged or get_time(merged[key]) < other_time:
+            merged[key] = value
+    return merged
+
+
+def read_remote_refs(srcdir, remote):
+    """Return branches advertised by the remote repository.
+
+    :param srcdir: component source code directory
+    :param remote: remote name such as ``origin``
+    :type srcdir: str
+    :type remote: str
+
+    :return: mapping of reference names to hexadecimal object ids, or None
+             if the remote cannot be reached
+    :rtype: dict
+    """
+    try:
+        output = subprocess.check_output(
+            ['git', 'ls-remote', '--heads', remote], cwd=srcdir,
+            stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+            universal_newlines=True)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    refs = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            refs[parts[1]] = parts[0]
+    return refs
+
+
+class WorkspaceIndex(object):
+    """Component metadata cached in ``$REANA_SRCDIR/.reana-index``.
+
+    Entries are revalidated on access by comparing the modification times
+    of the Dockerfile and of the Git HEAD, references, configuration and
+    ``FETCH_HEAD`` files with the ones recorded when the entry was created.
+    Processes saving the index at the same time merge their entries, the
+    most recent entry of each component winning.
+    """
+
+    def __init__(self, srcdir):
+        """Load the index of the given source directory.
+
+        :param srcdir: directory containing the component source directories
+        :type srcdir: str
+        """
+        self.srcdir = srcdir
+        self.path = os.path.join(srcdir, INDEX_FILENAME)
+        self.components = {}
+        self.remote_refs = {}
+        self.upstream_fetches = {}
+        self.modified = False
+        self.watched = False
+        self.dirty = {}
+        self.generations = {}
+        self.invalidated = {}
+        self._lock = threading.Lock()
+        content = self._load()
+        self.components = content['components']
+        self.remote_refs = content['remote_refs']
+        self.upstream_fetches = content['upstream_fetches']
+
+    def _load(self):
+        """Return content of the index file, empty if it cannot be read."""
+        content = {'components': {}, 'remote_refs': {},
+                   'upstream_fetches': {}}
+        try:
+            with open(self.path) as fdesc:
+                stored = json.load(fdesc)
+            if stored.get('version') == INDEX_VERSION:
+                for key in content:
+                    if isinstance(stored.get(key), dict):
+                        content[key] = stored[key]
+        except (IOError, OSError, ValueError, AttributeError):
+            pass
+        return content
+
+    def get(self, component):
+        """Return up-to-date metadata of the component.
+
+        :param component: standard component name
+        :type component: str
+
+        :return: component metadata, see read_component_metadata()
+        :rtype: dict
+        """
+        srcdir = os.path.join(self.srcdir, component)
+        entry = self.components.get(component)
+        if entry is not None and self._is_valid(entry, srcdir):
+            return entry
+        entry = read_component_metadata(srcdir)
+        with self._lock:
+            self.components[component] = entry
+            self.modified = True
+        return entry
+
+    @staticmethod
+    def _is_valid(entry, srcdir):
+        """Return whether the index entry still describes the directory."""
+        fingerprint = entry.get('fingerprint')
+        if fingerprint != get_fingerprint(srcdir, entry.get('branch')):
+            return False
+        racy_after = entry.get('indexed_at', 0) - RACY_WINDOW
+        return all(mtime is None or mtime < racy_after
+                   for mtime in fingerprint.values())
+
+    def get_ahead_behind(self, component):
+        """Return commits ahead and behind ``upstream/master``.
+
+        The result is cached for the pair of commits it was computed for.
+
+        :param component: standard component name
+        :type component: str
+
+        :return: number of commits ahead and behind, or (None, None)
+        :rtype: tuple
+        """
+        entry = self.get(component)
+        if not entry['sha'] or not entry['upstream_sha']:
+            return None, None
+        key = '{0}..{1}'.format(entry['upstream_sha'], entry['sha'])
+        cached = entry.get('ahead_behind')
+        if cached and cached[0] == key:
+            return cached[1], cached[2]
+        try:
+            repository = GitRepository(os.path.join(self.srcdir, component))
+        except UnsupportedRepository:
+            return None, None
+        try:
+            ahead, behind = repository.count_ahead_behind(
+                entry['sha'], entry['upstream_sha'])
+        except (KeyError, UnsupportedRepository):
+            return None, None
+        finally:
+            repository.close()
+        with self._lock:
+            entry['ahead_behind'] = [key, ahead, behind]
+            self.modified = True
+        return ahead, behind
+
+    def get_status(self, component):
+        """Return Git status of the component.
+
+        Branch and commits ahead and behind come from the index, while the
+        working tree is checked for uncommitted changes, unless the index is
+        ``watched`` and no change of the working tree was reported since the
+        last check, see mark_changed().
+
+        :param component: standard component name
+        :type component: str
+
+        :return: dictionary with ``branch``, ``sha``, ``ahead``, ``behind``
+                 and ``dirty`` keys, see get_repository_status()
+        :rtype: dict
+        """
+        entry = self.get(component)
+        ahead, behind = self.get_ahead_behind(component)
+        status = {'branch': entry['branch'], 'sha': entry['sha'],
+                  'ahead': ahead, 'behind': behind, 'dirty': None}
+        srcdir = os.path.join(self.srcdir, component)
+        key = None
+        if self.watched:
+            git_dir = find_git_dir(srcdir)
+            key = [entry['sha'], get_mtime(os.path.join(git_dir, 'index'))
+                   if git_dir else None]
+            cached = self.dirty.get(component)
+            if cached and cached[0] == key:
+                status['dirty'] = cached[1]
+                return status
+            generation = self.generations.get(component, 0)
+        try:
+            repository = GitRepository(srcdir)
+        except UnsupportedRepository:
+            return status
+        try:
+            status['dirty'] = repository.is_dirty(entry['sha'])
+        except (KeyError, UnsupportedRepository, IOError, OSError,
+                ValueError):
+            pass
+        finally:
+            repository.close()
+        if key is not None and status['dirty'] is not None:
+            with self._lock:
+                if self.generations.get(component, 0) == generation:
+                    self.dirty[component] = (key, status['dirty'])
+        return status
+
+    def mark_changed(self, component):
+        """Record that files of the working tree of the component changed.
+
+        Used by the watcher of ``reana daemon`` to invalidate the
+        uncommitted changes state kept in memory for ``watched`` indexes.
+
+        :param component: standard component name
+        :type component: str
+        """
+        with self._lock:
+            self.generations[component] = \
+                self.generations.get(component, 0) + 1
+            self.dirty.pop(component, None)
+
+    def get_remote_refs(self, component, remote,
+                        max_age=REMOTE_REFS_MAX_AGE):
+        """Return branches advertised by the remote of the component.
+
+        The advertisement is cached, so that the remote is contacted at most
+        once per component within ``max_age`` seconds. The cached
+        advertisement may be outdated, so it is only a hint for display;
+        commands deciding whether to push pass ``max_age=0`` to always ask
+        the remote.
+
+        :param component: standard component name
+        :param remote: remote name such as ``origin``
+        :param max_age: seconds during which a cached advertisement is used
+        :type component: str
+        :type remote: str
+        :type max_age: float
+
+        :return: mapping of reference names to hexadecimal object ids, or
+                 None if the remote cannot be reached
+        :rtype: dict
+        """
+        url = self.get(component)['remotes'].get(remote)
+        cached = self.remote_refs.get(component, {}).get(remote)
+        if cached and cached['url'] == url and \
+                0 <= time.time() - cached['time'] < max_age:
+            return dict(cached['refs'])
+        refs = read_remote_refs(os.path.join(self.srcdir, component), remote)
+        if refs is not None:
+            with self._lock:
+                self.remote_refs.setdefault(component, {})[remote] = {
+                    'url': url, 'time': time.time(), 'refs': refs}
+                self.modified = True
+        return refs
+
+    def set_remote_ref(self, component, remote, ref, sha):
+        """Record the new value of a reference pushed to the remote.
+
+        :param component: standard component name
+        :param remote: remote name such as ``origin``
+        :param ref: full reference name such as ``refs/heads/master``
+        :param sha: hexadecimal object id
+        :type component: str
+        :type remote: str
+        :type ref: str
+        :type sha: str
+        """
+        with self._lock:
+            cached = self.remote_refs.get(component, {}).get(remote)
+            if cached:
+                cached['refs'][ref] = sha
+                self.modified = True
+
+    def get_upstream_fetch(self, component):
+        """Return when upstream of the component was last fetched by reana.
+
+        Other fetches, e.g. ``git fetch origin`` or ``git pull``, are not
+        taken into account.
+
+        :param component: standard component name
+        :type component: str
+
+        :return: Unix time, or None if unknown
+        :rtype: float
+        """
+        return self.upstream_fetches.get(component)
+
+    def set_upstream_fetch(self, component, when=None):
+        """Record that upstream of the component was fetched.
+
+        :param component: standard component name
+        :param when: Unix time of the fetch [default=now]
+        :type component: str
+        :type when: float
+        """
+        with self._lock:
+            self.upstream_fetches[component] = time.time() \
+                if when is None else when
+            self.modified = True
+
+    def invalidate(self, component=None):
+        """Forget cached metadata of the component, or of all components.
+
+        Entries stored by other processes before the invalidation are not
+        merged back when saving.
+        """
+        with self._lock:
+            if component is None:
+                self.components.clear()
+                self.remote_refs.clear()
+                self.invalidated[None] = time.time()
+            else:
+                self.components.pop(component, None)
+                self.remote_refs.pop(component, None)
+                self.invalidated[component] = time.time()
+            self.modified = True
+
+    def _get_invalidation_time(self, component):
+        """Return Unix time the component was last invalidated, or 0."""
+        return max(self.invalidated.get(component, 0),
+                   self.invalidated.get(None, 0))
+
+    def _merge(self, content):
+        """Merge index content stored by other processes into this index."""
+        self.components = _merge_newest(
+            self.components, content['components'],
+            lambda entry: entry['indexed_at'] / 10 ** 9,
+            self._get_invalidation_time)
+        for component, remotes in content['remote_refs'].items():
+            if not isinstance(remotes, dict):
+                continue
+            invalidated_at = self._get_invalidation_time(component)
+            merged = _merge_newest(self.remote_refs.get(component, {}),
+                                   remotes, lambda cached: cached['time'],
+                                   lambda remote: invalidated_at)
+            if merged:
+                self.remote_refs[component] = merged
+        self.upstream_fetches = _merge_newest(
+            self.upstream_fetches, content['upstream_fetches'],
+            lambda when: float(when))
+
+    def save(self):
+        """Atomically write the index if it was modified.
+
+        The index file is locked while it is read again, merged with this
+        index and replaced, so that entries saved by other processes in the
+        meantime are kept.
+        """
+        if not self.modified or not os.path.isdir(self.srcdir):
+            return
+        with self._lock:
+            try:
+                with open(self.path + INDEX_LOCK_SUFFIX, 'a') as lock:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                    self._merge(self._load())
+                    content = {'version': INDEX_VERSION,
+                               'components': self.components,
+                               'remote_refs': self.remote_refs,
+                               'upstream_fetches': self.upstream_fetches}
+                    fdesc, tmppath = tempfile.mkstemp(dir=self.srcdir,
+                                                      prefix=INDEX_FILENAME)
+                    with os.fdopen(fdesc, 'w') as tmpfile:
+                        json.dump(content, tmpfile, sort_keys=True)
+                    os.replace(tmppath, self.path)
+            except (IOError, OSError):
+                return
+            self.modified = False
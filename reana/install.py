@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Editable installation of REANA components into a Python environment."""
+
+import os
+import re
+import subprocess
+import time
+
+INSTALL_MARKER = 'Installing collected packages:'
+
+SUCCESS_MARKER = 'Successfully installed '
+
+
+def get_virtualenv_python(venv):
+    """Return the Python interpreter of the virtual environment.
+
+    :param venv: virtual environment directory
+    :type venv: str
+
+    :return: interpreter path
+    :rtype: str
+    """
+    if os.name == 'nt':
+        return os.path.join(venv, 'Scripts', 'python.exe')
+    return os.path.join(venv, 'bin', 'python')
+
+
+def create_virtualenv(venv, python):
+    """Create the virtual environment unless it exists.
+
+    :param venv: virtual environment directory
+    :param python: interpreter creating the environment
+    :type venv: str
+    :type python: str
+
+    :return: interpreter of the environment and whether it was created
+    :rtype: tuple
+
+    :raise: subprocess.CalledProcessError or OSError on failure
+    """
+    venv_python = get_virtualenv_python(venv)
+    if os.path.exists(venv_python):
+        return venv_python, False
+    subprocess.check_output([python, '-m', 'venv', venv],
+                            stderr=subprocess.STDOUT)
+    return venv_python, True
+
+
+def get_install_args(python, srcdirs, extras=None, cache_dir=None,
+                     find_links=(), upgrade=False):
+    """Return arguments of the single pip run installing the sources.
+
+    All sources are given to the same ``pip install`` so that their
+    dependencies are resolved together, once, and so that the local
+    sources satisfy the requirements of each other.
+
+    :param python: interpreter of the target environment
+    :param srcdirs: component source directories
+    :param extras: extras to install with every component, e.g. ``all``
+    :param cache_dir: pip cache directory [default=pip user cache]
+    :param find_links: additional local or remote wheel locations
+    :param upgrade: whether to upgrade installed dependencies
+    :type python: str
+    :type srcdirs: list
+    :type extras: str
+    :type cache_dir: str
+    :type find_links: list
+    :type upgrade: bool
+
+    :return: command arguments
+    :rtype: list
+    """
+    args = [python, '-m', 'pip', 'install']
+    if cache_dir:
+        args.extend(['--cache-dir', cache_dir])
+    for link in find_links:
+        args.extend(['--find-links', link])
+    if upgrade:
+        args.append('--upgrade')
+    for srcdir in srcdirs:
+        args.extend(['--editable', '{0}[{1}]'.format(srcdir, extras)
+                     if extras else srcdir])
+    return args
+
+
+def parse_installed(line):
+    """Return distributions listed by the pip success line.
+
+    :param line: output line such as ``Successfully installed a-1.0 b-2.0``
+    :type line: str
+
+    :return: distribution names with versions, empty for other lines
+    :rtype: list
+    """
+    if not line.startswith(SUCCESS_MARKER):
+        return []
+    return line[len(SUCCESS_MARKER):].split()
+
+
+def run_install(args, cwd=None, callback=None):
+    """Run pip and time its resolution and installation phases.
+
+    The resolution, including the download and build of the distributions,
+    ends when pip reports the packages it installs.
+
+    :param args: command arguments, see get_install_args()
+    :param cwd: working directory [default=current working directory]
+    :param callback: function called with every output line
+    :type args: list
+    :type cwd: str
+    :type callback: callable
+
+    :return: dictionary with ``exit_code``, ``resolve_time``,
+             ``install_time``, ``installed`` and ``output`` keys, the times
+             in seconds
+    :rtype: dict
+    """
+    start = time.time()
+    resolved = None
+    installed = []
+    output = []
+    process = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT,
+                               universal_newlines=True)
+    with process.stdout:
+        for line in process.stdout:
+            line = line.rstrip('\n')
+            if resolved is None and line.startswith(INSTALL_MARKER):
+                resolved = time.time()
+            installed.extend(parse_installed(line))
+            output.append(line)
+            if callback:
+                callback(line)
+    exit_code = process.wait()
+    end = time.time()
+    if resolved is None:
+        resolved = end
+    return {
+        'exit_code': exit_code,
+        'resolve_time': resolved - start,
+        'install_time': end - resolved,
+        'installed': installed,
+        'output': output,
+    }
+
+
+def get_installed_components(installed, components):
+    """Return components among the installed distributions.
+
+    :param installed: distribution names with versions, see
+                      parse_installed()
+    :param components: standard component names
+    :type installed: list
+    :type components: list
+
+    :return: installed components in the given order
+    :rtype: list
+    """
+    names = set()
+    for distribution in installed:
+        name = re.sub(r'-[^-]+$', '', distribution)
+        names.add(re.sub(r'[-_.]+', '-', name).lower())
+    return [component for component in components if component in names]
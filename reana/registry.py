@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Registry of REANA components, their short names and groups."""
+
+import bisect
+import configparser
+import fnmatch
+import re
+
+CONFIG_FILENAME = '.reana.cfg'
+
+DEFAULT_GROUPS = {
+    'DEMOS': ['reana-demo-*'],
+    'ENGINES': ['reana-workflow-engine-*'],
+    'ENVS': ['reana-env-*'],
+}
+
+
+class ComponentNameError(Exception):
+    """Component name is unknown or ambiguous."""
+
+
+def shorten_component_name(component):
+    """Return canonical short version of the component name.
+
+    Example: reana-job-controller -> r-j-controller
+
+    :param component: standard component name
+    :type component: str
+
+    :return: short component name
+    :rtype: str
+    """
+    short_name = ''
+    parts = component.split('-')
+    for part in parts[:-1]:
+        short_name += part[0] + '-'
+    short_name += parts[-1]
+    return short_name
+
+
+def load_registry_config(path):
+    """Return additional components and groups defined in the config file.
+
+    Example of the configuration file:
+
+    .. code-block:: ini
+
+        [components]
+        extra = reana-demo-foo reana-env-bar
+
+        [groups]
+        CORE = reana-server reana-workflow-controller
+        ENGINES = r-w-engine-*
+
+    Group members may be component names, short names, glob patterns or
+    other group names.
+
+    :param path: configuration file path
+    :type path: str
+
+    :return: list of additional component names and mapping of group names
+             to member lists
+    :rtype: tuple
+    """
+    parser = configparser.ConfigParser()
+    parser.optionxform = str
+    parser.read(path)
+    components = []
+    if parser.has_section('components'):
+        for value in parser['components'].values():
+            components.extend(re.split(r'[\s,]+', value.strip()))
+    groups = {}
+    if parser.has_section('groups'):
+        for name, value in parser['groups'].items():
+            groups[name.upper()] = [member for member in
+                                    re.split(r'[\s,]+', value.strip())
+                                    if member]
+    return [component for component in components if component], groups
+
+
+def load_config_section(path, section):
+    """Return entries of a section of the config file keyed by components.
+
+    Example of the configuration file:
+
+    .. code-block:: ini
+
+        [sparse-checkout]
+        DEMOS = /* !/data/
+        reana-demo-atlas-recast = /* !/data/ !/docs/
+
+        [image-budgets]
+        ALL = 1g
+        reana-message-broker = 300m
+
+        [context-budgets]
+        DEMOS = 20m
+
+    :param path: configuration file path
+    :param section: section name
+    :type path: str
+    :type section: str
+
+    :return: list of (name, value) tuples in the order of the file, where
+             the name may be a component name, short name, glob pattern or
+             group name
+    :rtype: list
+    """
+    parser = configparser.ConfigParser()
+    parser.optionxform = str
+    parser.read(path)
+    if not parser.has_section(section):
+        return []
+    return [(name, value.strip()) for name, value in parser[section].items()]
+
+
+class ComponentRegistry(object):
+    """Resolve component names, short names, prefixes, patterns and groups.
+
+    All lookup tables are built once, so that resolving an exact name or
+    short name takes constant time and resolving a prefix logarithmic time
+    regardless of the number of components.
+    """
+
+    def __init__(self, components, groups=None):
+        """Build the lookup tables.
+
+        :param components: standard component names
+        :param groups: mapping of group names to member lists
+        :type components: list
+        :type groups: dict
+        """
+        self.components = []
+        self.positions = {}
+        for component in components:
+            if component not in self.positions:
+                self.positions[component] = len(self.components)
+                self.components.append(component)
+        self.short_names = {}
+        self.standard_names = {}
+        for component in self.components:
+            short_name = shorten_component_name(component)
+            self.short_names[component] = short_name
+            self.standard_names.setdefault(short_name, []).append(component)
+        self.sorted_names = sorted(self.components)
+        self.sorted_short_names = sorted(self.standard_names)
+        self.groups = {'ALL': list(self.components)}
+        for name, members in (groups or {}).items():
+            self.groups[name.upper()] = list(members)
+        self._resolved_groups = {}
+
+    def __contains__(self, component):
+        """Return whether the standard component name is known."""
+        return component in self.positions
+
+    def find_standard_name(self, short_name):
+        """Return standard component name corresponding to the short name.
+
+        :param short_name: short component name
+        :type short_name: str
+
+        :return: standard component name
+        :rtype: str
+
+        :raise: ComponentNameError in case it cannot be uniquely mapped
+        """
+        components = self.standard_names.get(short_name, [])
+        if len(components) == 1:
+            return components[0]
+        raise ComponentNameError(
+            'Component name {0} cannot be uniquely mapped.'.format(
+                short_name))
+
+    def resolve(self, name):
+        """Return standard component names matching the given value.
+
+        :param name: standard name, short name, group name, glob pattern
+                     such as ``r-w-engine-*``, unique prefix of a standard
+                     or short name, or unique abbreviation such as
+                     ``r-w-engine-c`` where every part is a prefix of the
+                     corresponding part of the standard name
+        :type name: str
+
+        :return: matching standard component names in registry order
+        :rtype: list
+
+        :raise: ComponentNameError if nothing or more than one component
+                matches a name or a prefix
+        """
+        if name in self.positions:
+            return [name]
+        if name in self.standard_names:
+            return [self.find_standard_name(name)]
+        if name.upper() in self.groups:
+            return self.resolve_group(name.upper())
+        if any(char in name for char in '*?['):
+            matches = [component for component in self.components
+                       if fnmatch.fnmatchcase(component, name) or
+                       fnmatch.fnmatchcase(self.short_names[component],
+                                           name) or
+                       self._matches_abbreviation(component, name)]
+            if not matches:
+                raise ComponentNameError(
+                    'No component matches {0}.'.format(name))
+            return matches
+        matches = set(self._find_prefix(self.sorted_names, name))
+        for short_name in self._find_prefix(self.sorted_short_names, name):
+            matches.update(self.standard_names[short_name])
+        if not matches:
+            matches = set(component for component in self.components
+                          if self._matches_abbreviation(component, name))
+        if len(matches) == 1:
+            return list(matches)
+        if matches:
+            raise ComponentNameError(
+                'Ambiguous component name {0} matches {1}.'.format(
+                    name, ', '.join(self.sort(matches))))
+        raise ComponentNameError('Unknown component {0}.'.format(name))
+
+    def resolve_group(self, group, _seen=()):
+        """Return standard component names of the group.
+
+        :param group: upper-case group name
+        :type group: str
+
+        :return: standard component names in registry order
+        :rtype: list
+
+        :raise: ComponentNameError in case of unknown members or circular
+                group definitions
+        """
+        if group in self._resolved_groups:
+            return list(self._resolved_groups[group])
+        if group in _seen:
+            raise ComponentNameError(
+                'Group {0} includes itself.'.format(group))
+        output = set()
+        for member in self.groups[group]:
+            if member.upper() in self.groups and member not in self:
+                output.update(self.resolve_group(member.upper(),
+                                                 _seen + (group, )))
+            else:
+                output.update(self.resolve(member))
+        self._resolved_groups[group] = self.sort(output)
+        return list(self._resolved_groups[group])
+
+    def sort(self, components):
+        """Return component names in registry order, unknown ones last."""
+        return sorted(components, key=lambda component: (
+            self.positions.get(component, len(self.positions)), component))
+
+    @staticmethod
+    def _matches_abbreviation(component, name):
+        """Return whether every name part is a prefix of the component part.
+
+        Example: r-w-engine-c matches reana-workflow-engine-cwl
+        """
+        parts = component.split('-')
+        name_parts = name.split('-')
+        return len(parts) == len(name_parts) and all(
+            fnmatch.fnmatchcase(part, name_part + '*')
+            for part, name_part in zip(parts, name_parts))
+
+    @staticmethod
+    def _find_prefix(sorted_names, prefix):
+        """Return names of the sorted list starting with the prefix."""
+        start = bisect.bisect_left(sorted_names, prefix)
+        end = start
+        while end < len(sorted_names) and \
+                sorted_names[end].startswith(prefix):
+            end += 1
+        return sorted_names[start:end]
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Asynchronous command runner for driving many REANA components at once.
+
+Running two commands in two components:
+
+.. code-block:: python
+
+    from reana.runner import run_components, run_sync
+
+    results = run_sync(run_components(
+        ['git fetch upstream', 'git status --short'],
+        ['reana-server', 'reana-workflow-controller'],
+        cwd=lambda component: '/src/' + component,
+        limit=8))
+    for component, component_results in results.items():
+        for result in component_results:
+            print(component, result.cmd, result.returncode, result.duration)
+
+The ``reana`` commands run every shell command through this runner too,
+see ``reana.history.run_recorded()``, so that exit statuses, signals and
+peak memory use are reported the same way. Contrary to
+``reana.cli.run_command()``, the runner never changes the working directory
+of the process and never exits on failures.
+
+Commands are started with ``subprocess.Popen`` rather than asyncio
+subprocesses, because only ``os.wait4()`` reports the peak memory use of
+each command. The output is read by the event loop, while the blocking
+``wait4()`` call runs in a thread of an executor that has one thread per
+command running at the same time, so that waiting never delays other
+commands nor their timeouts.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import signal
+import subprocess
+import sys
+import time
+
+DEFAULT_LIMIT = 16
+
+STREAM_LIMIT = 2 ** 24
+
+
+class CommandResult(object):
+    """Outcome of one command run."""
+
+    def __init__(self, cmd, cwd=None, component=''):
+        """Initialise the result of a command that is about to start.
+
+        :param cmd: command run, either a shell command string or an
+                    argument list
+        :param cwd: working directory of the command
+        :param component: standard component name the command concerns
+        :type cmd: str or list
+        :type cwd: str
+        :type component: str
+        """
+        self.cmd = cmd
+        self.cwd = cwd
+        self.component = component
+        self.returncode = None
+        self.start = None
+        self.duration = None
+        self.max_rss = None
+        self.timed_out = False
+        self.output = []
+
+    @property
+    def ok(self):
+        """Return whether the command succeeded."""
+        return self.returncode == 0
+
+    @property
+    def exit_code(self):
+        """Return shell-style exit status, negative signals mapped to 128+N."""
+        return get_exit_code(self.returncode)
+
+    @property
+    def stdout(self):
+        """Return captured standard output."""
+        return ''.join(line for stream, line in self.output
+                       if stream == 'stdout')
+
+    @property
+    def stderr(self):
+        """Return captured standard error output."""
+        return ''.join(line for stream, line in self.output
+                       if stream == 'stderr')
+
+    def __repr__(self):
+        """Return short description of the result."""
+        return '<CommandResult {0!r} component={1!r} returncode={2!r}' \
+            ' duration={3!r}>'.format(self.cmd, self.component,
+                                      self.returncode, self.duration)
+
+
+def get_exit_code(returncode):
+    """Return exit code to report for the command exit status.
+
+    :param returncode: exit status, negative signal number if the command
+                       was killed by a signal, see CommandResult
+    :type returncode: int
+
+    :return: the exit status, or 128 plus the signal number as in shells
+    :rtype: int
+    """
+    return 128 - returncode if returncode < 0 else returncode
+
+
+def _get_exit_status(status):
+    """Return exit code of the wait status, negative signal if killed."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _wait(process):
+    """Wait for the process, return its exit status and peak RSS in bytes."""
+    try:
+        _, status, usage = os.wait4(process.pid, 0)
+    except (AttributeError, ChildProcessError):
+        return process.wait(), None
+    process.returncode = _get_exit_status(status)
+    return process.returncode, usage.ru_maxrss * (
+        1 if sys.platform == 'darwin' else 1024)
+
+
+async def _read_lines(pipe, name, result, on_line):
+    """Capture lines of the pipe and pass them to the callback."""
+    stream = asyncio.StreamReader(limit=STREAM_LIMIT)
+    transport, _ = await asyncio.get_event_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(stream), pipe)
+    try:
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            text = line.decode('utf-8', 'replace')
+            result.output.append((name, text))
+            if on_line is not None:
+                on_line(result, name, text)
+    finally:
+        transport.close()
+
+
+async def run_command(cmd, cwd=None, component='', env=None, on_line=None,
+                      timeout=None, capture=True, executor=None):
+    """Run the command and capture its output line by line.
+
+    The exit status and peak memory use are obtained with ``wait4()``, so
+    that they match what ``reana stats`` records for every command.
+
+    :param cmd: shell command string, or argument list run without shell
+    :param cwd: working directory [default=current working directory]
+    :param component: standard component name recorded in the result
+    :param env: environment variables to add to the inherited environment
+    :param on_line: callable receiving the result, the stream name
+                    (``stdout`` or ``stderr``) and each output line as soon
+                    as it is produced
+    :param timeout: seconds after which the command and its children are
+                    killed
+    :param capture: whether to capture the output; otherwise the command
+                    shares the standard streams of the calling process
+    :param executor: executor waiting for the command to finish, which must
+                     have a free thread [default=new one-thread executor]
+    :type cmd: str or list
+    :type cwd: str
+    :type component: str
+    :type env: dict
+    :type on_line: callable
+    :type timeout: float
+    :type capture: bool
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :return: result of the command
+    :rtype: CommandResult
+    """
+    result = CommandResult(cmd, cwd, component)
+    process_env = None
+    if env:
+        process_env = dict(os.environ)
+        process_env.update(env)
+    pipe = subprocess.PIPE if capture else None
+    loop = asyncio.get_event_loop()
+    result.start = time.time()
+    process = subprocess.Popen(
+        cmd, shell=isinstance(cmd, str), cwd=cwd, env=process_env,
+        stdin=subprocess.DEVNULL if capture else None, stdout=pipe,
+        stderr=pipe, start_new_session=timeout is not None)
+    own_executor = executor is None
+    if own_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    waiter = loop.run_in_executor(executor, _wait, process)
+    readers = asyncio.gather(
+        _read_lines(process.stdout, 'stdout', result, on_line),
+        _read_lines(process.stderr, 'stderr', result, on_line)) \
+        if capture else asyncio.shield(waiter)
+    try:
+        await asyncio.wait_for(asyncio.shield(readers), timeout)
+    except asyncio.TimeoutError:
+        result.timed_out = True
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            process.kill()
+        await readers
+    try:
+        result.returncode, result.max_rss = await waiter
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
+    result.duration = time.time() - result.start
+    return result
+
+
+async def run_commands(cmds, cwd=None, component='', stop_on_error=True,
+                       **kwargs):
+    """Run the commands one after another.
+
+    :param cmds: commands, see run_command()
+    :param cwd: working directory
+    :param component: standard component name recorded in the results
+    :param stop_on_error: whether to skip the remaining commands after a
+                          failure [default=True]
+    :param kwargs: other run_command() arguments
+    :type cmds: list
+    :type cwd: str
+    :type component: str
+    :type stop_on_error: bool
+
+    :return: results of the commands that were run
+    :rtype: list
+    """
+    results = []
+    for cmd in cmds:
+        result = await run_command(cmd, cwd=cwd, component=component,
+                                   **kwargs)
+        results.append(result)
+        if stop_on_error and not result.ok:
+            break
+    return results
+
+
+async def run_components(cmds, components, cwd, limit=DEFAULT_LIMIT,
+                         **kwargs):
+    """Run the commands for every component concurrently.
+
+    :param cmds: commands to run one after another in each component, see
+                 run_command()
+    :param components: standard component names
+    :param cwd: callable returning the working directory of a component,
+                such as ``reana.cli.get_srcdir``
+    :param limit: maximum number of components processed at the same time
+    :param kwargs: other run_commands() arguments
+    :type cmds: list
+    :type components: list
+    :type cwd: callable
+    :type limit: int
+
+    :return: mapping of component names to lists of results
+    :rtype: dict
+    """
+    limit = max(1, limit)
+    semaphore = asyncio.Semaphore(limit)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=limit)
+
+    async def run_component(component):
+        async with semaphore:
+            return await run_commands(cmds, cwd=cwd(component),
+                                      component=component,
+                                      executor=executor, **kwargs)
+
+    try:
+        results = await asyncio.gather(*[run_component(component)
+                                         for component in components])
+    finally:
+        executor.shutdown(wait=False)
+    return dict(zip(components, results))
+
+
+def run_sync(coroutine):
+    """Run the coroutine in a new event loop and return its result.
+
+    Safe to call from several threads at the same time, each call getting
+    its own event loop.
+
+    :param coroutine: coroutine such as run_components(...)
+
+    :return: the coroutine result
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        if hasattr(loop, 'shutdown_default_executor'):
+            loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""JSON state files kept by REANA commands between runs."""
+
+import json
+import os
+import tempfile
+
+
+def load_state(path):
+    """Return state recorded in the given JSON file.
+
+    :param path: state file path
+    :type path: str
+
+    :return: recorded mapping; empty if the file is missing or unreadable
+    :rtype: dict
+    """
+    try:
+        with open(path) as fdesc:
+            state = json.load(fdesc)
+    except (IOError, OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(path, state):
+    """Atomically write the state to the given JSON file.
+
+    :param path: state file path
+    :param state: mapping to record
+    :type path: str
+    :type state: dict
+    """
+    fdesc, tmppath = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                      prefix=os.path.basename(path))
+    with os.fdopen(fdesc, 'w') as tmpfile:
+        json.dump(state, tmpfile, indent=2, sort_keys=True)
+    os.replace(tmppath, path)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Incremental synchronisation of REANA source code into running services."""
+
+import hashlib
+import os
+import posixpath
+import shutil
+import subprocess
+import tarfile
+
+from reana.build import get_tracked_files
+
+SYNC_STATE_FILENAME = '.reana-sync-state.json'
+
+DEFAULT_CONTAINER_DIR = '/code'
+
+KUBERNETES_PAUSE_PREFIX = 'k8s_POD_'
+
+
+class SyncError(Exception):
+    """Files cannot be transferred to the target."""
+
+
+def hash_file(path):
+    """Return SHA-256 digest of the file content, or of the link target.
+
+    :param path: file path
+    :type path: str
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    if os.path.islink(path):
+        digest.update(os.fsencode(os.readlink(path)))
+    else:
+        with open(path, 'rb') as fdesc:
+            for chunk in iter(lambda: fdesc.read(1024 * 1024), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_changes(srcdir, previous):
+    """Return tracked files whose content changed since the last sync.
+
+    Files whose size and modification time did not change since the last
+    sync are not read again.
+
+    :param srcdir: component source code directory
+    :param previous: state of the last sync, mapping relative paths to
+                     ``[size, mtime_ns, sha256]`` lists
+    :type srcdir: str
+    :type previous: dict
+
+    :return: new state, sorted paths of the files to copy and sorted paths
+             of the files to remove
+    :rtype: tuple
+    """
+    state = {}
+    changed = []
+    for path in get_tracked_files(srcdir):
+        fullpath = os.path.join(srcdir, path)
+        try:
+            file_stat = os.lstat(fullpath)
+        except OSError:
+            continue  # deleted but not yet committed
+        entry = previous.get(path)
+        if entry and entry[:2] == [file_stat.st_size, file_stat.st_mtime_ns]:
+            state[path] = entry
+            continue
+        try:
+            sha = hash_file(fullpath)
+        except (IOError, OSError):
+            if entry:
+                state[path] = entry  # unreadable for now, not removed
+            continue
+        state[path] = [file_stat.st_size, file_stat.st_mtime_ns, sha]
+        if not entry or entry[2] != sha:
+            changed.append(path)
+    removed = sorted(set(previous) - set(state))
+    return state, sorted(changed), removed
+
+
+class LocalTransport(object):
+    """Copy files into a local directory, e.g. one mounted into a pod."""
+
+    def __init__(self, target):
+        """Initialise the transport.
+
+        :param target: destination directory
+        :type target: str
+        """
+        self.directory = target
+
+    def copy(self, srcdir, paths):
+        """Copy the files, given relative to the source directory."""
+        for path in paths:
+            destination = os.path.join(self.directory, path)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if os.path.islink(destination):
+                os.remove(destination)
+            shutil.copy2(os.path.join(srcdir, path), destination,
+                         follow_symlinks=False)
+
+    def remove(self, paths):
+        """Remove the files, given relative to the destination directory."""
+        for path in paths:
+            try:
+                os.remove(os.path.join(self.directory, path))
+            except FileNotFoundError:
+                pass
+
+    def reload(self, signal_name):
+        """Signal the service to reload the code."""
+        raise SyncError('Reloading is not supported by the local transport.')
+
+
+class DockerTransport(object):
+    """Copy files into a running container through ``docker cp``."""
+
+    def __init__(self, target):
+        """Initialise the transport.
+
+        :param target: ``CONTAINER[:DIRECTORY]``, where the container may be
+                       given by a unique part of its name, e.g. ``server``
+                       for ``k8s_server_server-6b9c...``
+                       [default directory=/code]
+        :type target: str
+        """
+        name, _, directory = target.partition(':')
+        self.container = self.find_container(name)
+        self.directory = directory or DEFAULT_CONTAINER_DIR
+
+    @staticmethod
+    def find_container(name):
+        """Return full name of the running container matching the name.
+
+        The Kubernetes pause containers holding the pod namespaces, named
+        ``k8s_POD_...``, are left out since their names contain the pod
+        name too.
+
+        :raise: SyncError if no or several containers match
+        """
+        try:
+            output = subprocess.check_output(
+                ['docker', 'ps', '--filter', 'name={0}'.format(name),
+                 '--format', '{{.Names}}'], universal_newlines=True,
+                stderr=subprocess.STDOUT)
+        except (OSError, subprocess.CalledProcessError) as err:
+            raise SyncError('Cannot list containers: {0}'.format(
+                getattr(err, 'output', None) or err))
+        names = [container for container in output.split()
+                 if not container.startswith(KUBERNETES_PAUSE_PREFIX)]
+        if name in names:
+            return name
+        if len(names) != 1:
+            raise SyncError('{0} running containers match {1}{2}'.format(
+                len(names), name,
+                ': ' + ', '.join(sorted(names)) + '.' if names else '.'))
+        return names[0]
+
+    def copy(self, srcdir, paths):
+        """Copy the files, given relative to the source directory.
+
+        All files are sent as one tar stream to a single ``docker cp``.
+        """
+        if not paths:
+            return
+        process = subprocess.Popen(
+            ['docker', 'cp', '-', '{0}:{1}'.format(self.container,
+                                                   self.directory)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT)
+        try:
+            with tarfile.open(fileobj=process.stdin, mode='w|') as archive:
+                for path in paths:
+                    archive.add(os.path.join(srcdir, path), arcname=path,
+                                recursive=False)
+        except BrokenPipeError:
+            pass
+        finally:
+            process.stdin.close()
+        output = process.stdout.read()
+        if process.wait():
+            raise SyncError('docker cp failed: {0}'.format(
+                output.decode('utf-8', 'replace').strip()))
+
+    def _run(self, args):
+        """Run the docker command, raising SyncError on failure."""
+        try:
+            subprocess.check_output(['docker'] + args,
+                                    stderr=subprocess.STDOUT)
+        except (OSError, subprocess.CalledProcessError) as err:
+            raise SyncError('docker {0} failed: {1}'.format(
+                args[0], getattr(err, 'output', b'').decode(
+                    'utf-8', 'replace').strip() or err))
+
+    def remove(self, paths):
+        """Remove the files, given relative to the destination directory."""
+        if paths:
+            self._run(['exec', self.container, 'rm', '-f', '--'] +
+                      [posixpath.join(self.directory, path)
+                       for path in paths])
+
+    def reload(self, signal_name):
+        """Send the signal to the main process of the container."""
+        self._run(['kill', '--signal', signal_name, self.container])
+
+
+TRANSPORTS = {
+    'docker': DockerTransport,
+    'local': LocalTransport,
+}
+
+
+def get_transport(name, target):
+    """Return the transport of the given name.
+
+    :param name: transport name, see ``TRANSPORTS``
+    :param target: transport specific destination
+    :type name: str
+    :type target: str
+
+    :return: transport instance with ``copy``, ``remove`` and ``reload``
+             methods
+    :rtype: object
+
+    :raise: SyncError if the transport cannot be set up
+    """
+    return TRANSPORTS[name](target)
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Watching REANA source code trees for changes.
+
+On Linux, changes are reported by inotify through ``ctypes``, so that no
+additional dependency is needed. Elsewhere, or when inotify is not
+available, the trees are polled. Paths ignored by Git are skipped, as are
+the outputs of test runs, so that running the tests after a rebuild does
+not trigger the next one.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import os
+import select
+import struct
+import subprocess
+import time
+
+from reana.clean import SKIP_DIRS, is_clean_target
+
+DEFAULT_DEBOUNCE = 1.0
+
+POLL_INTERVAL = 1.0
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | \
+    IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+EVENT_HEADER = struct.Struct('iIII')
+
+WATCH_IGNORE_PATTERNS = [
+    '.cache',
+    '.coverage',
+    '.coverage.*',
+    '.pytest_cache',
+    '.tox',
+    'coverage.xml',
+    'htmlcov',
+]
+# test and coverage outputs, ignored even if missing from .gitignore
+
+GITIGNORE_FILENAME = '.gitignore'
+
+
+def is_ignored(path, is_dir):
+    """Return whether changes of the path are ignored.
+
+    Git metadata, test and coverage outputs such as ``.coverage`` or
+    ``.pytest_cache``, and everything ``reana git-clean`` would remove, such
+    as compiled Python files or documentation builds, are ignored.
+
+    :param path: path relative to the component source directory, with
+                 ``/`` separators
+    :param is_dir: whether the path is a directory
+    :type path: str
+    :type is_dir: bool
+
+    :return: True if the change should not trigger a rebuild
+    :rtype: bool
+    """
+    parts = path.split('/')
+    if any(part in SKIP_DIRS for part in parts):
+        return True
+    if any(fnmatch.fnmatch(part, pattern) for part in parts
+           for pattern in WATCH_IGNORE_PATTERNS):
+        return True
+    for index in range(1, len(parts)):
+        if is_clean_target('/'.join(parts[:index]), True):
+            return True
+    return is_clean_target(path, is_dir)
+
+
+class GitIgnore(object):
+    """Paths of a source tree ignored by Git, asked once per path."""
+
+    def __init__(self, srcdir):
+        """Start with no known paths.
+
+        :param srcdir: component source directory
+        :type srcdir: str
+        """
+        self.srcdir = srcdir
+        self.known = {}
+
+    def filter(self, paths):
+        """Return the paths Git ignores.
+
+        Paths not seen before are checked by a single ``git check-ignore``
+        run. Tracked paths are never ignored, and nothing is ignored outside
+        of Git repositories or if Git is not available.
+
+        :param paths: paths relative to the source directory, with ``/``
+                      separators
+        :type paths: list
+
+        :return: ignored paths
+        :rtype: set
+        """
+        unknown = [path for path in paths if path not in self.known]
+        if unknown:
+            ignored = set()
+            try:
+                process = subprocess.Popen(
+                    ['git', 'check-ignore', '--stdin', '-z'],
+                    cwd=self.srcdir, stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                output = process.communicate(
+                    b''.join(os.fsencode(path) + b'\0' for path in unknown))[0]
+                # exit status 1 means that no path is ignored
+                if process.returncode == 0:
+                    ignored = set(os.fsdecode(output).split('\0'))
+            except OSError:
+                pass
+            for path in unknown:
+                self.known[path] = path in ignored
+        return {path for path in paths if self.known[path]}
+
+    def changed(self, paths):
+        """Forget the known paths if any of the changed paths is .gitignore.
+
+        :param paths: changed paths relative to the source directory
+        :type paths: iterable
+        """
+        if any(path.rsplit('/', 1)[-1] == GITIGNORE_FILENAME
+               for path in paths):
+            self.known.clear()
+
+
+def _walk(srcdir, gitignore, relative_dir=''):
+    """Yield relative paths and directory entries of the non-ignored tree."""
+    try:
+        entries = list(os.scandir(os.path.join(srcdir, relative_dir)))
+    except OSError:
+        return
+    candidates = []
+    for entry in entries:
+        path = relative_dir + entry.name
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if not is_ignored(path, is_dir):
+            candidates.append((path, entry, is_dir))
+    ignored = gitignore.filter([path for path, _, _ in candidates])
+    for path, entry, is_dir in candidates:
+        if path in ignored:
+            continue
+        yield path, entry, is_dir
+        if is_dir:
+            for item in _walk(srcdir, gitignore, path + '/'):
+                yield item
+
+
+class InotifyWatcher(object):
+    """Report changes of the component source trees using inotify."""
+
+    def __init__(self, srcdirs):
+        """Start watching every non-ignored directory of the trees.
+
+        :param srcdirs: mapping of standard component names to their source
+                        directories
+        :type srcdirs: dict
+
+        :raise: OSError if inotify is not available or the limit of watches
+                was reached
+        """
+        self.srcdirs = srcdirs
+        self.gitignores = {component: GitIgnore(srcdir)
+                           for component, srcdir in srcdirs.items()}
+        self.watches = {}
+        library = ctypes.util.find_library('c')
+        if not library:
+            raise OSError(errno.ENOSYS, 'C library not found.')
+        self.libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available.')
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        try:
+            for component, srcdir in srcdirs.items():
+                self._add_tree(component, '')
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, component, relative_dir):
+        """Watch the directory, relative to the component source tree."""
+        path = os.path.join(self.srcdirs[component], relative_dir)
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path),
+                                         WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code == errno.ENOSPC:
+                raise OSError(code, 'Limit of inotify watches reached, see '
+                                    'fs.inotify.max_user_watches.')
+            if code not in (errno.ENOENT, errno.ENOTDIR):
+                raise OSError(code, os.strerror(code))
+            return
+        self.watches[wd] = (component, relative_dir)
+
+    def _add_tree(self, component, relative_dir):
+        """Watch the directory and all its non-ignored subdirectories.
+
+        :return: relative paths found in the tree, which may have been
+                 created before the watches were added
+        :rtype: list
+        """
+        self._add_watch(component, relative_dir)
+        paths = []
+        for path, _, is_dir in _walk(self.srcdirs[component],
+                                     self.gitignores[component],
+                                     relative_dir):
+            if is_dir:
+                self._add_watch(component, path + '/')
+            paths.append(path)
+        return paths
+
+    def read(self, timeout=None):
+        """Return changes reported within the timeout.
+
+        :param timeout: seconds to wait for the first change [default=wait
+                        indefinitely]
+        :type timeout: float
+
+        :return: set of (component, relative path) tuples, empty if nothing
+                 changed; on event queue overflow, the path is empty
+        :rtype: set
+        """
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        data = os.read(self.fd, 65536)
+        changes = set()
+        events = []
+        position = 0
+        while position + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, position)
+            position += EVENT_HEADER.size
+            name = os.fsdecode(data[position:position + length].rstrip(b'\0'))
+            position += length
+            if mask & IN_Q_OVERFLOW:
+                changes.update((component, '') for component in self.srcdirs)
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            if wd not in self.watches:
+                continue
+            component, relative_dir = self.watches[wd]
+            path = relative_dir + name
+            is_dir = bool(mask & IN_ISDIR)
+            if not is_ignored(path, is_dir):
+                events.append((component, path, is_dir, mask))
+        ignored = set()
+        for component, gitignore in self.gitignores.items():
+            paths = [path for event_component, path, _, _ in events
+                     if event_component == component]
+            gitignore.changed(paths)
+            ignored.update((component, path)
+                           for path in gitignore.filter(paths))
+        for component, path, is_dir, mask in events:
+            if (component, path) in ignored:
+                continue
+            if is_dir and mask & (IN_CREATE | IN_MOVED_TO):
+                changes.update((component, created) for created in
+                               self._add_tree(component, path + '/'))
+            changes.add((component, path))
+        return changes
+
+    def close(self):
+        """Stop watching."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher(object):
+    """Report changes of the component source trees by polling them."""
+
+    def __init__(self, srcdirs, interval=POLL_INTERVAL):
+        """Take the first snapshot of the trees.
+
+        :param srcdirs: mapping of standard component names to their source
+                        directories
+        :param interval: seconds between two snapshots
+        :type srcdirs: dict
+        :type interval: float
+        """
+        self.srcdirs = srcdirs
+        self.interval = interval
+        self.gitignores = {component: GitIgnore(srcdir)
+                           for component, srcdir in srcdirs.items()}
+        self.snapshots = {component: self._snapshot(component)
+                          for component in srcdirs}
+
+    def _snapshot(self, component):
+        """Return modification times and sizes of the files of the tree."""
+        snapshot = {}
+        for path, entry, is_dir in _walk(self.srcdirs[component],
+                                         self.gitignores[component]):
+            if not is_dir:
+                try:
+                    file_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                snapshot[path] = (file_stat.st_mtime_ns, file_stat.st_size)
+        return snapshot
+
+    def read(self, timeout=None):
+        """Return changes found within the timeout, see InotifyWatcher."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0, deadline - time.time()))
+            time.sleep(delay)
+            changes = set()
+            for component in self.srcdirs:
+                snapshot = self._snapshot(component)
+                previous = self.snapshots[component]
+                changed = set(snapshot) ^ set(previous)
+                changed.update(path for path in snapshot
+                               if path in previous and
+                               snapshot[path] != previous[path])
+                self.gitignores[component].changed(changed)
+                changes.update((component, path) for path in changed)
+                self.snapshots[component] = snapshot
+            if changes or (deadline is not None and
+                           time.time() >= deadline):
+                return changes
+
+    def close(self):
+        """Stop watching."""
+
+
+def create_watcher(srcdirs, poll=False):
+    """Return inotify watcher, or polling watcher if inotify is unavailable.
+
+    :param srcdirs: mapping of standard component names to their source
+                    directories
+    :param poll: whether to poll even if inotify is available
+    :type srcdirs: dict
+    :type poll: bool
+
+    :return: watcher and the reason for polling, None if not polling
+    :rtype: tuple
+    """
+    if not poll:
+        try:
+            return InotifyWatcher(srcdirs), None
+        except (OSError, AttributeError) as err:
+            return PollingWatcher(srcdirs), str(err)
+    return PollingWatcher(srcdirs), None
+
+
+def wait_for_changes(watcher, debounce=DEFAULT_DEBOUNCE, timeout=None):
+    """Return changes once no new change arrived for the debounce period.
+
+    :param watcher: InotifyWatcher or PollingWatcher instance
+    :param debounce: quiet period in seconds ending a burst of changes
+    :param timeout: seconds to wait for the first change [default=wait
+                    indefinitely]
+    :type watcher: object
+    :type debounce: float
+    :type timeout: float
+
+    :return: mapping of standard component names to sorted lists of the
+             changed paths, empty if nothing changed within the timeout
+    :rtype: dict
+    """
+    changes = watcher.read(timeout)
+    if not changes:
+        return {}
+    while True:
+        more = watcher.read(debounce)
+        if not more:
+            break
+        changes.update(more)
+    result = {}
+    for component, path in changes:
+        result.setdefault(component, []).append(path)
+    return {component: sorted(paths) for component, paths in result.items()}
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""Shared wheelhouse of the Python dependencies of REANA component images.
+
+The wheels of the requirements of all components being built, and of the
+local sources of REANA libraries such as ``reana-commons`` they depend on,
+are built in one ``pip wheel`` run. The wheelhouse is exposed to the image
+builds as the ``wheelhouse`` named build context, and its path inside the
+build as the ``PIP_FIND_LINKS`` build argument, so that a Dockerfile can
+use it as follows:
+
+.. code-block:: docker
+
+    ARG PIP_FIND_LINKS
+    RUN --mount=type=bind,from=wheelhouse,target=/wheelhouse pip install .
+"""
+
+import glob
+import hashlib
+import os
+import re
+import shlex
+import shutil
+import subprocess
+
+from reana.build import get_build_context_hash
+
+WHEELHOUSE_MOUNT = '/wheelhouse'
+
+WHEELHOUSE_KEEP = 3
+
+REQUIREMENTS_FILENAME = 'requirements.txt'
+
+
+def get_requirement_files(srcdir):
+    """Return the ``requirements*.txt`` files of the component.
+
+    :param srcdir: component source code directory
+    :type srcdir: str
+
+    :return: sorted file paths
+    :rtype: list
+    """
+    return sorted(glob.glob(os.path.join(srcdir, 'requirements*.txt')))
+
+
+def _get_name_regex(name):
+    """Return regex matching the distribution name in requirement texts."""
+    return re.compile(r'(?<![\w.-])({0}|{1})(?![\w-])'.format(
+        re.escape(name), re.escape(name.replace('-', '_'))), re.IGNORECASE)
+
+
+def find_local_dependencies(srcdirs, libraries):
+    """Return local libraries required by the components.
+
+    A library is required when its name appears in the requirement files or
+    in ``setup.py`` of a component.
+
+    :param srcdirs: source directories of the components keyed by their
+                    standard names
+    :param libraries: source directories of local pip-installable components
+                      keyed by their standard names
+    :type srcdirs: dict
+    :type libraries: dict
+
+    :return: sorted names of the required libraries
+    :rtype: list
+    """
+    texts = []
+    for component, srcdir in srcdirs.items():
+        for path in get_requirement_files(srcdir) + [
+                os.path.join(srcdir, 'setup.py')]:
+            try:
+                with open(path) as fdesc:
+                    texts.append((component, fdesc.read()))
+            except (IOError, OSError):
+                pass
+    required = set()
+    for library in libraries:
+        regex = _get_name_regex(library)
+        if any(component != library and regex.search(text)
+               for component, text in texts):
+            required.add(library)
+    return sorted(required)
+
+
+def read_requirements(paths, local_names=()):
+    """Return requirement lines of the files, leaving out local packages.
+
+    Editable and path requirements and the requirements of the local
+    libraries are left out, since the libraries are built from their local
+    sources. Paths of nested ``-r`` and ``-c`` files are made absolute.
+
+    :param paths: requirement file paths
+    :param local_names: names of the local libraries
+    :type paths: list
+    :type local_names: list
+
+    :return: requirement lines in the order of the files, without
+             duplicates
+    :rtype: list
+    """
+    regexes = [_get_name_regex(name) for name in local_names]
+    lines = []
+    for path in paths:
+        with open(path) as fdesc:
+            content = fdesc.read()
+        for line in content.splitlines():
+            line = line.split(' #', 1)[0].strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith(('-e', '--editable', '.', '/', 'file:')):
+                continue
+            option = re.match(r'^(-r|-c|--requirement|--constraint)\s*=?\s*'
+                              r'(\S+)$', line)
+            if option:
+                line = '{0} {1}'.format(option.group(1), os.path.join(
+                    os.path.dirname(os.path.abspath(path)), option.group(2)))
+            elif any(regex.match(line) for regex in regexes):
+                continue
+            if line not in lines:
+                lines.append(line)
+    return lines
+
+
+def get_python_tag(python):
+    """Return implementation, version and platform of the interpreter."""
+    return subprocess.check_output(
+        [python, '-c', 'import platform, sys; print('
+                       'sys.implementation.name, platform.python_version(), '
+                       'platform.machine(), sys.platform)'],
+        universal_newlines=True).strip()
+
+
+def get_wheelhouse_key(requirements, library_srcdirs, python_tag):
+    """Return hash identifying the content of the wheelhouse.
+
+    :param requirements: requirement lines, see read_requirements()
+    :param library_srcdirs: source directories of the local libraries keyed
+                            by their names
+    :param python_tag: interpreter description, see get_python_tag()
+    :type requirements: list
+    :type library_srcdirs: dict
+    :type python_tag: str
+
+    :return: hexadecimal digest
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    digest.update('python\0{0}\0'.format(python_tag).encode('utf-8'))
+    for line in requirements:
+        digest.update('requirement\0{0}\0'.format(line).encode('utf-8'))
+        if line.startswith(('-r', '-c', '--requirement', '--constraint')):
+            try:
+                with open(line.split(None, 1)[1], 'rb') as fdesc:
+                    digest.update(fdesc.read())
+            except (IOError, OSError, IndexError):
+                pass
+    for name in sorted(library_srcdirs):
+        digest.update('library\0{0}\0{1}\0'.format(
+            name, get_build_context_hash(library_srcdirs[name], name))
+            .encode('utf-8'))
+    return digest.hexdigest()
+
+
+def get_wheel_command(python, wheel_dir, requirement_files=(),
+                      sources=()):
+    """Return shell command building the wheels into the directory.
+
+    :param python: Python interpreter running pip
+    :param wheel_dir: directory to write the wheels to, also used as
+                      find-links source so that existing wheels are reused
+    :param requirement_files: requirement file paths
+    :param sources: source directories of the local libraries
+    :type python: str
+    :type wheel_dir: str
+    :type requirement_files: list
+    :type sources: list
+
+    :return: shell command
+    :rtype: str
+    """
+    cmd = '{0} -m pip wheel --wheel-dir {1} --find-links {1}'.format(
+        shlex.quote(python), shlex.quote(wheel_dir))
+    for path in requirement_files:
+        cmd += ' -r {0}'.format(shlex.quote(path))
+    for source in sources:
+        cmd += ' {0}'.format(shlex.quote(source))
+    return cmd
+
+
+def prune_wheelhouses(root, keep=WHEELHOUSE_KEEP):
+    """Remove all but the most recently used wheelhouses.
+
+    :param root: directory holding one wheelhouse per key
+    :param keep: number of wheelhouses to keep
+    :type root: str
+    :type keep: int
+
+    :return: names of the removed wheelhouses
+    :rtype: list
+    """
+    entries = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isdir(path) and not name.startswith('.'):
+            entries.append((os.path.getmtime(path), name))
+    entries.sort(reverse=True)
+    removed = []
+    for _, name in entries[keep:]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+        removed.append(name)
+    return removed
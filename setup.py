@@ -60,7 +60,7 @@ for key, reqs in extras_require.items():
 
 
 install_requires = [
-    'click>=6.7',
+    'click>=7.0',
     'colorama>=0.3.9',
 ]
 
@@ -87,11 +87,11 @@ setup(
     author='REANA',
     author_email='info@reana.io',
     url='http://www.reana.io/',
-    packages=['reana'],
+    packages=['reana', 'reana.commands'],
     zip_safe=False,
     entry_points={
       'console_scripts': [
-          'reana = reana.cli:cli',
+          'reana = reana.client:main',
       ],
     },
     extras_require=extras_require,
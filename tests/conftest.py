@@ -24,4 +24,27 @@
 
 from __future__ import absolute_import, print_function
 
+import subprocess
+
 import pytest
+
+
+@pytest.fixture()
+def run_git():
+    """Return function running Git in a directory and returning its output."""
+    def run_git(srcdir, *args):
+        return subprocess.check_output(
+            ('git', '-c', 'user.name=REANA', '-c', 'user.email=info@reana.io')
+            + args, cwd=str(srcdir), universal_newlines=True).strip()
+    return run_git
+
+
+@pytest.fixture()
+def clear_cli_caches():
+    """Clear cached component registry and workspace index around test."""
+    from reana import cli
+    cli.get_component_registry.cache_clear()
+    cli.get_workspace_index.cache_clear()
+    yield
+    cli.get_component_registry.cache_clear()
+    cli.get_workspace_index.cache_clear()
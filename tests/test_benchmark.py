@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+
+"""REANA benchmark tests."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import os
+import subprocess
+
+
+def test_create_workspace(tmpdir):
+    """Tests for create_workspace()."""
+    from reana.benchmark import create_workspace
+    srcdir = create_workspace(str(tmpdir), 3, packages=2, modules=2)
+    assert sorted(os.listdir(srcdir)) == [
+        '.reana.cfg', 'reana-bench-0001', 'reana-bench-0002',
+        'reana-bench-0003']
+    component_dir = os.path.join(srcdir, 'reana-bench-0002')
+    url = subprocess.check_output(
+        ['git', 'config', 'remote.upstream.url'], cwd=component_dir,
+        universal_newlines=True).strip()
+    assert url == str(tmpdir.join('upstream', 'reana-bench-0002.git'))
+    assert subprocess.check_output(
+        ['git', 'rev-parse', 'master'], cwd=component_dir) == \
+        subprocess.check_output(['git', 'rev-parse', 'upstream/master'],
+                                cwd=component_dir)
+    assert os.path.exists(os.path.join(component_dir, 'package1',
+                                       'module1.py'))
+
+
+def test_run_benchmarks(tmpdir):
+    """Tests for run_benchmarks(), write_results() and compare_results()."""
+    from reana.benchmark import BENCHMARKS, compare_results, load_results, \
+        run_benchmarks, write_results
+    results = run_benchmarks(str(tmpdir.join('work')), [2], runs=2,
+                             packages=2, modules=2)
+    assert [(result['benchmark'], result['repos'], result['runs'])
+            for result in results] == [(benchmark, 2, 2)
+                                       for benchmark in BENCHMARKS]
+    for result in results:
+        assert 0 <= result['min'] <= result['median'] <= result['max']
+    path = str(tmpdir.join('results.json'))
+    write_results(path, results)
+    with open(path) as fdesc:
+        data = json.load(fdesc)
+    assert data['environment']['python']
+    baseline = load_results(path)
+    assert set(baseline) == set((benchmark, 2) for benchmark in BENCHMARKS)
+    slower = [dict(result, median=result['median'] * 2 + 1)
+              for result in results if result['benchmark'] == 'startup']
+    changes = compare_results(slower, baseline)
+    assert list(changes) == [('startup', 2)]
+    assert changes[('startup', 2)] > 0
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA build helper tests."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+import pytest
+
+
+def test_get_dockerfile_base_images(tmpdir):
+    """Tests for get_dockerfile_base_images()."""
+    from reana.build import get_dockerfile_base_images
+    dockerfile = tmpdir.join('Dockerfile')
+    dockerfile.write('FROM python:3.6 AS builder\n'
+                     'RUN pip wheel .\n'
+                     'from --platform=linux/amd64 reanahub/reana-commons\n'
+                     'FROM builder\n')
+    assert get_dockerfile_base_images(str(dockerfile)) == [
+        'python:3.6', 'reanahub/reana-commons']
+
+
+def test_get_image_repository():
+    """Tests for get_image_repository()."""
+    from reana.build import get_image_repository
+    for (input_value, output_expected) in (
+            ('python', 'python'),
+            ('reanahub/reana-commons:0.3.0', 'reanahub/reana-commons'),
+            ('localhost:5000/reana-server', 'localhost:5000/reana-server'),
+            ('reanahub/reana-server@sha256:abc', 'reanahub/reana-server'),
+    ):
+        assert get_image_repository(input_value) == output_expected
+
+
+def test_get_build_dependencies(tmpdir):
+    """Tests for get_build_dependencies()."""
+    from reana.build import get_build_dependencies
+    dockerfiles = {}
+    for component, base in (('reana-commons', 'python:3.6'),
+                            ('reana-server', 'reanahub/reana-commons:latest'),
+                            ('reana-ui', 'johndoe/reana-commons')):
+        dockerfiles[component] = str(tmpdir.join(component))
+        tmpdir.join(component).write('FROM {0}\n'.format(base))
+    dependencies = get_build_dependencies(sorted(dockerfiles), dockerfiles,
+                                          ['johndoe', 'reanahub'])
+    assert dependencies == {'reana-commons': set(),
+                            'reana-server': {'reana-commons'},
+                            'reana-ui': {'reana-commons'}}
+    assert get_build_dependencies(['reana-server'], dockerfiles,
+                                  ['reanahub']) == {'reana-server': set()}
+    assert get_build_dependencies(['reana-server'], dockerfiles,
+                                  ['reanahub'], sorted(dockerfiles)) == {
+        'reana-server': {'reana-commons'}}
+
+
+def test_get_build_waves():
+    """Tests for get_build_waves()."""
+    from reana.build import get_build_waves
+    assert get_build_waves({}) == []
+    assert get_build_waves({'a': set(), 'b': {'a'}, 'c': {'a', 'b'},
+                            'd': set()}) == [['a', 'd'], ['b'], ['c']]
+    with pytest.raises(Exception):
+        get_build_waves({'a': {'b'}, 'b': {'a'}})
+
+
+def test_get_critical_path():
+    """Tests for get_critical_path()."""
+    from reana.build import get_critical_path
+    dependencies = {'a': set(), 'b': {'a'}, 'c': set(), 'd': {'b', 'c'}}
+    durations = {'a': 1.0, 'b': 2.0, 'c': 5.0, 'd': 1.0}
+    assert get_critical_path(dependencies, durations) == (['c', 'd'], 6.0)
+    assert get_critical_path({}, {}) == ([], 0.0)
+
+
+def test_build_concurrency():
+    """Tests for parse_memory() and get_build_concurrency()."""
+    from reana.build import get_build_concurrency, parse_memory
+    assert parse_memory('512') == 512
+    assert parse_memory('2g') == 2 * 1024 ** 3
+    assert parse_memory('1.5GB') == int(1.5 * 1024 ** 3)
+    with pytest.raises(ValueError):
+        parse_memory('lots')
+    assert get_build_concurrency(8) == 8
+    assert get_build_concurrency(8, 2048, 5000) == 2
+    assert get_build_concurrency(8, 2048, 1000) == 1
+
+
+def test_get_build_context_hash(tmpdir):
+    """Tests for get_build_context_hash()."""
+    from reana.build import get_build_context_hash
+    tmpdir.join('Dockerfile').write('FROM python:3.6\n')
+    tmpdir.join('setup.py').write('print(1)\n')
+    srcdir = str(tmpdir)
+    image = 'reanahub/reana-server:latest'
+    initial = get_build_context_hash(srcdir, image)
+    assert initial == get_build_context_hash(srcdir, image)
+    assert initial != get_build_context_hash(srcdir, 'johndoe/reana-server')
+    assert initial != get_build_context_hash(srcdir, image, ['DEBUG=true'])
+    assert initial != get_build_context_hash(srcdir, image, [], ['abc'])
+    tmpdir.join('setup.py').write('print(2)\n')
+    assert initial != get_build_context_hash(srcdir, image)
+
+
+def test_prune_build_cache(tmpdir):
+    """Tests for prune_build_cache()."""
+    import os
+    from reana.build import get_directory_size, prune_build_cache
+    for number, name in enumerate(['reana-server', 'reana-commons',
+                                   'reana-job-controller']):
+        cache = tmpdir.mkdir(name)
+        cache.join('blob').write('x' * 1000)
+        os.utime(str(cache), (1000 + number, 1000 + number))
+    assert get_directory_size(str(tmpdir)) == 3000
+    assert prune_build_cache(str(tmpdir), 5000) == (3000, [])
+    assert prune_build_cache(str(tmpdir), 1500) == (1000, [
+        'reana-server', 'reana-commons'])
+    assert tmpdir.join('reana-job-controller').check()
+    assert prune_build_cache(str(tmpdir.join('missing')), 0) == (0, [])
+
+
+def test_parse_transfer_output():
+    """Tests for parse_transfer_output() and is_transient_error()."""
+    from reana.build import is_transient_error, parse_transfer_output
+    assert parse_transfer_output(
+        'latest: Pulling from reanahub/reana-server\n'
+        '0123456789ab: Already exists\n'
+        'abcdef012345: Pull complete\n'
+        'ffffffffffff: Mounted from library/python\n'
+        'eeeeeeeeeeee: Pushed\n') == (
+            {'abcdef012345', 'eeeeeeeeeeee'},
+            {'0123456789ab', 'ffffffffffff'})
+    assert is_transient_error('net/http: TLS handshake timeout')
+    assert is_transient_error('received unexpected HTTP status: 503')
+    assert not is_transient_error('manifest for reanahub/foo not found')
+    assert not is_transient_error('5020a1b2c3d4: Pull complete')
+
+
+def test_ensure_buildx_builder(tmpdir, monkeypatch):
+    """Tests for ensure_buildx_builder() against a fake Docker."""
+    from reana.build import ensure_buildx_builder
+    bindir = tmpdir.mkdir('bin')
+    docker = bindir.join('docker')
+    docker.write('''#!/bin/sh
+case "$2 $3" in
+    "inspect default") echo "Name: default"; echo "Driver: docker";;
+    "inspect reana") [ -e "$0.created" ] || exit 1
+                     echo "Name: reana"; echo "Driver: docker-container";;
+    "create --name") echo "$@" > "$0.created";;
+    *) exit 1;;
+esac
+''')
+    docker.chmod(0o755)
+    monkeypatch.setenv('PATH', str(bindir) + os.pathsep +
+                       os.environ['PATH'])
+    assert ensure_buildx_builder('default') == 'docker'
+    assert not bindir.join('docker.created').check()
+    assert ensure_buildx_builder('reana') == 'docker-container'
+    assert bindir.join('docker.created').read() == \
+        'buildx create --name reana --driver docker-container\n'
+    assert ensure_buildx_builder('broken') is None
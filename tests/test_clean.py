@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+
+"""REANA source tree cleaning tests."""
+
+from __future__ import absolute_import, print_function
+
+
+def test_is_clean_target():
+    """Tests for is_clean_target()."""
+    from reana.clean import is_clean_target
+    assert is_clean_target('reana_server/app.pyc', False)
+    assert not is_clean_target('reana_server/app.py', False)
+    assert is_clean_target('reana_server/__pycache__', True)
+    assert is_clean_target('reana_server.egg-info', True)
+    assert is_clean_target('.eggs', True)
+    assert is_clean_target('docs/_build', True)
+    assert is_clean_target('docs/api/_build', True)
+    assert not is_clean_target('_build', True)
+    assert not is_clean_target('docs/_build', False)
+
+
+def test_clean_tree(tmpdir):
+    """Tests for clean_tree()."""
+    from reana.clean import clean_tree
+    srcdir = tmpdir.mkdir('reana-server')
+    srcdir.join('setup.py').write('setup()\n')
+    srcdir.join('.git', 'objects', 'x.pyc').write('0', ensure=True)
+    srcdir.join('reana_server', 'app.py').write('app = 1\n', ensure=True)
+    srcdir.join('reana_server', 'app.pyc').write('0123', ensure=True)
+    srcdir.join('reana_server', '__pycache__', 'app.cpython-36.pyc').write(
+        '01234567', ensure=True)
+    srcdir.join('reana_server.egg-info', 'PKG-INFO').write('01', ensure=True)
+    srcdir.join('.eggs', 'pkg', 'x.py').write('0', ensure=True)
+    srcdir.join('docs', '_build', 'html', 'index.html').write(
+        '0', ensure=True)
+    srcdir.join('docs', 'index.rst').write('REANA\n', ensure=True)
+    assert clean_tree(str(srcdir), dry_run=True) == (5, 16, [])
+    assert srcdir.join('reana_server', 'app.pyc').check()
+    assert clean_tree(str(srcdir)) == (5, 16, [])
+    assert clean_tree(str(srcdir)) == (0, 0, [])
+    assert sorted(path.relto(srcdir) for path in srcdir.visit()
+                  if path.check(file=True)) == [
+        '.git/objects/x.pyc', 'docs/index.rst', 'reana_server/app.py',
+        'setup.py']
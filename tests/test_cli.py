@@ -25,6 +25,7 @@
 from __future__ import absolute_import, print_function
 
 import os
+import time
 
 
 def test_shorten_component_name():
@@ -94,3 +95,708 @@ def test_uniqueness_of_short_names():
         if short_name in short_names:
             raise Exception('Found ')
         short_names.append(short_name)
+
+
+def test_run_command_sequence(tmpdir):
+    """Tests for run_command_sequence()."""
+    from reana.cli import run_command_sequence
+    status, output = run_command_sequence(
+        ['echo hello', 'false', 'echo unreachable'], 'reana', str(tmpdir))
+    assert status == 1
+    assert 'hello' in output
+    assert 'unreachable' not in output
+    status, output = run_command_sequence(['pwd'], 'reana', str(tmpdir))
+    assert status == 0
+    assert output[-1] == str(tmpdir)
+
+
+def test_run_parallel(tmpdir, monkeypatch):
+    """Tests for run_parallel()."""
+    from reana import cli
+    monkeypatch.setattr(cli, 'SRCDIR', str(tmpdir))
+
+    def func(component):
+        return (3 if component == 'reana' else 0), [component]
+
+    assert cli.run_parallel(func, ['reana-server', 'reana-ui'], 2) == 0
+    assert cli.run_parallel(func, ['reana', 'reana-server'], 2) == 3
+
+
+def test_run_parallel_killed(tmpdir, monkeypatch):
+    """Test that components killed by a signal fail run_parallel()."""
+    from reana import cli
+    monkeypatch.setattr(cli, 'SRCDIR', str(tmpdir))
+
+    def func(component):
+        return cli.run_command_sequence(['kill -9 $$'], component,
+                                        str(tmpdir))
+
+    assert func('reana')[0] == -9
+    assert cli.run_parallel(func, ['reana'], 1) == 137
+    assert cli.run_parallel(lambda component: (-15, []),
+                            ['reana', 'reana-server'], 2) == 143
+
+
+def test_select_components_patterns():
+    """Tests for select_components() with groups, patterns and prefixes."""
+    from reana.cli import select_components
+    for (input_value, output_expected) in (
+            (['r-w-engine-*', ], ['reana-workflow-engine-cwl',
+                                  'reana-workflow-engine-serial',
+                                  'reana-workflow-engine-yadage']),
+            (['ENGINES', ], ['reana-workflow-engine-cwl',
+                             'reana-workflow-engine-serial',
+                             'reana-workflow-engine-yadage']),
+            (['envs', ], ['reana-env-aliphysics', 'reana-env-jupyter',
+                          'reana-env-root6']),
+            (['reana-demo-cms', ], ['reana-demo-cms-h4l', ]),
+            (['r-w-m', ], ['reana-workflow-monitor', ]),
+            # ambiguous prefix:
+            (['reana-workflow', ], []),
+    ):
+        assert select_components(input_value) == output_expected
+
+
+def test_lazy_commands():
+    """Test that lazy command table matches the command implementations."""
+    import click
+    from reana.cli import LAZY_COMMANDS, cli
+    ctx = click.Context(cli)
+    for name, (_, short_help) in LAZY_COMMANDS.items():
+        command = cli.get_command(ctx, name)
+        assert command.name == name
+        assert command.get_short_help_str(1000) == short_help
+
+
+def test_git_mirror(tmpdir, monkeypatch, run_git, clear_cli_caches):
+    """Tests for cloning and fetching from local mirrors."""
+    from click.testing import CliRunner
+    from reana import cli
+    from reana.commands import git
+    from reana.gitstatus import GitRepository
+
+    upstream = tmpdir.mkdir('upstream').mkdir('reana-server')
+    run_git(upstream, 'init', '-q')
+    run_git(upstream, 'checkout', '-q', '-b', 'master')
+    upstream.join('README.rst').write('REANA\n')
+    run_git(upstream, 'add', '-A')
+    run_git(upstream, 'commit', '-q', '-m', 'initial')
+    srcdir = tmpdir.mkdir('src')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    monkeypatch.setattr(git, 'GITHUB_USER', 'johndoe')
+    url = str(tmpdir.join('upstream', '{0}'))
+    runner = CliRunner()
+    result = runner.invoke(cli.cli, ['git-mirror', '-c', 'r-server',
+                                     '-u', url])
+    assert result.exit_code == 0, result.output
+    mirror = srcdir.join('.reana-mirrors', 'reana-server.git')
+    assert run_git(mirror, 'config', 'gc.pruneExpire') == 'never'
+
+    result = runner.invoke(cli.cli, ['git-clone', '-c', 'r-server',
+                                     '-u', 'johndoe'])
+    assert result.exit_code == 0, result.output
+    clone = srcdir.join('reana-server')
+    assert clone.join('README.rst').check()
+    assert str(mirror) in clone.join(
+        '.git', 'objects', 'info', 'alternates').read()
+    assert 'github.com:johndoe' in run_git(clone, 'remote', 'get-url',
+                                           'origin')
+
+    upstream.join('README.rst').write('REANA\n', mode='a')
+    run_git(upstream, 'commit', '-q', '-a', '-m', 'second')
+    result = runner.invoke(cli.cli, ['git-mirror', '-c', 'r-server',
+                                     '-u', url])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(cli.cli, ['git-fetch', '-c', 'r-server'])
+    assert result.exit_code == 0, result.output
+    assert str(mirror) in result.output
+    repository = GitRepository(str(clone))
+    assert repository.resolve_ref('refs/remotes/upstream/master') == \
+        run_git(upstream, 'rev-parse', 'HEAD')
+    repository.close()
+
+
+def test_git_unshallow(tmpdir, monkeypatch, run_git, clear_cli_caches):
+    """Tests for sparse clones and git-unshallow."""
+    from click.testing import CliRunner
+    from reana import cli
+    from reana.commands import git
+    from reana.gitstatus import GitRepository
+
+    upstream = tmpdir.mkdir('upstream').mkdir('reana-demo-cms-h4l')
+    run_git(upstream, 'init', '-q')
+    run_git(upstream, 'config', 'uploadpack.allowFilter', 'true')
+    for number in range(3):
+        upstream.join('README.rst').write('{0}\n'.format(number))
+        upstream.ensure('data', 'file{0}.root'.format(number))
+        run_git(upstream, 'add', '-A')
+        run_git(upstream, 'commit', '-q', '-m', str(number))
+    srcdir = tmpdir.mkdir('src')
+    srcdir.join('.reana.cfg').write('[sparse-checkout]\n'
+                                    'DEMOS = /* !/data/\n')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    monkeypatch.delenv('REANA_CONFIG', raising=False)
+    monkeypatch.setattr(git, 'GITHUB_USER', 'johndoe')
+    assert cli.get_sparse_profile('reana-demo-cms-h4l') == ['/*', '!/data/']
+    assert cli.get_sparse_profile('reana-server') == []
+
+    runner = CliRunner()
+    result = runner.invoke(cli.cli, [
+        'git-mirror', '-c', 'reana-demo-cms-h4l',
+        '-u', 'file://' + str(tmpdir.join('upstream', '{0}'))])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(cli.cli, ['git-clone', '-c', 'reana-demo-cms-h4l',
+                                     '-u', 'johndoe', '--sparse'])
+    assert result.exit_code == 0, result.output
+    clone = srcdir.join('reana-demo-cms-h4l')
+    assert clone.join('README.rst').check()
+    assert not clone.join('data').check()
+
+    clone.remove()
+    run_git(srcdir, 'clone', '-q', '--depth', '1', '--filter=blob:none',
+            'file://' + str(upstream), 'reana-demo-cms-h4l')
+    repository = GitRepository(str(clone))
+    assert repository.is_shallow()
+    config = repository.read_config()
+    assert config['remote.origin.partialclonefilter'] == 'blob:none'
+    assert config['remote.origin.promisor'] == 'true'
+    with monkeypatch.context() as patch:
+        patch.setattr(git, 'get_git_version', lambda: (2, 35))
+        result = runner.invoke(cli.cli, ['git-unshallow', '-c', 'r-d-c-h4l'])
+    assert result.exit_code == 1
+    assert 'needs Git 2.36 or newer, found 2.35.' in result.output
+    assert repository.is_shallow()
+    result = runner.invoke(cli.cli, ['git-unshallow', '-c', 'r-d-c-h4l'])
+    assert result.exit_code == 0, result.output
+    assert not repository.is_shallow()
+    config = repository.read_config()
+    for name in ('remote.origin.partialclonefilter', 'remote.origin.promisor',
+                 'extensions.partialclone'):
+        assert name not in config
+    assert run_git(clone, 'rev-list', '--count', 'HEAD') == '3'
+    result = runner.invoke(cli.cli, ['git-unshallow', '-c', 'r-d-c-h4l'])
+    assert 'Nothing to unshallow' in result.output
+
+
+def test_git_upgrade(tmpdir, monkeypatch, run_git, clear_cli_caches):
+    """Tests for skipping up-to-date components in git-upgrade."""
+    from click.testing import CliRunner
+    from reana import cli
+
+    work = tmpdir.mkdir('work')
+    run_git(work, 'init', '-q')
+    run_git(work, 'checkout', '-q', '-b', 'master')
+    run_git(work, 'commit', '-q', '--allow-empty', '-m', 'initial')
+    run_git(tmpdir, 'clone', '-q', '--bare', str(work), 'upstream.git')
+    run_git(tmpdir, 'clone', '-q', '--bare', str(work), 'origin.git')
+    srcdir = tmpdir.mkdir('src')
+    run_git(srcdir, 'clone', '-q', str(tmpdir.join('origin.git')),
+            'reana-server')
+    clone = srcdir.join('reana-server')
+    run_git(clone, 'remote', 'add', 'upstream',
+            str(tmpdir.join('upstream.git')))
+    run_git(clone, 'checkout', '-q', '-b', 'feature')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    runner = CliRunner()
+
+    result = runner.invoke(cli.cli, ['git-upgrade', '-c', 'r-server'])
+    assert result.exit_code == 0, result.output
+    assert 'Updated 0 components, skipped 1 components' in result.output
+
+    run_git(work, 'commit', '-q', '--allow-empty', '-m', 'second')
+    run_git(work, 'push', '-q', str(tmpdir.join('upstream.git')), 'master')
+    result = runner.invoke(cli.cli, ['git-upgrade', '-c', 'r-server'])
+    assert result.exit_code == 0, result.output
+    assert 'Updated 1 components, skipped 0 components' in result.output
+    assert 'git checkout' not in result.output
+    assert run_git(clone, 'rev-parse', '--abbrev-ref', 'HEAD') == 'feature'
+    head = run_git(work, 'rev-parse', 'HEAD')
+    assert run_git(clone, 'rev-parse', 'master') == head
+    assert run_git(tmpdir.join('origin.git'), 'rev-parse', 'master') == head
+
+    result = runner.invoke(cli.cli, ['git-push', '-c', 'r-server'])
+    assert result.exit_code == 0, result.output
+    assert 'Pushed 0 components, skipped 1 components' in result.output
+
+    # origin rewound behind the back of the cached advertisement
+    run_git(tmpdir.join('origin.git'), 'update-ref', 'refs/heads/master',
+            'master~1')
+    result = runner.invoke(cli.cli, ['git-push', '-c', 'r-server'])
+    assert result.exit_code == 0, result.output
+    assert 'Pushed 1 components, skipped 0 components' in result.output
+    assert run_git(tmpdir.join('origin.git'), 'rev-parse', 'master') == head
+
+    # failed pushes are not counted as pushed or updated
+    run_git(clone, 'remote', 'set-url', 'origin', str(tmpdir.join('missing')))
+    for command, summary in (('git-push', 'Pushed'),
+                             ('git-upgrade', 'Updated')):
+        result = runner.invoke(cli.cli, [command, '-c', 'r-server'])
+        assert result.exit_code != 0
+        assert '{0} 0 components, skipped 0 components already up to ' \
+            'date, 1 components failed.'.format(summary) in result.output
+
+
+def test_git_fetch_max_age(tmpdir, monkeypatch, run_git, clear_cli_caches):
+    """Tests for skipping recently fetched components in git-fetch."""
+    from click.testing import CliRunner
+    from reana import cli
+
+    upstream = tmpdir.mkdir('upstream')
+    run_git(upstream, 'init', '-q')
+    run_git(upstream, 'commit', '-q', '--allow-empty', '-m', 'initial')
+    srcdir = tmpdir.mkdir('src')
+    run_git(srcdir, 'clone', '-q', '--origin', 'upstream', str(upstream),
+            'reana-server')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    monkeypatch.delenv('REANA_FETCH_MAX_AGE', raising=False)
+    runner = CliRunner()
+    for (args, fetched) in (
+            ([], True),
+            ([], True),
+            (['--max-age', '60'], False),
+            (['--max-age', '60', '--force'], True),
+    ):
+        result = runner.invoke(cli.cli, ['git-fetch', '-c', 'r-server'] +
+                               args)
+        assert result.exit_code == 0, result.output
+        assert ('git fetch upstream' in result.output) == fetched
+        assert ('[reana-server] Fetched 0 seconds ago, skipping.' in
+                result.output) != fetched
+    monkeypatch.setenv('REANA_FETCH_MAX_AGE', '60')
+    # fetching another remote does not make upstream look fresh
+    cli.get_workspace_index().set_upstream_fetch('reana-server',
+                                                 time.time() - 3600)
+    run_git(srcdir.join('reana-server'), 'remote', 'add', 'origin',
+            str(upstream))
+    run_git(srcdir.join('reana-server'), 'fetch', '-q', 'origin')
+    result = runner.invoke(cli.cli, ['git-fetch', '-c', 'r-server'])
+    assert 'git fetch upstream' in result.output
+    # failed fetches are not counted as fetched
+    run_git(srcdir, 'clone', '-q', '--origin', 'upstream', str(upstream),
+            'reana-ui')
+    run_git(srcdir.join('reana-ui'), 'remote', 'set-url', 'upstream',
+            str(tmpdir.join('missing')))
+    result = runner.invoke(cli.cli, ['git-fetch', '-c', 'r-server',
+                                     '-c', 'r-ui'])
+    assert result.exit_code != 0
+    assert 'Fetched 0 components, skipped 1 components fetched recently, ' \
+        '1 components failed.' in result.output
+
+
+def test_git_clean(tmpdir, monkeypatch, clear_cli_caches):
+    """Tests for git-clean."""
+    from click.testing import CliRunner
+    from reana import cli
+
+    srcdir = tmpdir.mkdir('src')
+    for component in ('reana-server', 'reana-ui'):
+        srcdir.join(component, 'docs', '_build', 'index.html').write(
+            '0123', ensure=True)
+        srcdir.join(component, 'app.pyc').write('01', ensure=True)
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    runner = CliRunner()
+    args = ['git-clean', '-c', 'r-server', '-c', 'r-ui']
+    result = runner.invoke(cli.cli, args + ['--dry-run'])
+    assert result.exit_code == 0, result.output
+    assert '[reana-ui] Would remove 2 files, 6 B.' in result.output
+    assert 'Would remove 4 files, 12 B in total.' in result.output
+    assert srcdir.join('reana-ui', 'app.pyc').check()
+    result = runner.invoke(cli.cli, args)
+    assert result.exit_code == 0, result.output
+    assert 'Removed 4 files, 12 B in total.' in result.output
+    assert not srcdir.join('reana-ui', 'app.pyc').check()
+    assert srcdir.join('reana-ui', 'docs').check(dir=True)
+    result = runner.invoke(cli.cli, ['git-clean', '-c', 'r-w-controller'])
+    assert result.exit_code == 1
+    assert 'not found' in result.output
+
+
+def test_git_diff(tmpdir, monkeypatch, run_git, clear_cli_caches):
+    """Tests for aggregated git-diff skipping unchanged components."""
+    from click.testing import CliRunner
+    from reana import cli
+
+    srcdir = tmpdir.mkdir('src')
+    for component in ('reana-server', 'reana-ui', 'reana-commons'):
+        component_dir = srcdir.mkdir(component)
+        component_dir.join('README.rst').write('REANA\n')
+        run_git(component_dir, 'init', '-q')
+        run_git(component_dir, 'checkout', '-q', '-b', 'master')
+        run_git(component_dir, 'add', 'README.rst')
+        run_git(component_dir, 'commit', '-q', '-m', 'initial')
+        run_git(component_dir, 'update-ref', 'refs/remotes/upstream/master',
+                'HEAD')
+    srcdir.join('reana-server', 'README.rst').write('REANA server\n')
+    run_git(srcdir.join('reana-ui'), 'commit', '-q', '--allow-empty', '-m',
+            'empty')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    runner = CliRunner()
+    args = ['git-diff', '-c', 'r-server', '-c', 'r-ui', '-c', 'r-commons',
+            '--no-pager']
+    result = runner.invoke(cli.cli, args)
+    assert result.exit_code == 0, result.output
+    assert '[reana-server] git diff master' in result.output
+    assert '+REANA server' in result.output
+    assert 'reana-commons' not in result.output
+    assert 'Skipped 2 components without changes against master.' in \
+        result.output
+    result = runner.invoke(cli.cli, args + ['--base', 'upstream/master',
+                                            '--name-only'])
+    assert result.exit_code == 0, result.output
+    assert '[reana-ui] git diff --name-only upstream/master' in result.output
+    assert result.output.count('README.rst') == 1
+    assert 'Skipped 1 components' in result.output
+    result = runner.invoke(cli.cli, args + ['--stat'])
+    assert '1 file changed' in result.output
+    result = runner.invoke(cli.cli, args + ['--base', 'nonexistent'])
+    assert result.exit_code != 0
+    assert 'Failed components: reana-commons, reana-server, reana-ui.' in \
+        result.output
+
+
+def test_docker_context(tmpdir, monkeypatch, clear_cli_caches):
+    """Tests for docker-context and the docker-build context budget."""
+    from click.testing import CliRunner
+    from reana import cli
+    srcdir = tmpdir.mkdir('src')
+    component_dir = srcdir.mkdir('reana-server')
+    component_dir.join('Dockerfile').write('FROM python:3.6\n')
+    component_dir.join('.git', 'objects', 'pack').write('0' * 4096,
+                                                        ensure=True)
+    component_dir.join('app.py').write('app = 1\n')
+    srcdir.join('.reana.cfg').write('[context-budgets]\nr-server = 1k\n')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    monkeypatch.delenv('REANA_CONFIG', raising=False)
+    runner = CliRunner()
+    result = runner.invoke(cli.cli, ['docker-context', '-c', 'r-server'])
+    assert result.exit_code == 1
+    assert '[reana-server] Build context: 3 files, 4.0 KiB, no ' \
+        '.dockerignore.' in result.output
+    assert '4.0 KiB       1 files  .git/' in result.output
+    assert 'exceeds the budget of 1.0 KiB' in result.output
+    result = runner.invoke(cli.cli, ['docker-build', '-c', 'r-server'])
+    assert result.exit_code == 1
+    assert 'exceeds the budget' in result.output
+    result = runner.invoke(cli.cli, ['docker-context', '-c', 'r-server',
+                                     '--write'])
+    assert result.exit_code == 0, result.output
+    assert 'Added 1 patterns to .dockerignore, build context now 3 files' \
+        in result.output
+    assert component_dir.join('.dockerignore').read() == '.git\n'
+
+
+def test_docker_build_wheelhouse(tmpdir, monkeypatch, clear_cli_caches):
+    """Tests for the shared wheelhouse of docker-build."""
+    from click.testing import CliRunner
+    from reana import cli
+    bindir = tmpdir.mkdir('bin')
+    log = bindir.join('log')
+    python = bindir.join('python')
+    python.write('''#!/bin/sh
+if [ "$1" = -c ]; then
+    echo cpython 3.6.8 x86_64 linux
+    exit 0
+fi
+echo "$@" >> {0}
+touch "$5/click-7.0-py2.py3-none-any.whl"
+'''.format(log))
+    python.chmod(0o755)
+    docker = bindir.join('docker')
+    docker.write('''#!/bin/sh
+echo docker "$@" >> {0}
+'''.format(log))
+    docker.chmod(0o755)
+    monkeypatch.setenv('PATH', str(bindir) + os.pathsep +
+                       os.environ['PATH'])
+    srcdir = tmpdir.mkdir('src')
+    srcdir.mkdir('reana-commons').join('setup.py').write('setup()\n')
+    for component in ['reana-server', 'reana-workflow-controller']:
+        component_dir = srcdir.mkdir(component)
+        component_dir.join('Dockerfile').write('FROM python:3.6\n')
+        component_dir.join('requirements.txt').write(
+            'click==7.0\nreana-commons==0.3.0\n')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    monkeypatch.delenv('REANA_CONFIG', raising=False)
+    wheelhouse = tmpdir.join('wheelhouse')
+    args = ['docker-build', '-c', 'r-server', '-c', 'r-w-controller',
+            '--wheelhouse', str(wheelhouse), '--wheel-python', str(python)]
+    result = CliRunner().invoke(cli.cli, args)
+    assert result.exit_code == 0, result.output
+    assert 'Building wheelhouse of 1 requirements and 1 local libraries ' \
+        '(reana-commons).' in result.output
+    lines = log.read().splitlines()
+    wheel_commands = [line for line in lines if 'pip wheel' in line]
+    assert len(wheel_commands) == 1
+    assert wheel_commands[0].endswith(os.path.join(str(srcdir),
+                                                   'reana-commons'))
+    builds = [line for line in lines if line.startswith('docker build')]
+    assert len(builds) == 2
+    assert all('--build-arg PIP_FIND_LINKS=/wheelhouse' in build and
+               '--build-context wheelhouse={0}'.format(wheelhouse) in build
+               for build in builds)
+    assert len(wheelhouse.listdir()) == 1
+    log.remove()
+    result = CliRunner().invoke(cli.cli, args + ['--force', '-m', '1g'])
+    assert result.exit_code == 0, result.output
+    assert 'Using wheelhouse' in result.output
+    assert 'pip wheel' not in log.read()
+    assert '--memory' not in log.read()
+    srcdir.join('reana-server', 'requirements.txt').write('click==7.1\n')
+    result = CliRunner().invoke(cli.cli, args)
+    assert result.exit_code == 0, result.output
+    assert 'Building wheelhouse of 2 requirements' in result.output
+    assert len(wheelhouse.listdir()) == 2
+
+
+def test_docker_build_unselected_base(tmpdir, monkeypatch,
+                                      clear_cli_caches):
+    """Test that rebuilding a base image in another run is noticed."""
+    from click.testing import CliRunner
+    from reana import cli
+    bindir = tmpdir.mkdir('bin')
+    log = bindir.join('log')
+    base_id = bindir.join('base-id')
+    base_id.write('sha256:1\n')
+    docker = bindir.join('docker')
+    docker.write('''#!/bin/sh
+case "$1" in
+    images) echo reanahub/reana-server:latest ;;
+    image) cat {0} ;;
+    *) echo docker "$@" >> {1} ;;
+esac
+'''.format(base_id, log))
+    docker.chmod(0o755)
+    monkeypatch.setenv('PATH', str(bindir) + os.pathsep +
+                       os.environ['PATH'])
+    srcdir = tmpdir.mkdir('src')
+    srcdir.mkdir('reana-commons').join('Dockerfile').write(
+        'FROM python:3.6\n')
+    srcdir.mkdir('reana-server').join('Dockerfile').write(
+        'FROM reanahub/reana-commons:latest\n')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    monkeypatch.delenv('REANA_CONFIG', raising=False)
+    for base, built in (('sha256:1', True), ('sha256:1', False),
+                        ('sha256:2', True)):
+        base_id.write(base + '\n')
+        if log.check():
+            log.remove()
+        result = CliRunner().invoke(cli.cli, ['docker-build', '-c',
+                                              'r-server'])
+        assert result.exit_code == 0, result.output
+        assert log.check() == built
+        assert ('Sources did not change' in result.output) != built
+
+
+def test_install(tmpdir, monkeypatch, clear_cli_caches):
+    """Tests for editable installation in a single pip run."""
+    from click.testing import CliRunner
+    from reana import cli
+    bindir = tmpdir.mkdir('bin')
+    log = bindir.join('log')
+    python = bindir.join('python')
+    python.write('''#!/bin/sh
+if [ "$2" = venv ]; then
+    mkdir -p "$3/bin" && cp "$0" "$3/bin/python"
+    exit 0
+fi
+echo "$0" "$@" >> {0}
+echo "Obtaining file:///src/reana-commons"
+echo "Installing collected packages: click, reana-commons, reana-server"
+echo "Successfully installed click-7.0 reana-commons-0.3.0 reana-server-0.3.0"
+'''.format(log))
+    python.chmod(0o755)
+    srcdir = tmpdir.mkdir('src')
+    for component in ['reana-commons', 'reana-server']:
+        srcdir.mkdir(component).join('setup.py').write('setup()\n')
+    srcdir.mkdir('reana-ui')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    monkeypatch.delenv('REANA_CONFIG', raising=False)
+    monkeypatch.delenv('REANA_VENV', raising=False)
+    venv = tmpdir.join('venv')
+    result = CliRunner().invoke(cli.cli, [
+        'install', '-c', 'reana-commons', '-c', 'r-server', '-c', 'r-ui',
+        '--python', str(python), '--venv', str(venv), '--cache-dir',
+        str(tmpdir.join('cache'))])
+    assert result.exit_code == 0, result.output
+    assert '[reana-ui] Ignoring this component that does not contain ' \
+        'setup.py.' in result.output
+    assert 'Created virtual environment {0}.'.format(venv) in result.output
+    assert 'Resolved 2 components in ' in result.output
+    assert 'installed 2 components and 1 dependencies in ' in result.output
+    assert log.read().splitlines() == [
+        '{0} -m pip install --cache-dir {1} --editable {2} --editable {3}'
+        .format(venv.join('bin', 'python'), tmpdir.join('cache'),
+                srcdir.join('reana-commons'), srcdir.join('reana-server'))]
+    log.remove()
+    result = CliRunner().invoke(cli.cli, [
+        'install', '-c', 'reana-server', '--python', str(python)])
+    assert result.exit_code == 0, result.output
+    assert 'Created virtual environment {0}.'.format(
+        srcdir.join('.venv')) in result.output
+    assert log.read().splitlines() == [
+        '{0} -m pip install --editable {1}'.format(
+            srcdir.join('.venv', 'bin', 'python'),
+            srcdir.join('reana-server'))]
+    log.remove()
+    result = CliRunner().invoke(cli.cli, [
+        'install', '-c', 'reana-server', '--python', str(python),
+        '--venv', str(venv), '--system'])
+    assert result.exit_code == 0, result.output
+    assert 'virtual environment' not in result.output
+    assert log.read().splitlines() == [
+        '{0} -m pip install --editable {1}'.format(
+            python, srcdir.join('reana-server'))]
+
+
+def test_docker_pull(tmpdir, monkeypatch, clear_cli_caches):
+    """Tests for concurrent docker-pull with retries against a fake Docker."""
+    from click.testing import CliRunner
+    from reana import cli
+
+    bindir = tmpdir.mkdir('bin')
+    docker = bindir.join('docker')
+    docker.write('''#!/bin/sh
+if [ "$1" = manifest ]; then
+    echo '{"SchemaV2Manifest": {"layers": [
+        {"digest": "sha256:aaaaaaaaaaaa0", "size": 1024},
+        {"digest": "sha256:bbbbbbbbbbbb0", "size": 2048}]}}'
+    exit 0
+fi
+# wait until all three images are being pulled at the same time
+touch "$0.started.${2##*/}"
+i=0
+while [ "$(ls "$0".started.* | wc -l)" -lt 3 ] && [ $i -lt 100 ]; do
+    sleep 0.1
+    i=$((i + 1))
+done
+[ $i -lt 100 ] || { echo "not pulled concurrently"; exit 1; }
+case "$2" in
+    *reana-server*)
+        if [ ! -e "$0.failed" ]; then
+            touch "$0.failed"
+            echo "net/http: TLS handshake timeout"
+            exit 1
+        fi;;
+esac
+echo "aaaaaaaaaaaa: Pull complete"
+echo "bbbbbbbbbbbb: Already exists"
+''')
+    docker.chmod(0o755)
+    monkeypatch.setenv('PATH', str(bindir) + os.pathsep +
+                       os.environ['PATH'])
+    srcdir = tmpdir.mkdir('src')
+    components = ['reana-commons', 'reana-job-controller', 'reana-server']
+    for component in components:
+        srcdir.mkdir(component).join('Dockerfile').write('FROM python\n')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    result = CliRunner().invoke(cli.cli, [
+        'docker-pull', '-c', 'reana-commons', '-c', 'r-j-controller',
+        '-c', 'reana-server', '-j', '3', '--backoff', '0.1'])
+    assert result.exit_code == 0, result.output
+    assert 'not pulled concurrently' not in result.output
+    assert 'retrying in 0.1s' in result.output
+    assert 'reanahub/reana-server:latest: 1.0 KiB, 1 layers transferred,' \
+        ' 1 already present' in result.output
+    assert ', 2 attempts' in result.output
+    assert 'Transferred 3.0 KiB' in result.output
+
+
+def test_docker_push(tmpdir, monkeypatch, clear_cli_caches):
+    """Tests for pushed layer sizes mapped through the image DiffIDs."""
+    from click.testing import CliRunner
+    from reana import cli
+
+    bindir = tmpdir.mkdir('bin')
+    docker = bindir.join('docker')
+    docker.write('''#!/bin/sh
+case "$1" in
+    manifest) echo '{"SchemaV2Manifest": {"layers": [
+        {"digest": "sha256:aaaaaaaaaaaa0", "size": 1024},
+        {"digest": "sha256:bbbbbbbbbbbb0", "size": 2048}]}}';;
+    image) echo '["sha256:111111111111a", "sha256:222222222222b"]';;
+    push) echo "111111111111: Layer already exists"
+          echo "222222222222: Pushed";;
+esac
+''')
+    docker.chmod(0o755)
+    monkeypatch.setenv('PATH', str(bindir) + os.pathsep +
+                       os.environ['PATH'])
+    srcdir = tmpdir.mkdir('src')
+    srcdir.mkdir('reana-server').join('Dockerfile').write('FROM python\n')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    result = CliRunner().invoke(cli.cli, ['docker-push', '-c', 'r-server'])
+    assert result.exit_code == 0, result.output
+    assert 'reanahub/reana-server:latest: 2.0 KiB, 1 layers transferred,' \
+        ' 1 already present' in result.output
+
+
+def test_docker_images(tmpdir, monkeypatch, clear_cli_caches):
+    """Tests for docker-images size history and budgets."""
+    import json
+    from click.testing import CliRunner
+    from reana import cli
+
+    bindir = tmpdir.mkdir('bin')
+    docker = bindir.join('docker')
+    docker.write('''#!/bin/sh
+[ "$1" = run ] && exit 0
+cat "$0.json"
+''')
+    docker.chmod(0o755)
+
+    def set_image(image_id, size):
+        bindir.join('docker.json').write(json.dumps([{
+            'Id': image_id, 'Size': size,
+            'RepoTags': ['reanahub/reana-server:latest'],
+            'RootFS': {'Layers': ['a', 'b', 'c']}}]))
+
+    monkeypatch.setenv('PATH', str(bindir) + os.pathsep +
+                       os.environ['PATH'])
+    monkeypatch.delenv('REANA_CONFIG', raising=False)
+    srcdir = tmpdir.mkdir('src')
+    srcdir.mkdir('reana-server').join('Dockerfile').write('FROM python\n')
+    srcdir.join('.reana.cfg').write('[image-budgets]\nr-server = 3k\n')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    runner = CliRunner()
+    args = ['docker-images', '-c', 'reana-server', '--max-growth', '10',
+            '--strict']
+
+    set_image('sha256:1', 2048)
+    result = runner.invoke(cli.cli, args + ['--cold-start'])
+    assert result.exit_code == 0, result.output
+    assert '2.0 KiB' in result.output
+    result = runner.invoke(cli.cli, args)
+    assert result.exit_code == 0, result.output
+    history = srcdir.join('.reana-image-history.jsonl').readlines()
+    assert len(history) == 1
+    assert json.loads(history[0])['layers'] == 3
+
+    set_image('sha256:2', 4096)
+    result = runner.invoke(cli.cli, args)
+    assert result.exit_code == 1
+    assert '+100.0%' in result.output
+    assert 'exceeds budget 3.0 KiB' in result.output
+    assert 'grew by 100.0% from 2.0 KiB' in result.output
+    result = runner.invoke(cli.cli, args[:-1] + ['--max-growth', '200'])
+    assert result.exit_code == 0
+    assert 'exceeds budget' in result.output
+    assert len(srcdir.join('.reana-image-history.jsonl').readlines()) == 2
+
+
+def test_stats(tmpdir, monkeypatch, clear_cli_caches):
+    """Tests for recording command executions and reana stats."""
+    from click.testing import CliRunner
+    from reana import cli
+    monkeypatch.setattr(cli, 'SRCDIR', str(tmpdir))
+    tmpdir.mkdir('reana-server')
+    for _ in range(2):
+        cli.run_command_sequence(['true', 'false'], 'reana-server')
+    result = CliRunner().invoke(cli.cli, ['stats', '-c', 'r-server'])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].split() == ['COMPONENT', 'COMMAND', 'RUNS', 'FAIL',
+                                'P50', 'P95', 'MAX', 'RSS', 'TREND']
+    assert sorted(line.split()[1:4] for line in lines[1:]) == [
+        ['false', '2', '2'], ['true', '2', '0']]
+    result = CliRunner().invoke(cli.cli, ['stats', '-c', 'reana-ui'])
+    assert 'No commands recorded.' in result.output
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+
+"""REANA build context analysis tests."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+
+
+@pytest.mark.parametrize('path, excluded', [
+    ('.git/HEAD', True),
+    ('reana_server/app.pyc', True),
+    ('app.pyc', True),
+    ('docs/_build/html/index.html', True),
+    ('tests/data/input.csv', True),
+    ('tests/data/keep.txt', False),
+    ('CHANGES.md', True),
+    ('README.md', False),
+    ('docs/CHANGES.md', False),
+    ('bx', True),
+    ('dx', False),
+    ('fy', False),
+    ('gy', True),
+    ('/y', False),
+    ('az', False),
+    ('zz', True),
+    ('Dockerfile', False),
+    ('reana_server/app.py', False),
+])
+def test_is_excluded(path, excluded):
+    """Tests for parse_dockerignore() and is_excluded()."""
+    from reana.context import is_excluded, parse_dockerignore
+    rules = parse_dockerignore('# comment\n'
+                               '.git\n'
+                               '**/*.pyc\n'
+                               'docs/_build/\n'
+                               'tests/data\n'
+                               '!tests/data/keep.txt\n'
+                               '/*.md\n'
+                               '!README.md\n'
+                               '[a-c]x\n'
+                               '[!a-f]y\n'
+                               '[^a-c]z\n'
+                               'Dockerfile\n')
+    assert is_excluded(path, rules) == excluded
+
+
+def test_scan_build_context(tmpdir):
+    """Tests for scan_build_context() and the contributors and suggestions."""
+    from reana.context import add_dockerignore_patterns, \
+        get_largest_contributors, load_dockerignore, scan_build_context, \
+        suggest_dockerignore
+    tmpdir.join('Dockerfile').write('FROM python:3.6\n')
+    tmpdir.join('reana_server', 'app.py').write('0' * 10, ensure=True)
+    tmpdir.join('reana_server', 'app.pyc').write('0' * 20, ensure=True)
+    tmpdir.join('.git', 'objects', 'pack').write('0' * 1000, ensure=True)
+    tmpdir.join('tests', 'data', 'big.csv').write('0' * 500, ensure=True)
+    tmpdir.join('.dockerignore').write('tests/data\n')
+    files = scan_build_context(str(tmpdir))
+    assert sorted(files) == ['.dockerignore', '.git/objects/pack',
+                             'Dockerfile', 'reana_server/app.py',
+                             'reana_server/app.pyc']
+    assert get_largest_contributors(files, depth=1, limit=2) == [
+        ('.git/', 1, 1000), ('reana_server/', 2, 30)]
+    suggestions = suggest_dockerignore(files, load_dockerignore(str(tmpdir)))
+    assert suggestions == [('.git', 1, 1000), ('**/*.pyc', 1, 20)]
+    add_dockerignore_patterns(str(tmpdir),
+                              [pattern for pattern, _, _ in suggestions])
+    assert tmpdir.join('.dockerignore').read() == \
+        'tests/data\n.git\n**/*.pyc\n'
+    assert sorted(scan_build_context(str(tmpdir))) == [
+        '.dockerignore', 'Dockerfile', 'reana_server/app.py']
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+
+"""REANA command daemon tests."""
+
+from __future__ import absolute_import, print_function
+
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from reana.client import forward, get_socket_path
+
+
+@pytest.fixture()
+def workspace(tmpdir, monkeypatch, run_git, clear_cli_caches):
+    """Return source directory with one cloned component."""
+    from reana import cli, index
+    monkeypatch.setattr(index, 'RACY_WINDOW', 0)
+    srcdir = tmpdir.mkdir('src')
+    component_dir = srcdir.mkdir('reana-server')
+    component_dir.join('app.py').write('app = 1\n')
+    run_git(component_dir, 'init', '-q')
+    run_git(component_dir, 'add', '-A')
+    run_git(component_dir, 'commit', '-q', '-m', 'initial')
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    monkeypatch.setenv('REANA_SRCDIR', str(srcdir))
+    monkeypatch.delenv('REANA_CONFIG', raising=False)
+    monkeypatch.delenv('REANA_DAEMON_SOCKET', raising=False)
+    monkeypatch.chdir(str(tmpdir))
+    return srcdir
+
+
+def wait_for(condition, timeout=5.0):
+    """Return whether the condition became true within the timeout."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_daemon(workspace, monkeypatch):
+    """Tests for serving commands from the daemon."""
+    from reana.daemon import DaemonError, DaemonServer, stop_daemon
+    path = get_socket_path(str(workspace))
+    assert forward(['git-status'], path) is None
+    component_dir = workspace.join('reana-server')
+    server = DaemonServer(path, str(workspace), None,
+                          {'reana-server': str(component_dir)}, poll=False)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        with pytest.raises(DaemonError):
+            DaemonServer(path, str(workspace))
+        assert oct(os.stat(path).st_mode & 0o777) == oct(0o600)
+        args = ['git-status', '-c', 'reana-server']
+        assert forward(args, path) == {
+            'exit_code': 0, 'output': '- reana-server @ master\n'}
+        component_dir.join('app.py').write('app = 2\n')
+        assert wait_for(lambda: '(dirty)' in forward(args, path)['output'])
+        response = forward(['git-status', '--no-such-option'], path)
+        assert response['exit_code'] == 2
+        assert 'No such option' in response['output']
+        assert forward(['git-clone'], path) is None
+        monkeypatch.setenv('REANA_SRCDIR', str(component_dir))
+        assert forward(args, path) is None
+    finally:
+        assert stop_daemon(path)
+        thread.join(5)
+        server.close()
+    assert not thread.is_alive()
+    assert server.requests >= 6
+    assert not os.path.exists(path)
+    assert not stop_daemon(path)
+
+
+def test_daemon_poll(workspace):
+    """Tests for checking the trees on every request without inotify."""
+    from reana.daemon import DaemonServer, stop_daemon
+    path = get_socket_path(str(workspace))
+    component_dir = workspace.join('reana-server')
+    server = DaemonServer(path, str(workspace), None,
+                          {'reana-server': str(component_dir)}, poll=True)
+    assert server.watcher is None
+    assert not server.index.watched
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        args = ['git-status', '-c', 'reana-server']
+        assert forward(args, path)['output'] == '- reana-server @ master\n'
+        component_dir.join('app.py').write('app = 2\n')
+        assert '(dirty)' in forward(args, path)['output']
+    finally:
+        assert stop_daemon(path)
+        thread.join(5)
+        server.close()
+
+
+def test_daemon_slow_command(workspace):
+    """Test that a command slower than the timeout is not run twice."""
+    from reana.daemon import DaemonServer, stop_daemon
+    path = get_socket_path(str(workspace))
+    server = DaemonServer(path, str(workspace))
+    requests = []
+    handle = server.handle
+
+    def slow_handle(request):
+        requests.append(request)
+        time.sleep(0.5)
+        return handle(request)
+
+    server.handle = slow_handle
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        response = forward(['version'], path, timeout=0.1)
+        assert response['exit_code'] == 0
+        assert len(requests) == 1
+    finally:
+        assert stop_daemon(path)
+        thread.join(5)
+        server.close()
+
+
+@pytest.mark.parametrize('accept', [False, True])
+def test_daemon_not_answering(workspace, accept):
+    """Test that a daemon not accepting the request in time is not used."""
+    path = get_socket_path(str(workspace))
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    connections = []
+    if accept:
+        thread = threading.Thread(
+            target=lambda: connections.append(server.accept()[0]))
+        thread.start()
+    try:
+        start = time.time()
+        assert forward(['version'], path, timeout=0.2) is None
+        assert time.time() - start < 2
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        output = subprocess.check_output(
+            [sys.executable, '-c', 'from reana.client import main; main()',
+             'git-status', '-c', 'reana-server'], env=env,
+            universal_newlines=True, timeout=30)
+        assert output == '- reana-server @ master\n'
+    finally:
+        if accept:
+            thread.join(5)
+        for connection in connections:
+            connection.close()
+        server.close()
+
+
+def test_client_fallback(workspace):
+    """Tests for in-process execution when no daemon is running."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    workspace.join('.reana-daemon.sock').write('')
+    output = subprocess.check_output(
+        [sys.executable, '-c', 'from reana.client import main; main()',
+         'git-status', '-c', 'reana-server'], env=env,
+        universal_newlines=True)
+    assert output == '- reana-server @ master\n'
+
+
+def test_client_does_not_import_click():
+    """Test that forwarding commands does not import click."""
+    output = subprocess.check_output(
+        [sys.executable, '-c', 'import sys, reana.client; '
+                               'print("click" in sys.modules)'],
+        universal_newlines=True)
+    assert output.strip() == 'False'
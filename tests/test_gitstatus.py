@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA Git status reader tests."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+
+
+@pytest.fixture()
+def repository(tmpdir, run_git):
+    """Return Git repository with a diverged upstream/master."""
+    run_git(tmpdir, 'init', '-q')
+    run_git(tmpdir, 'checkout', '-q', '-b', 'master')
+    for number in range(6):
+        tmpdir.join('file{0}'.format(number % 2)).write(
+            'line {0}\n'.format(number) * 100, mode='a')
+        run_git(tmpdir, 'add', '-A')
+        run_git(tmpdir, 'commit', '-q', '-m', 'commit {0}'.format(number))
+    run_git(tmpdir, 'branch', 'upstream-master', 'HEAD~2')
+    run_git(tmpdir, 'checkout', '-q', 'upstream-master')
+    tmpdir.join('upstream').write('upstream\n')
+    run_git(tmpdir, 'add', '-A')
+    run_git(tmpdir, 'commit', '-q', '-m', 'upstream')
+    run_git(tmpdir, 'update-ref', 'refs/remotes/upstream/master', 'HEAD')
+    run_git(tmpdir, 'checkout', '-q', 'master')
+    run_git(tmpdir, 'branch', '-D', '-q', 'upstream-master')
+    return tmpdir
+
+
+def test_get_repository_status(repository, run_git):
+    """Tests for get_repository_status()."""
+    from reana.gitstatus import get_repository_status
+    expected = {'branch': 'master',
+                'sha': run_git(repository, 'rev-parse', 'HEAD'),
+                'ahead': 2, 'behind': 1, 'dirty': False}
+    assert get_repository_status(str(repository)) == expected
+    run_git(repository, 'gc', '-q', '--aggressive')
+    assert get_repository_status(str(repository)) == expected
+    repository.join('file0').write('changed\n', mode='a')
+    assert get_repository_status(str(repository))['dirty'] is True
+    run_git(repository, 'add', 'file0')
+    assert get_repository_status(str(repository))['dirty'] is True
+    run_git(repository, 'checkout', '-q', '--detach', 'HEAD~1')
+    status = get_repository_status(str(repository))
+    assert status['branch'] is None
+    assert (status['ahead'], status['behind']) == (1, 1)
+
+
+def test_is_dirty_config(repository, run_git, monkeypatch):
+    """Tests for honouring core.filemode and core.autocrlf in is_dirty()."""
+    from reana.gitstatus import get_repository_status
+    monkeypatch.setenv('HOME', str(repository.join('home')))
+    monkeypatch.delenv('XDG_CONFIG_HOME', raising=False)
+    repository.join('file0').chmod(0o755)
+    assert get_repository_status(str(repository))['dirty'] is True
+    run_git(repository, 'config', 'core.filemode', 'false')
+    assert get_repository_status(str(repository))['dirty'] is False
+    repository.join('home', '.gitconfig').write(
+        '[core]\n\tautocrlf = true\n', ensure=True)
+    repository.join('file1').remove()
+    run_git(repository, 'checkout', '--', 'file1')
+    assert '\r\n' in repository.join('file1').read_binary().decode()
+    repository.join('file1').setmtime(repository.join('file1').mtime() + 10)
+    assert run_git(repository, 'status', '--porcelain',
+                   '--untracked-files=no') == ''
+    assert get_repository_status(str(repository))['dirty'] is False
+    repository.join('file1').write('changed\r\n', mode='a')
+    assert get_repository_status(str(repository))['dirty'] is True
+
+
+def test_is_dirty_attributes(repository, run_git, monkeypatch):
+    """Test that Git decides when attributes convert file content."""
+    from reana.gitstatus import get_repository_status, \
+        has_conversion_attributes
+    assert has_conversion_attributes(b'*.sh text eol=lf\n')
+    assert has_conversion_attributes(b'*.dat filter=lfs diff=lfs\n')
+    assert not has_conversion_attributes(b'*.png binary\n*.txt -text\n')
+    assert not has_conversion_attributes(b'# text\n*.py diff=python\n')
+    monkeypatch.setenv('HOME', str(repository.join('home')))
+    monkeypatch.delenv('XDG_CONFIG_HOME', raising=False)
+    repository.join('.gitattributes').write('file1 text eol=crlf\n')
+    run_git(repository, 'add', '.gitattributes')
+    run_git(repository, 'commit', '-q', '-m', 'attributes')
+    repository.join('file1').remove()
+    run_git(repository, 'checkout', '--', 'file1')
+    assert '\r\n' in repository.join('file1').read_binary().decode()
+    repository.join('file1').setmtime(repository.join('file1').mtime() + 10)
+    assert get_repository_status(str(repository))['dirty'] is False
+    repository.join('file1').write('changed\r\n', mode='a')
+    assert get_repository_status(str(repository))['dirty'] is True
+
+
+def test_count_ahead_behind(tmpdir, run_git):
+    """Test that counts match git rev-list on histories with merges."""
+    from reana.gitstatus import GitRepository
+    run_git(tmpdir, 'init', '-q')
+    run_git(tmpdir, 'checkout', '-q', '-b', 'master')
+    run_git(tmpdir, 'commit', '-q', '--allow-empty', '-m', 'root')
+    run_git(tmpdir, 'branch', 'side')
+    for number in range(1, 31):
+        branch = 'side' if number % 3 else 'master'
+        run_git(tmpdir, 'checkout', '-q', branch)
+        run_git(tmpdir, 'commit', '-q', '--allow-empty', '-m', str(number))
+        if number % 7 == 0:
+            run_git(tmpdir, 'merge', '-q', '--no-edit', '--no-ff',
+                    'master' if branch == 'side' else 'side')
+    repo = GitRepository(str(tmpdir))
+    try:
+        local = run_git(tmpdir, 'rev-parse', 'master')
+        base = run_git(tmpdir, 'rev-parse', 'side')
+        expected = tuple(int(count) for count in run_git(
+            tmpdir, 'rev-list', '--left-right', '--count',
+            'master...side').split())
+        assert repo.count_ahead_behind(local, base) == expected
+        assert repo.count_ahead_behind(local, local) == (0, 0)
+    finally:
+        repo.close()
+
+
+def test_pack_cache(repository, run_git):
+    """Test that the pack object cache stays within its size."""
+    from reana.gitstatus import GitRepository, PackFile
+    run_git(repository, 'gc', '-q', '--aggressive')
+    repo = GitRepository(str(repository))
+    try:
+        pack = repo.get_packs()[0]
+        repo._packs = [PackFile(pack.pack_path[:-5] + '.idx', cache_size=1000)]
+        pack.close()
+        for name in ('HEAD', 'HEAD~1', 'HEAD~2', 'upstream/master'):
+            tree = repo.read_commit(run_git(repository, 'rev-parse', name))[0]
+            for _, sha in repo.read_tree(tree).values():
+                repo.read_object(sha)
+        assert 0 < repo._packs[0]._cached_bytes <= 1000
+        assert repo._packs[0]._cached_bytes == sum(
+            len(data) for _, data in repo._packs[0]._cache.values())
+    finally:
+        repo.close()
+
+
+def test_get_repository_status_not_a_repository(tmpdir):
+    """Tests for get_repository_status() outside of Git repositories."""
+    from reana.gitstatus import get_repository_status
+    assert get_repository_status(str(tmpdir)) == {
+        'branch': None, 'sha': None, 'ahead': None, 'behind': None,
+        'dirty': None}
+
+
+def test_resolve_name(repository, run_git):
+    """Tests for GitRepository.resolve_name()."""
+    from reana.gitstatus import GitRepository
+    run_git(repository, 'tag', 'v0.1.0', 'HEAD~1')
+    run_git(repository, 'pack-refs', '--all')
+    repo = GitRepository(str(repository))
+    for name in ('master', 'HEAD', 'refs/heads/master', 'upstream/master',
+                 'v0.1.0', run_git(repository, 'rev-parse', 'HEAD~3')):
+        assert repo.resolve_name(name) == run_git(repository, 'rev-parse',
+                                                  name)
+    assert repo.resolve_name('config') is None
+    assert repo.resolve_name('nonexistent') is None
+    repo.close()
+
+
+def test_get_current_branch(repository, run_git):
+    """Tests for get_current_branch()."""
+    from reana.cli import get_current_branch
+    assert get_current_branch(str(repository)) == 'master'
+    run_git(repository, 'checkout', '-q', '-b', 'pr-72')
+    assert get_current_branch(str(repository)) == 'pr-72'
+
+
+def test_apply_delta():
+    """Tests for apply_delta()."""
+    from reana.gitstatus import apply_delta
+    # source size 11, target size 10, copy 5 bytes at 6, insert 5 bytes
+    delta = b'\x0b\x0a\x91\x06\x05\x05' + b' wide'
+    assert apply_delta(b'hello world', delta) == b'world wide'
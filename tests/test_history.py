@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+
+"""REANA execution history tests."""
+
+from __future__ import absolute_import, print_function
+
+
+def test_run_recorded(tmpdir):
+    """Tests for run_recorded() and record_execution()."""
+    from reana.history import load_history, record_execution, run_recorded
+    returncode, output, record = run_recorded('pwd; exit 3', str(tmpdir),
+                                              capture=True)
+    assert returncode == 3
+    assert output == str(tmpdir) + '\n'
+    assert record['exit_code'] == 3
+    assert record['duration'] >= 0
+    assert record['max_rss'] > 0
+    path = str(tmpdir.join('history.jsonl'))
+    record_execution(path, 'pwd; exit 3', 'reana-server', record)
+    tmpdir.join('history.jsonl').write('garbage\n', mode='a')
+    records = load_history(path)
+    assert len(records) == 1
+    assert records[0]['component'] == 'reana-server'
+    assert load_history(path, since=record['start'] + 1) == []
+
+
+def test_summarize_history():
+    """Tests for get_percentile() and summarize_history()."""
+    from reana.history import get_percentile, summarize_history
+    assert get_percentile([], 50) is None
+    assert get_percentile([3, 1, 2], 50) == 2
+    assert get_percentile(list(range(1, 101)), 95) == 95
+    records = [{'component': 'reana-server', 'command': 'git fetch upstream',
+                'start': number, 'duration': duration, 'exit_code': 0,
+                'max_rss': 1024}
+               for number, duration in enumerate([1, 1, 2, 2])]
+    records.append({'component': 'reana-ui', 'command': 'git fetch upstream',
+                    'start': 5, 'duration': 5, 'exit_code': 1,
+                    'max_rss': None})
+    summary = summarize_history(records)
+    assert [entry['component'] for entry in summary] == ['reana-ui',
+                                                         'reana-server']
+    assert summary[0]['failures'] == 1
+    assert summary[0]['trend'] is None
+    assert summary[0]['max_rss'] is None
+    assert summary[1]['runs'] == 4
+    assert summary[1]['p50'] == 1
+    assert summary[1]['p95'] == 2
+    assert summary[1]['trend'] == 1.0
+
+
+def test_truncate_history(tmpdir, monkeypatch):
+    """Tests for truncating the history file when it grows too large."""
+    import time
+    from reana import history
+    path = str(tmpdir.join('history.jsonl'))
+    now = time.time()
+    for number in range(10):
+        history.record_execution(path, 'true', 'reana-server', {
+            'start': now - (10 - number) * 86400, 'duration': number,
+            'exit_code': 0, 'max_rss': None})
+    assert len(history.load_history(path)) == 10
+    monkeypatch.setattr(history, 'HISTORY_MAX_SIZE', 1)
+    monkeypatch.setattr(history, 'HISTORY_MAX_DAYS', 5)
+    history.record_execution(path, 'true', 'reana-server', {
+        'start': now, 'duration': 10, 'exit_code': 0, 'max_rss': None})
+    assert [record['duration'] for record in history.load_history(path)] \
+        == [6, 7, 8, 9, 10]
+    history.truncate_history(path, max_records=2)
+    assert [record['duration'] for record in history.load_history(path)] \
+        == [9, 10]
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA workspace index tests."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+
+
+@pytest.fixture()
+def workspace(tmpdir, monkeypatch, run_git):
+    """Return source directory with one cloned component."""
+    from reana import index
+    monkeypatch.setattr(index, 'RACY_WINDOW', 0)
+    srcdir = tmpdir.mkdir('reana-server')
+    run_git(srcdir, 'init', '-q')
+    srcdir.join('setup.py').write('')
+    run_git(srcdir, 'add', '-A')
+    run_git(srcdir, 'commit', '-q', '-m', 'initial')
+    run_git(srcdir, 'remote', 'add', 'upstream',
+            'git@github.com:reanahub/reana-server')
+    run_git(srcdir, 'update-ref', 'refs/remotes/upstream/master', 'HEAD')
+    return tmpdir
+
+
+def test_workspace_index(workspace, run_git):
+    """Tests for WorkspaceIndex.get()."""
+    from reana.index import WorkspaceIndex
+    index = WorkspaceIndex(str(workspace))
+    entry = index.get('reana-server')
+    assert entry['dockerised'] is False
+    assert entry['sha'] == run_git(workspace.join('reana-server'),
+                                   'rev-parse', 'HEAD')
+    assert entry['remotes'] == {
+        'upstream': 'git@github.com:reanahub/reana-server'}
+    assert index.get('reana-server') is entry
+    workspace.join('reana-server', 'Dockerfile').write('FROM python\n')
+    assert index.get('reana-server')['dockerised'] is True
+    run_git(workspace.join('reana-server'), 'add', '-A')
+    run_git(workspace.join('reana-server'), 'commit', '-q', '-m', 'docker')
+    assert index.get_ahead_behind('reana-server') == (1, 0)
+    assert index.get_status('reana-server')['dirty'] is False
+
+
+def test_workspace_index_persistence(workspace):
+    """Tests for WorkspaceIndex.save()."""
+    from reana.index import INDEX_FILENAME, WorkspaceIndex
+    index = WorkspaceIndex(str(workspace))
+    entry = index.get('reana-server')
+    index.save()
+    assert workspace.join(INDEX_FILENAME).check()
+    assert WorkspaceIndex(str(workspace)).components == {
+        'reana-server': entry}
+    workspace.join(INDEX_FILENAME).write('garbage')
+    assert WorkspaceIndex(str(workspace)).components == {}
+
+
+def test_workspace_index_concurrent_save(workspace):
+    """Test that concurrent saves keep the entries of both processes."""
+    import multiprocessing
+    from reana.index import WorkspaceIndex
+    first = WorkspaceIndex(str(workspace))
+    second = WorkspaceIndex(str(workspace))
+    first.get('reana-server')
+    first.set_upstream_fetch('reana-server', 100)
+    second.set_upstream_fetch('reana-server', 50)
+    second.set_upstream_fetch('reana-client', 200)
+    second.remote_refs['reana-server'] = {'origin': {
+        'url': None, 'time': 300, 'refs': {'refs/heads/master': 'abc'}}}
+    second.modified = True
+    processes = [multiprocessing.Process(target=index.save)
+                 for index in (first, second)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(10)
+        assert process.exitcode == 0
+    index = WorkspaceIndex(str(workspace))
+    assert index.upstream_fetches == {'reana-server': 100,
+                                      'reana-client': 200}
+    assert index.remote_refs['reana-server']['origin']['time'] == 300
+    assert 'reana-server' in index.components
+    index.invalidate('reana-server')
+    index.save()
+    assert 'reana-server' not in WorkspaceIndex(str(workspace)).components
+
+
+def test_workspace_index_watched(workspace, run_git):
+    """Tests for the uncommitted changes state of watched indexes."""
+    from reana.index import WorkspaceIndex
+    index = WorkspaceIndex(str(workspace))
+    index.watched = True
+    assert index.get_status('reana-server')['dirty'] is False
+    workspace.join('reana-server', 'setup.py').write('setup()\n')
+    assert index.get_status('reana-server')['dirty'] is False
+    index.mark_changed('reana-server')
+    assert index.get_status('reana-server')['dirty'] is True
+    run_git(workspace.join('reana-server'), 'commit', '-q', '-a', '-m',
+            'setup')
+    assert index.get_status('reana-server')['dirty'] is False
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+
+"""REANA editable installation tests."""
+
+from __future__ import absolute_import, print_function
+
+
+import sys
+
+from reana.install import get_install_args, get_installed_components, \
+    parse_installed, run_install
+
+
+def test_get_install_args():
+    """Tests for get_install_args()."""
+    assert get_install_args('python', ['/src/reana-commons',
+                                       '/src/reana-server']) == [
+        'python', '-m', 'pip', 'install', '--editable', '/src/reana-commons',
+        '--editable', '/src/reana-server']
+    assert get_install_args('python', ['/src/reana-server'], extras='all',
+                            cache_dir='/cache', find_links=['/wheels'],
+                            upgrade=True) == [
+        'python', '-m', 'pip', 'install', '--cache-dir', '/cache',
+        '--find-links', '/wheels', '--upgrade', '--editable',
+        '/src/reana-server[all]']
+
+
+def test_parse_installed():
+    """Tests for parse_installed() and get_installed_components()."""
+    installed = parse_installed('Successfully installed click-7.0 '
+                                'reana-commons-0.3.0 reana_db-0.3.0.dev1')
+    assert installed == ['click-7.0', 'reana-commons-0.3.0',
+                         'reana_db-0.3.0.dev1']
+    assert parse_installed('Requirement already satisfied: click') == []
+    assert get_installed_components(installed, [
+        'reana-server', 'reana-db', 'reana-commons']) == [
+        'reana-db', 'reana-commons']
+
+
+def test_run_install():
+    """Tests for run_install()."""
+    lines = []
+    result = run_install([sys.executable, '-c', '''
+import sys, time
+print('Collecting click')
+sys.stdout.flush()
+time.sleep(0.2)
+print('Installing collected packages: click')
+print('Successfully installed click-7.0')
+'''], callback=lines.append)
+    assert result['exit_code'] == 0
+    assert result['installed'] == ['click-7.0']
+    assert result['resolve_time'] >= 0.2
+    assert result['install_time'] >= 0
+    assert lines == result['output']
+    assert lines[0] == 'Collecting click'
+    result = run_install([sys.executable, '-c', 'import sys; sys.exit(3)'])
+    assert result['exit_code'] == 3
+    assert result['install_time'] == 0
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA component registry tests."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+
+
+def test_component_registry():
+    """Tests for ComponentRegistry.resolve()."""
+    from reana.registry import ComponentNameError, ComponentRegistry
+    registry = ComponentRegistry(
+        ['reana', 'reana-server', 'reana-ui', 'reana-workflow-controller'],
+        {'web': ['reana-server', 'r-ui'], 'everything': ['WEB', 'reana']})
+    assert registry.resolve('reana') == ['reana']
+    assert registry.resolve('r-w-controller') == ['reana-workflow-controller']
+    assert registry.resolve('reana-w') == ['reana-workflow-controller']
+    assert registry.resolve('r-w-contr') == ['reana-workflow-controller']
+    assert registry.resolve('r-*') == ['reana-server', 'reana-ui',
+                                       'reana-workflow-controller']
+    assert registry.resolve('WEB') == ['reana-server', 'reana-ui']
+    assert registry.resolve('everything') == ['reana', 'reana-server',
+                                              'reana-ui']
+    assert registry.resolve('ALL') == registry.components
+    with pytest.raises(ComponentNameError):
+        registry.resolve('reana-')
+    with pytest.raises(ComponentNameError):
+        registry.resolve('nonsense')
+    with pytest.raises(ComponentNameError):
+        registry.resolve('nonsense-*')
+
+
+def test_component_registry_scale():
+    """Test that the registry handles hundreds of components."""
+    from reana.registry import ComponentNameError, ComponentRegistry
+    components = ['reana-demo-number{0:03d}'.format(number)
+                  for number in range(500)]
+    registry = ComponentRegistry(components)
+    assert registry.resolve('r-d-number042') == ['reana-demo-number042']
+    assert registry.resolve('reana-demo-number499') == [
+        'reana-demo-number499']
+    with pytest.raises(ComponentNameError):
+        registry.resolve('reana-demo-number49')
+    assert len(registry.resolve('r-d-number1*')) == 100
+
+
+def test_load_registry_config(tmpdir):
+    """Tests for load_registry_config()."""
+    from reana.registry import load_registry_config
+    config = tmpdir.join('reana.cfg')
+    config.write('[components]\n'
+                 'extra = reana-demo-foo\n'
+                 '    reana-env-bar\n'
+                 '[groups]\n'
+                 'core = reana-server, reana-workflow-controller\n')
+    assert load_registry_config(str(config)) == (
+        ['reana-demo-foo', 'reana-env-bar'],
+        {'CORE': ['reana-server', 'reana-workflow-controller']})
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA command runner tests."""
+
+import os
+import sys
+import time
+
+
+def test_run_command(tmpdir):
+    """Tests for run_command()."""
+    from reana.runner import run_command, run_sync
+
+    lines = []
+    result = run_sync(run_command(
+        'pwd; echo oops >&2; exit 3', cwd=str(tmpdir), component='foo',
+        on_line=lambda result, stream, line: lines.append((stream, line))))
+    assert result.returncode == 3
+    assert not result.ok
+    assert result.component == 'foo'
+    assert result.stdout == str(tmpdir) + '\n'
+    assert result.stderr == 'oops\n'
+    assert sorted(lines) == sorted(result.output)
+    assert result.duration >= 0
+    assert os.getcwd() != str(tmpdir)
+
+    result = run_sync(run_command([sys.executable, '-c', 'print("a b")']))
+    assert result.ok
+    assert result.stdout == 'a b\n'
+
+    result = run_sync(run_command('sleep 5', timeout=0.1))
+    assert result.timed_out
+    assert not result.ok
+    assert result.duration < 5
+
+
+def test_run_components(tmpdir):
+    """Tests for run_components()."""
+    from reana.runner import run_components, run_sync
+
+    components = ['reana-a', 'reana-b', 'reana-c', 'reana-d']
+    for component in components:
+        tmpdir.mkdir(component)
+    # succeeds only once all four components run it at the same time
+    barrier = 'touch "../${PWD##*/}.started"; i=0; ' \
+        'while [ "$(ls ../*.started | wc -l)" -lt 4 ] && [ $i -lt 100 ]; ' \
+        'do sleep 0.1; i=$((i + 1)); done; [ $i -lt 100 ]'
+    results = run_sync(run_components(
+        [barrier, 'basename "$PWD"', 'false', 'echo not reached'],
+        components, cwd=lambda component: str(tmpdir.join(component)),
+        limit=4))
+    assert sorted(results) == components
+    for component in components:
+        assert [result.returncode for result in results[component]] == \
+            [0, 0, 1]
+        assert results[component][1].stdout == component + '\n'
+
+    results = run_sync(run_components(
+        ['false', 'true'], ['reana-a'],
+        cwd=lambda component: str(tmpdir.join(component)),
+        stop_on_error=False))
+    assert [result.ok for result in results['reana-a']] == [False, True]
+
+
+def test_run_components_timeout(tmpdir):
+    """Tests for timeouts of many commands running at the same time."""
+    from reana.runner import run_components, run_sync
+
+    components = ['reana-{0}'.format(number) for number in range(64)]
+    start = time.time()
+    results = run_sync(run_components(
+        ['sleep 10'], components, cwd=lambda component: str(tmpdir),
+        limit=len(components), timeout=0.5, capture=False))
+    assert time.time() - start < 5
+    for component in components:
+        [result] = results[component]
+        assert result.timed_out
+        assert result.returncode == -9
+        assert result.duration < 5
+
+
+def test_run_command_exit_status(tmpdir):
+    """Tests for exit statuses, signals and peak memory use of commands."""
+    from reana.runner import get_exit_code, run_command, run_sync
+
+    result = run_sync(run_command('kill -TERM $$'))
+    assert result.returncode == -15
+    assert result.exit_code == 143
+    assert get_exit_code(3) == 3
+
+    result = run_sync(run_command('exit 4', cwd=str(tmpdir), capture=False))
+    assert result.returncode == 4
+    assert result.output == []
+    assert result.max_rss > 0
+    assert result.start <= time.time()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA command line start-up time tests."""
+
+from __future__ import absolute_import, print_function
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# maximum wall-clock time in seconds of `reana version` and `reana --help`
+STARTUP_BUDGET = float(os.environ.get('REANA_STARTUP_BUDGET', '0.5'))
+
+
+def get_reana_env(srcdir):
+    """Return environment of ``reana`` run without daemon in the directory."""
+    return dict(os.environ, REANA_NO_DAEMON='1', REANA_SRCDIR=srcdir)
+
+
+def run_reana(srcdir, *args):
+    """Run the ``reana`` entry point in a fresh interpreter.
+
+    :return: the command output
+    """
+    return subprocess.check_output(
+        [sys.executable, '-c', 'from reana.client import main; main()'] +
+        list(args), env=get_reana_env(srcdir), universal_newlines=True)
+
+
+@pytest.mark.parametrize('args', [('version', ), ('--help', )])
+def test_startup_time_budget(args, tmpdir):
+    """Test that simple commands start within the time budget."""
+    timings = []
+    for _ in range(3):
+        start = time.time()
+        run_reana(str(tmpdir), *args)
+        timings.append(time.time() - start)
+    assert min(timings) < STARTUP_BUDGET
+
+
+def test_startup_does_not_import_commands(tmpdir):
+    """Test that command implementations are imported only when invoked."""
+    script = ('import sys\n'
+              'from reana.client import main\n'
+              'try:\n'
+              '    main(["{0}"])\n'
+              'except SystemExit:\n'
+              '    pass\n'
+              'print(" ".join(sorted(name for name in sys.modules\n'
+              '                      if name.startswith("reana."))))\n')
+    for args in ('version', '--help'):
+        modules = subprocess.check_output(
+            [sys.executable, '-c', script.format(args)],
+            env=get_reana_env(str(tmpdir)),
+            universal_newlines=True).split('\n')[-2].split()
+        assert not [name for name in modules
+                    if name.startswith('reana.commands.')]
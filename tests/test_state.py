@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+"""REANA state file tests."""
+
+from __future__ import absolute_import, print_function
+
+
+def test_state(tmpdir):
+    """Tests for load_state() and save_state()."""
+    from reana.state import load_state, save_state
+    path = str(tmpdir.join('state.json'))
+    assert load_state(path) == {}
+    save_state(path, {'reanahub/reana-server:latest': 'abc'})
+    assert load_state(path) == {'reanahub/reana-server:latest': 'abc'}
+    assert tmpdir.listdir() == [tmpdir.join('state.json')]
+    tmpdir.join('state.json').write('garbage')
+    assert load_state(path) == {}
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+
+"""REANA source code synchronisation tests."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+
+def make_component(srcdir, run_git):
+    """Create component repository with a few tracked files."""
+    srcdir.join('setup.py').write('setup()\n', ensure=True)
+    srcdir.join('reana_server', 'app.py').write('app = 1\n', ensure=True)
+    srcdir.join('reana_server', 'rest.py').write('rest = 1\n')
+    srcdir.join('untracked.txt').write('untracked\n')
+    run_git(srcdir, 'init', '-q')
+    run_git(srcdir, 'add', 'setup.py', 'reana_server')
+    run_git(srcdir, 'commit', '-q', '-m', 'initial')
+    return srcdir
+
+
+def test_compute_changes(tmpdir, monkeypatch, run_git):
+    """Tests for compute_changes()."""
+    from reana import sync
+    from reana.sync import compute_changes
+    srcdir = make_component(tmpdir.mkdir('reana-server'), run_git)
+    state, changed, removed = compute_changes(str(srcdir), {})
+    assert changed == ['reana_server/app.py', 'reana_server/rest.py',
+                       'setup.py']
+    assert removed == []
+    assert compute_changes(str(srcdir), state) == (state, [], [])
+    # touched without changing the content
+    os.utime(str(srcdir.join('setup.py')), (0, 0))
+    srcdir.join('reana_server', 'app.py').write('app = 2\n')
+    srcdir.join('reana_server', 'rest.py').remove()
+    new_state, changed, removed = compute_changes(str(srcdir), state)
+    assert changed == ['reana_server/app.py']
+    assert removed == ['reana_server/rest.py']
+    assert sorted(new_state) == ['reana_server/app.py', 'setup.py']
+    # a file that cannot be read for now is neither changed nor removed
+    srcdir.join('setup.py').write('setup(name="reana-server")\n')
+
+    def hash_file(path):
+        if path.endswith('setup.py'):
+            raise IOError('Permission denied')
+        return sync.hash_file(path)
+
+    monkeypatch.setattr(sync, 'hash_file', hash_file)
+    assert compute_changes(str(srcdir), new_state) == (new_state, [], [])
+
+
+def test_sync_local(tmpdir, monkeypatch, run_git, clear_cli_caches):
+    """Tests for the sync command with the local transport."""
+    from click.testing import CliRunner
+    from reana import cli
+    srcdir = tmpdir.mkdir('src')
+    make_component(srcdir.mkdir('reana-server'), run_git)
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    runner = CliRunner()
+    target = str(tmpdir.join('deploy', '{1}'))
+    args = ['sync', '-c', 'r-server', '-c', 'r-ui', '-T', 'local', '-t',
+            target]
+    result = runner.invoke(cli.cli, args)
+    assert result.exit_code == 0, result.output
+    assert '[reana-server] Synced 3 files, removed 0 files' in result.output
+    deploy = tmpdir.join('deploy', 'server')
+    assert deploy.join('reana_server', 'app.py').read() == 'app = 1\n'
+    assert not deploy.join('untracked.txt').check()
+    result = runner.invoke(cli.cli, args)
+    assert '[reana-server] Nothing to sync.' in result.output
+    srcdir.join('reana-server', 'reana_server', 'app.py').write('app = 2\n')
+    srcdir.join('reana-server', 'reana_server', 'rest.py').remove()
+    result = runner.invoke(cli.cli, args)
+    assert '[reana-server] Synced 1 files, removed 1 files' in result.output
+    assert deploy.join('reana_server', 'app.py').read() == 'app = 2\n'
+    assert not deploy.join('reana_server', 'rest.py').check()
+    result = runner.invoke(cli.cli, args + ['--full', '-s', 'HUP'])
+    assert result.exit_code == 1
+    assert 'Reloading is not supported' in result.output
+
+
+def test_sync_docker(tmpdir, monkeypatch, run_git, clear_cli_caches):
+    """Tests for the sync command with the docker transport."""
+    from click.testing import CliRunner
+    from reana import cli
+    bindir = tmpdir.mkdir('bin')
+    docker = bindir.join('docker')
+    docker.write('''#!/bin/sh
+echo "$@" >> {0}
+case "$1" in
+    ps) {{ echo k8s_server_server-6b9c_default_0; echo k8s_server-db_db-1;
+          echo k8s_POD_server-6b9c_default_0; }} |
+        grep -- "${{3#name=}}" ;;
+    cp) cat > {1} ;;
+esac
+'''.format(tmpdir.join('docker.log'), tmpdir.join('sent.tar')))
+    docker.chmod(0o755)
+    monkeypatch.setenv('PATH', '{0}:{1}'.format(bindir,
+                                                os.environ['PATH']))
+    srcdir = tmpdir.mkdir('src')
+    make_component(srcdir.mkdir('reana-server'), run_git)
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    runner = CliRunner()
+    # libraries have no container, so the components must be given
+    result = runner.invoke(cli.cli, ['sync'])
+    assert result.exit_code == 2
+    assert "Missing option '--component'" in result.output
+    assert not tmpdir.join('docker.log').check()
+    args = ['sync', '-c', 'r-server', '-t', 'k8s_server_:/code', '-s', 'HUP']
+    result = runner.invoke(cli.cli, args)
+    assert result.exit_code == 0, result.output
+    assert 'Synced 3 files, removed 0 files, sent HUP' in result.output
+    import tarfile
+    with tarfile.open(str(tmpdir.join('sent.tar'))) as archive:
+        assert archive.getnames() == ['reana_server/app.py',
+                                      'reana_server/rest.py', 'setup.py']
+    log = tmpdir.join('docker.log').read().splitlines()
+    assert log[1] == 'cp - k8s_server_server-6b9c_default_0:/code'
+    assert log[2] == 'kill --signal HUP k8s_server_server-6b9c_default_0'
+    result = runner.invoke(cli.cli, ['sync', '-c', 'r-server', '--full'])
+    assert result.exit_code == 1
+    assert '2 running containers match server' in result.output
+    # the pause container of the pod is not a candidate
+    result = runner.invoke(cli.cli, ['sync', '-c', 'r-server', '--full',
+                                     '-t', 'server-6b9c'])
+    assert result.exit_code == 0, result.output
+    assert tmpdir.join('docker.log').read().splitlines()[-1] == \
+        'cp - k8s_server_server-6b9c_default_0:/code'
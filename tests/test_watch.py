@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+
+"""REANA source code watching tests."""
+
+from __future__ import absolute_import, print_function
+
+import sys
+import threading
+
+import pytest
+
+
+def test_is_ignored():
+    """Tests for is_ignored()."""
+    from reana.watch import is_ignored
+    assert is_ignored('.git/index', False)
+    assert is_ignored('reana_server/__pycache__/app.cpython-36.pyc', False)
+    assert is_ignored('reana_server/app.pyc', False)
+    assert is_ignored('docs/_build/html/index.html', False)
+    assert is_ignored('reana_server.egg-info', True)
+    assert is_ignored('.coverage', False)
+    assert is_ignored('.pytest_cache/v/cache/nodeids', False)
+    assert is_ignored('htmlcov', True)
+    assert not is_ignored('reana_server/app.py', False)
+    assert not is_ignored('docs/index.rst', False)
+
+
+@pytest.mark.parametrize('poll', [False, True])
+def test_wait_for_changes(tmpdir, poll):
+    """Tests for wait_for_changes() with inotify and polling watchers."""
+    from reana.watch import InotifyWatcher, PollingWatcher, wait_for_changes
+    if not poll and not sys.platform.startswith('linux'):
+        pytest.skip('inotify is only available on Linux')
+    srcdirs = {}
+    for component in ('reana-server', 'reana-ui'):
+        srcdir = tmpdir.mkdir(component)
+        srcdir.join('reana_server', 'app.py').write('app = 1\n', ensure=True)
+        srcdirs[component] = str(srcdir)
+    if poll:
+        watcher = PollingWatcher(srcdirs, interval=0.05)
+    else:
+        watcher = InotifyWatcher(srcdirs)
+    try:
+        assert wait_for_changes(watcher, 0.1, timeout=0.1) == {}
+        tmpdir.join('reana-server', 'reana_server', 'app.pyc').write('0')
+        tmpdir.join('reana-server', '.git', 'index').write('0', ensure=True)
+        tmpdir.join('reana-server', '.coverage').write('0')
+        assert wait_for_changes(watcher, 0.1, timeout=0.2) == {}
+        tmpdir.join('reana-server', 'reana_server', 'app.py').write(
+            'app = 2\n')
+
+        def write_later():
+            tmpdir.join('reana-server', 'reana_server', 'api', 'rest.py')\
+                .write('rest = 1\n', ensure=True)
+
+        timer = threading.Timer(0.05, write_later)
+        timer.start()
+        changes = wait_for_changes(watcher, 0.3, timeout=1)
+        timer.join()
+        assert list(changes) == ['reana-server']
+        assert 'reana_server/app.py' in changes['reana-server']
+        assert 'reana_server/api/rest.py' in changes['reana-server']
+        tmpdir.join('reana-server', 'reana_server', 'api', 'rest.py').write(
+            'rest = 2\n')
+        assert wait_for_changes(watcher, 0.1, timeout=1) == {
+            'reana-server': ['reana_server/api/rest.py']}
+    finally:
+        watcher.close()
+
+
+@pytest.mark.parametrize('poll', [False, True])
+def test_wait_for_changes_gitignore(tmpdir, run_git, poll):
+    """Test that paths ignored by Git do not trigger rebuilds."""
+    from reana.watch import InotifyWatcher, PollingWatcher, wait_for_changes
+    if not poll and not sys.platform.startswith('linux'):
+        pytest.skip('inotify is only available on Linux')
+    srcdir = tmpdir.mkdir('reana-server')
+    run_git(srcdir, 'init', '-q')
+    srcdir.join('.gitignore').write('/build/\n*.log\n')
+    srcdir.join('reana_server', 'app.py').write('app = 1\n', ensure=True)
+    srcdirs = {'reana-server': str(srcdir)}
+    if poll:
+        watcher = PollingWatcher(srcdirs, interval=0.05)
+    else:
+        watcher = InotifyWatcher(srcdirs)
+    try:
+        srcdir.join('build', 'lib', 'app.py').write('app = 1\n', ensure=True)
+        srcdir.join('reana_server', 'server.log').write('started\n')
+        assert wait_for_changes(watcher, 0.1, timeout=0.3) == {}
+        srcdir.join('reana_server', 'app.py').write('app = 2\n')
+        assert wait_for_changes(watcher, 0.1, timeout=1) == {
+            'reana-server': ['reana_server/app.py']}
+    finally:
+        watcher.close()
+
+
+def test_watch(tmpdir, monkeypatch, clear_cli_caches):
+    """Tests for the watch command."""
+    from click.testing import CliRunner
+    from reana import cli
+    srcdir = tmpdir.mkdir('src')
+    for component in ('reana-server', 'reana-ui'):
+        srcdir.join(component, 'setup.py').write('setup()\n', ensure=True)
+    monkeypatch.setattr(cli, 'SRCDIR', str(srcdir))
+    timer = threading.Timer(
+        0.3, lambda: srcdir.join('reana-ui', 'setup.py').write('setup(1)\n'))
+    timer.start()
+    result = CliRunner().invoke(cli.cli, [
+        'watch', '-c', 'r-server', '-c', 'r-ui', '-d', '0.1', '--once',
+        '-x', 'pwd > changed.txt'])
+    timer.join()
+    assert result.exit_code == 0, result.output
+    assert '[reana-ui] Changed setup.py.' in result.output
+    assert srcdir.join('reana-ui', 'changed.txt').read() == \
+        str(srcdir.join('reana-ui')) + '\n'
+    assert not srcdir.join('reana-server', 'changed.txt').check()
+
+
+def test_rebuild(tmpdir, monkeypatch):
+    """Test that rebuilds honour the docker-build environment variables."""
+    import click
+    from reana.commands import docker
+    from reana.commands.watch import rebuild, watch
+    calls = []
+    monkeypatch.setattr(docker.docker_build, 'callback',
+                        lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setenv('REANA_BUILD_CACHE_DIR', str(tmpdir))
+    with click.Context(watch) as ctx:
+        assert rebuild(ctx, ['reana-server', 'reana-ui'], None, 3) == 0
+    assert len(calls) == 1
+    assert calls[0]['component'] == ('reana-server', 'reana-ui')
+    assert calls[0]['jobs'] == 3
+    assert calls[0]['cache_dir'] == str(tmpdir)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2018 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 2 of the License, or (at your option) any later
+# version.
+#
+# REANA is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# REANA; if not, write to the Free Software Foundation, Inc., 59 Temple Place,
+# Suite 330, Boston, MA 02111-1307, USA.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization or
+# submit itself to any jurisdiction.
+
+
+"""REANA wheelhouse tests."""
+
+from __future__ import absolute_import, print_function
+
+import os
+import time
+
+from reana.wheelhouse import find_local_dependencies, get_wheel_command, \
+    get_wheelhouse_key, prune_wheelhouses, read_requirements
+
+
+def test_find_local_dependencies(tmpdir):
+    """Tests for find_local_dependencies()."""
+    commons = tmpdir.mkdir('reana-commons')
+    commons.join('setup.py').write("setup(name='reana-commons')\n")
+    db = tmpdir.mkdir('reana-db')
+    db.join('setup.py').write("install_requires=['reana-commons>=0.3']\n")
+    server = tmpdir.mkdir('reana-server')
+    server.join('requirements.txt').write('reana_db==0.3.0\n')
+    ui = tmpdir.mkdir('reana-ui')
+    ui.join('requirements.txt').write('reana-commons-extra==1.0\n')
+    libraries = {'reana-commons': str(commons), 'reana-db': str(db)}
+    assert find_local_dependencies({'reana-server': str(server)},
+                                   libraries) == ['reana-db']
+    assert find_local_dependencies({'reana-ui': str(ui)}, libraries) == []
+    assert find_local_dependencies({'reana-db': str(db),
+                                    'reana-server': str(server)},
+                                   libraries) == ['reana-commons', 'reana-db']
+
+
+def test_read_requirements(tmpdir):
+    """Tests for read_requirements()."""
+    first = tmpdir.join('a', 'requirements.txt')
+    first.write('# pinned\nclick==7.0\n-e git+https://x/y#egg=y\n'
+                'reana-commons[kubernetes]==0.3.0  # local\n'
+                '-r base.txt\n', ensure=True)
+    second = tmpdir.join('b', 'requirements.txt')
+    second.write('click==7.0\n.\nrequests>=2.0\n', ensure=True)
+    assert read_requirements([str(first), str(second)], ['reana-commons']) \
+        == ['click==7.0',
+            '-r {0}'.format(os.path.join(str(tmpdir), 'a', 'base.txt')),
+            'requests>=2.0']
+
+
+def test_get_wheelhouse_key(tmpdir):
+    """Tests for get_wheelhouse_key()."""
+    library = tmpdir.mkdir('reana-commons')
+    library.join('setup.py').write('setup()\n')
+    libraries = {'reana-commons': str(library)}
+    key = get_wheelhouse_key(['click==7.0'], libraries, 'cpython 3.6.8')
+    assert key == get_wheelhouse_key(['click==7.0'], libraries,
+                                     'cpython 3.6.8')
+    assert key != get_wheelhouse_key(['click==7.0'], libraries,
+                                     'cpython 3.7.1')
+    assert key != get_wheelhouse_key(['click==7.1'], libraries,
+                                     'cpython 3.6.8')
+    library.join('setup.py').write('setup(version=1)\n')
+    assert key != get_wheelhouse_key(['click==7.0'], libraries,
+                                     'cpython 3.6.8')
+
+
+def test_get_wheel_command():
+    """Tests for get_wheel_command()."""
+    assert get_wheel_command('python3', '/tmp/wh dir', ['/a/req.txt'],
+                             ['/src/reana-commons']) == \
+        "python3 -m pip wheel --wheel-dir '/tmp/wh dir' --find-links " \
+        "'/tmp/wh dir' -r /a/req.txt /src/reana-commons"
+
+
+def test_prune_wheelhouses(tmpdir):
+    """Tests for prune_wheelhouses()."""
+    now = time.time()
+    for age, name in enumerate(['new', 'mid', 'old']):
+        path = tmpdir.mkdir(name)
+        os.utime(str(path), (now - age * 60, now - age * 60))
+    tmpdir.mkdir('.building')
+    assert prune_wheelhouses(str(tmpdir), keep=2) == ['old']
+    assert sorted(os.listdir(str(tmpdir))) == ['.building', 'mid', 'new']